@@ -36,6 +36,7 @@ class AIGui(QMainWindow):
 
         # Initialize AI Manager
         self.ai_manager = AIManager()
+        Thread(target=self.ai_manager.sync_vector_index, daemon=True).start()  # Ready related-word lookups
 
         # Set up the main layout
         self.central_widget = QWidget()
@@ -175,7 +176,11 @@ class AIGui(QMainWindow):
                 answer += f"Pulled data for '{word}':\n"
                 answer += self.format_pulled_data(data) + "\n\n"
             else:
-                answer += f"No existing data found for '{word}'. Starting research...\n\n"
+                answer += f"No existing data found for '{word}'. Starting research...\n"
+                related_words = self.ai_manager.find_related_words(word, encode=False)
+                if related_words:
+                    answer += f"Related words: {', '.join(related_words)}\n"
+                answer += "\n"
         self.answer_display.setText(answer)
 
         # Step 6: Start training in the background
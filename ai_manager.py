@@ -1,51 +1,95 @@
+import hashlib
 import json
-import torch
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-from collections import Counter
-from content_manager import fetch_word_definition, categorize_entry, append_word_to_file, save_topic_to_file  # Ensure categorize_entry is used
+from collections import Counter, deque
+from contextlib import nullcontext
+from content_manager import fetch_word_definition, categorize_entry  # Ensure categorize_entry is used
+from inference_cache import CachedPipeline, get_inference_cache
+from model_registry import MODEL_SPECS, get_default_registry
+from passage_index import PassageIndex
+from vector_index import VectorIndex, choose_encoder, iter_word_texts
+from word_memory import WordMemory
+from research_crawler import ResearchCrawler
+from training_store import TrainingStore
+from config import TRAINING_STORE_FILE, RESEARCH_CRAWL_MAX_NODES, GENERATED_FILES_MANIFEST
+from word_difficulty import letter_frequency
 import random  # Ensure random is used
 import os
+import sqlite3
 import requests
-from threading import Thread
+from threading import Lock, Thread
 import logging
 import time  # Ensure time is used for rate limiting
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 
+def write_file_atomic(path, data):
+    """
+    Write text or bytes to a file through a temporary file, so readers never see a partial file.
+    """
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
 class AIManager:
-    def __init__(self, training_file="data/training_data.json", predefined_words_file="data/predefined_words.json"):
-        """
-        Initialize the AI manager with pre-trained models, training data file, and predefined words file.
-        """
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"Device set to use {self.device}")
-        self.text_generator = None
-        self.text_rephraser = None
-        self.text_classifier = None
-        self.synonym_generator = None
-        self.custom_tokenizer = None
-        self.custom_model = None
-        self.question_answering_model = None
-        self.letter_frequency = Counter("etaoinshrdlcumwfgypbvkjxqz")  # English letter frequency
+    # Models load on first use through the shared registry and may be unloaded again while idle,
+    # so fetch them through these attributes each time rather than holding on to them.
+    # Repeated calls are answered from the inference cache.
+    text_generator = property(lambda self: self._cached_pipeline("text_generator"))
+    text_rephraser = property(lambda self: self._cached_pipeline("text_rephraser"))
+    text_classifier = property(lambda self: self._cached_pipeline("text_classifier"))
+    synonym_generator = property(lambda self: self._cached_pipeline("synonym_generator"))
+    question_answering_model = property(lambda self: self._cached_pipeline("question_answering_model"))
+    custom_tokenizer = property(lambda self: self.models.get_tokenizer("t5-small"))
+    custom_model = property(lambda self: self.models.get_model("t5-small"))  # Shares weights with the t5 pipelines
+    device = property(lambda self: self.models.device)
+
+    def __init__(self, training_file="data/training_data.json", predefined_words_file="data/predefined_words.json",
+                 model_registry=None, inference_cache=None, store_file=TRAINING_STORE_FILE):
+        """
+        Initialize the AI manager with training data and predefined words; models load lazily.
+        :param training_file: Legacy JSON training data, migrated into the store the first time it is opened.
+        :param store_file: The SQLite training data store.
+        :param model_registry: Registry to load models from; defaults to the process-wide one.
+        :param inference_cache: Cache of model outputs; defaults to the process-wide one.
+        """
+        self.models = model_registry or get_default_registry()
+        self.inference_cache = inference_cache or get_inference_cache()
+        self.letter_frequency = Counter()  # Letter counts over the word corpus, set by train_on_words
         self.training_file = training_file
+        self.store_file = store_file
         self.training_data = {"riddles": [], "definitions": [], "categories": [], "research": []}
         self.predefined_words = self.load_predefined_words(predefined_words_file)
-        self.memory = {"short_term": {}, "long_term": {}}  # Add memory system
-
-        try:
-            self.text_generator = pipeline("text-generation", model="gpt2", device=0 if self.device == "cuda" else -1)
-            self.text_rephraser = pipeline("text2text-generation", model="t5-small", device=0 if self.device == "cuda" else -1)
-            self.text_classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli", device=0 if self.device == "cuda" else -1)
-            self.synonym_generator = pipeline("text2text-generation", model="t5-small", device=0 if self.device == "cuda" else -1)
-            self.custom_tokenizer = AutoTokenizer.from_pretrained("t5-small")
-            self.custom_model = AutoModelForSeq2SeqLM.from_pretrained("t5-small").to(self.device)
-            self.question_answering_model = pipeline("question-answering", model="distilbert-base-cased-distilled-squad", device=0 if self.device == "cuda" else -1)
-        except Exception as e:
-            print(f"AI models could not be loaded: {e}")
-            print("AI-powered features will be limited.")
+        self.generated_words = deque()  # Words generated ahead of time for the game loop
+        self.generating_word = False
+        self.word_lock = Lock()
+        self.passage_index = PassageIndex()  # Filled from training data on the first question
+        self.vector_index = None  # Opened by sync_vector_index, which may load the sentence encoder
+        self.vector_signature = None
+        self.vector_lock = Lock()
+        self.syncing_vectors = False  # Whether a background sync_vector_index is running
+        self.files_manifest = GENERATED_FILES_MANIFEST
+        self.files_lock = Lock()
 
         self.load_training_data()
+        # Short- and long-term word memory, kept merged in the training data's dynamic_memory section
+        self.memory = WordMemory(self.training_data.setdefault("dynamic_memory", {}),
+                                 self.training_data.setdefault("memory_counts", {}))
+
+    def _cached_pipeline(self, name, load=True):
+        """
+        Wrap a registry pipeline with the inference cache.
+        :param load: If False, skip loading the model; the wrapper can then only serve lookup().
+        """
+        pipe = self.models.get(name) if load else None
+        if load and pipe is None:
+            return None
+        task, checkpoint = MODEL_SPECS[name]
+        return CachedPipeline(pipe, self.inference_cache, f"{task}:{checkpoint}", task)
 
     def load_predefined_words(self, filepath):
         """
@@ -80,15 +124,13 @@ class AIManager:
 
     def load_training_data(self):
         """
-        Load existing training data from the training file.
+        Open the training data store, migrating the JSON training file into it on first use.
         """
         try:
-            with open(self.training_file, "r") as f:
-                self.training_data = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            print("No existing training data found. Starting fresh.")
+            self.training_data = TrainingStore(self.store_file, migrate_from=self.training_file)
+        except sqlite3.Error as e:
+            print(f"Error opening training data store, using memory only: {e}")
             self.training_data = {"riddles": [], "definitions": [], "categories": [], "research": []}
-            self.save_training_data()  # Create an empty training data file
 
         # Ensure all required keys are present
         self.training_data.setdefault("riddles", [])
@@ -98,13 +140,25 @@ class AIManager:
 
     def save_training_data(self):
         """
-        Save the current training data to the training file.
+        Mark a save point. Changes are already recorded in the store, whose flusher commits them within
+        TRAINING_FLUSH_INTERVAL seconds, so this costs nothing. Use flush_training_data() to commit right away.
         """
-        try:
-            with open(self.training_file, "w") as f:
-                json.dump(self.training_data, f, indent=4)
-        except IOError as e:
-            print(f"Error saving training data: {e}")
+
+    def flush_training_data(self):
+        """
+        Commit every pending change to the training data store now.
+        """
+        if isinstance(self.training_data, TrainingStore):
+            self.training_data.flush()
+
+    def batched_saves(self):
+        """
+        Context manager for bulk learning: changes made inside it are committed together when it ends
+        (or every TRAINING_FLUSH_ITEMS rows) instead of every flush interval.
+        """
+        if isinstance(self.training_data, TrainingStore):
+            return self.training_data.deferred_flush()
+        return nullcontext()
 
     def retrain(self):
         """
@@ -124,99 +178,127 @@ class AIManager:
     def dynamic_retrain(self):
         """
         Dynamically retrain the AI based on newly acquired data.
+        The dynamic_memory section already holds both memory tiers, so only retraining is needed.
         """
         print("Dynamically retraining AI...")
-        # Combine short-term and long-term memory for retraining
-        combined_data = {**self.memory["short_term"], **{k: v["data"] for k, v in self.memory["long_term"].items()}}
-        self.training_data["dynamic_memory"] = combined_data
         self.retrain()
 
     def update_memory(self, word, data):
         """
         Update the AI's memory with new data for a word.
-        Frequently accessed words are moved to long-term memory.
+        Frequently accessed words stay in long-term memory; see WordMemory for the eviction policy.
         """
-        # Add to short-term memory
-        self.memory["short_term"][word] = data
-
-        # If the word is accessed frequently, move it to long-term memory
-        if word in self.memory["long_term"]:
-            self.memory["long_term"][word]["access_count"] += 1
-        else:
-            self.memory["long_term"][word] = {"data": data, "access_count": 1}
-
-        # Forget less relevant data from short-term memory
-        if len(self.memory["short_term"]) > 100:  # Limit short-term memory size
-            least_used = min(self.memory["short_term"], key=lambda w: self.memory["long_term"].get(w, {}).get("access_count", 0))
-            del self.memory["short_term"][least_used]
+        self.memory.update(word, data)
 
     def retrieve_memory(self, word):
         """
         Retrieve data for a word from memory.
         """
-        if word in self.memory["short_term"]:
-            return self.memory["short_term"][word]
-        if word in self.memory["long_term"]:
-            self.memory["long_term"][word]["access_count"] += 1
-            return self.memory["long_term"][word]["data"]
-        return None
+        return self.memory.get(word)
 
     def generate_files(self):
         """
-        Generate all necessary files dynamically.
+        Generate the AI's files, skipping each one whose inputs have not changed since it was last written.
+        Runs as a background job after each round, so it must stay cheap when nothing changed.
+        :return: The names of the files that were regenerated.
+        """
+        with self.files_lock:
+            manifest = self.load_files_manifest()
+            generated = []
+            for name, inputs, write in (
+                ("config", self.config_file_data, self.generate_config_file),
+                ("model_weights", lambda: {"model": "t5-small"}, self.save_model_weights),
+                ("tokenizer", lambda: {"model": "t5-small", "version": "1.0"}, self.save_tokenizer_files),
+            ):
+                started = time.perf_counter()
+                try:
+                    digest = hashlib.sha256(json.dumps(inputs(), sort_keys=True).encode()).hexdigest()
+                    entry = manifest.get(name)
+                    if entry and entry["hash"] == digest and all(os.path.exists(path) for path in entry["files"]):
+                        continue
+                    files = write()
+                except Exception as e:  # The model worker may be unable to load the tokenizer
+                    print(f"Error generating {name} files: {e}")
+                    files = None
+                if not files:
+                    continue  # Failed; retried next time
+                manifest[name] = {"hash": digest, "files": files, "generated_at": time.time(),
+                                  "seconds": round(time.perf_counter() - started, 4)}
+                self.save_files_manifest(manifest)  # Per set, so one failing set cannot make the others repeat
+                generated.append(name)
+            if generated:
+                print(f"Generated AI files: {', '.join(generated)}")
+            return generated
+
+    def load_files_manifest(self):
+        """
+        Load the record of generated files: input hash, paths, generation time and duration per file set.
         """
-        print("Generating AI files...")
-        self.generate_config_file()
-        self.save_model_weights()
-        self.save_tokenizer_files()
-        print("All files generated successfully.")
+        try:
+            with open(self.files_manifest, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
 
-    def generate_config_file(self, config_path="data/config.json"):
-        """
-        Generate a configuration file dynamically based on the AI's current state.
-        """
-        config_data = {
+    def save_files_manifest(self, manifest):
+        try:
+            write_file_atomic(self.files_manifest, json.dumps(manifest, indent=4))
+        except IOError as e:
+            print(f"Error saving generated files manifest: {e}")
+
+    def config_file_data(self):
+        return {
             "device": self.device,
-            "training_file": self.training_file,
+            "training_file": self.store_file,
             "model": "t5-small",
             "text_generator_model": "gpt2",
             "question_answering_model": "distilbert-base-cased-distilled-squad",
             "categories": len(self.training_data.get("categories", [])),
             "definitions": len(self.training_data.get("definitions", [])),
         }
+
+    def generate_config_file(self, config_path="data/config.json"):
+        """
+        Generate a configuration file dynamically based on the AI's current state.
+        :return: The paths written, or None on failure.
+        """
         try:
-            os.makedirs(os.path.dirname(config_path), exist_ok=True)
-            with open(config_path, "w") as f:
-                json.dump(config_data, f, indent=4)
+            write_file_atomic(config_path, json.dumps(self.config_file_data(), indent=4))
             print(f"Configuration file saved at {config_path}")
+            return [config_path]
         except IOError as e:
             print(f"Error saving configuration file: {e}")
 
     def save_model_weights(self, model_path="data/model.safetensors"):
         """
         Save the model weights to a file for future use.
+        :return: The paths written, or None on failure.
         """
         try:
-            os.makedirs(os.path.dirname(model_path), exist_ok=True)
             # Placeholder for saving model weights (if supported by the model)
-            with open(model_path, "wb") as f:
-                f.write(b"")  # Write an empty file as a placeholder
+            write_file_atomic(model_path, b"")  # Write an empty file as a placeholder
             print(f"Model weights saved at {model_path}")
+            return [model_path]
         except IOError as e:
             print(f"Error saving model weights: {e}")
 
     def save_tokenizer_files(self, tokenizer_dir="data/tokenizer"):
         """
         Save tokenizer files dynamically.
+        :return: The paths written, or None on failure.
         """
+        tokenizer = self.custom_tokenizer
+        if tokenizer is None:
+            print("Tokenizer not available; tokenizer files not saved.")
+            return None
+        config_path = os.path.join(tokenizer_dir, "tokenizer_config.json")
+        vocab_path = os.path.join(tokenizer_dir, "vocab.txt")
         try:
-            os.makedirs(tokenizer_dir, exist_ok=True)
             # Placeholder for saving tokenizer files
-            with open(os.path.join(tokenizer_dir, "tokenizer_config.json"), "w") as f:
-                json.dump({"version": "1.0", "model": "t5-small"}, f, indent=4)
-            with open(os.path.join(tokenizer_dir, "vocab.txt"), "w") as f:
-                f.write("\n".join(self.custom_tokenizer.get_vocab().keys()))
+            write_file_atomic(config_path, json.dumps({"version": "1.0", "model": "t5-small"}, indent=4))
+            write_file_atomic(vocab_path, "\n".join(tokenizer.get_vocab().keys()))
             print(f"Tokenizer files saved in {tokenizer_dir}")
+            return [config_path, vocab_path]
         except IOError as e:
             print(f"Error saving tokenizer files: {e}")
 
@@ -311,6 +393,7 @@ class AIManager:
         """
         Train the AI on a list of words by categorizing them and adding them to the training data.
         """
+        self.letter_frequency = letter_frequency(words)
         for word in words:
             if word not in self.training_data["categories"]:
                 # Fetch the definition to categorize the word
@@ -318,9 +401,10 @@ class AIManager:
                 self.train_categories_with_hierarchy(word, definition_data)
         self.save_training_data()
 
-    def generate_word(self):
+    def generate_word(self, fallback=True):
         """
         Generate a new word based on the training data.
+        :param fallback: If True, pick a random trained word when the text generator cannot produce one.
         """
         if not self.training_data["categories"]:
             print("No training data available to generate words.")
@@ -333,26 +417,137 @@ class AIManager:
                 result = self.text_generator(prompt, max_length=10, num_return_sequences=1, do_sample=True)
                 generated_text = result[0]["generated_text"].strip()
                 # Filter out non-alphabetic characters and return the word
-                return ''.join(filter(str.isalpha, generated_text)).upper()
+                word = ''.join(filter(str.isalpha, generated_text)).upper()
+                if word:
+                    return word
             except Exception as e:
                 print(f"Error generating word: {e}")
+        if not fallback:
+            return None
         return random.choice(self.training_data["categories"]).upper()  # Use random to select a category
 
+    def get_generated_word(self):
+        """
+        Return a word generated ahead of time and start generating the next one in the background.
+        Never waits on a model, so the game loop can call it between frames.
+        :return: The generated word, or None if none is ready yet.
+        """
+        with self.word_lock:
+            word = self.generated_words.popleft() if self.generated_words else None
+            if not self.generating_word:
+                self.generating_word = True
+                Thread(target=self._generate_word_ahead, daemon=True).start()
+        return word
+
+    def _generate_word_ahead(self):
+        word = None
+        try:
+            word = self.generate_word(fallback=False)  # Only model words; the game picks from its word lists itself
+        finally:
+            with self.word_lock:
+                self.generating_word = False
+                if word:
+                    self.generated_words.append(word)
+
+    def rephrase_riddle(self, riddle, wait=True):
+        """
+        Rephrase a riddle as a hint. Results are cached, so repeated hints for a riddle are instant.
+        :param riddle: The riddle to rephrase.
+        :param wait: If False, only return an already cached rephrasing and never run the model.
+        :return: The rephrased riddle, or None if it is not available.
+        """
+        rephraser = self._cached_pipeline("text_rephraser", load=wait)
+        if not rephraser or not riddle:
+            return None
+        prompt = f"paraphrase: {riddle}"
+        try:
+            if wait:
+                result = rephraser(prompt, max_length=64)
+            else:
+                hit, result = rephraser.lookup(prompt, max_length=64)
+                if not hit:
+                    return None
+            return result[0]["generated_text"].strip() or None
+        except Exception as e:
+            print(f"Error rephrasing riddle: {e}")
+            return None
+
+    def sync_vector_index(self):
+        """
+        Open the semantic vector index and embed definitions and examples added since the last sync.
+        May run the sentence encoder, so call it off the UI thread.
+        :return: The vector index.
+        """
+        with self.vector_lock:
+            if self.vector_index is None:
+                self.vector_index = VectorIndex(choose_encoder(self.models))
+            # Only walk the training data when one of its sources changed size
+            signature = tuple(len(self.training_data.get(key) or ()) for key in
+                              ("definitions", "research_results", "dynamic_memory")) + (len(self.predefined_words),)
+            if signature != self.vector_signature:
+                try:
+                    added = self.vector_index.add(iter_word_texts(self.training_data, self.predefined_words))
+                    if added:
+                        print(f"Embedded {added} new definitions and examples.")
+                    self.vector_signature = signature
+                except Exception as e:
+                    print(f"Error updating vector index: {e}")
+            return self.vector_index
+
+    def sync_vector_index_async(self):
+        """
+        Start sync_vector_index in the background unless one is already running.
+        """
+        with self.word_lock:
+            if self.syncing_vectors:
+                return
+            self.syncing_vectors = True
+        Thread(target=self._sync_vector_index_job, name="vector-sync", daemon=True).start()
+
+    def _sync_vector_index_job(self):
+        try:
+            self.sync_vector_index()
+        finally:
+            with self.word_lock:
+                self.syncing_vectors = False
+
+    def find_related_words(self, word, k=10, encode=True):
+        """
+        Find semantically related words from local definitions and examples, without network calls.
+        :param word: The word to look up.
+        :param k: The maximum number of related words.
+        :param encode: If False, never run the encoder or sync; safe to call from the UI thread.
+        :return: A list of related words, closest first.
+        """
+        index = self.sync_vector_index() if encode else self.vector_index
+        if index is None:
+            return []
+        try:
+            return index.related_words(word.lower(), k, encode=encode)
+        except Exception as e:
+            print(f"Error finding related words for '{word}': {e}")
+            return []
+
     def fetch_word_synonyms(self, word):
         """
-        Fetch synonyms for a word using the dictionary API.
+        Fetch synonyms for a word from stored research or the dictionary API. Only when neither has any,
+        fall back to nearby words in the local semantic index, which may be related rather than synonymous.
         :param word: The word to fetch synonyms for.
         :return: A list of synonyms.
         """
-        definition_data = fetch_word_definition(word)
-        if definition_data and "definitions" in definition_data:
-            synonyms = [
-                synonym
-                for definition in definition_data["definitions"]
-                for synonym in definition.get("synonyms", [])
-            ]
-            return list(set(synonyms))  # Remove duplicates
-        return []
+        filtered = (self.training_data.get("filtered_data") or {}).get(word)
+        synonyms = list(filtered.get("synonyms") or []) if isinstance(filtered, dict) else []
+        if not synonyms:
+            definition_data = fetch_word_definition(word)
+            if definition_data and "definitions" in definition_data:
+                synonyms = [
+                    synonym
+                    for definition in definition_data["definitions"]
+                    for synonym in definition.get("synonyms", [])
+                ]
+        if synonyms:
+            return list(dict.fromkeys(synonyms))  # Remove duplicates
+        return self.find_related_words(word, encode=False)  # Never starts an embedding pass
 
     def fetch_word_examples(self, word):
         """
@@ -374,27 +569,16 @@ class AIManager:
         """
         Answer a question based on the provided context or training data.
         :param question: The question to answer.
-        :param context: The context to use for answering the question. If None, use training data.
+        :param context: The context to use for answering the question. If None, use the best matching training data.
         :return: The answer to the question.
         """
         if not self.question_answering_model:
             return "Question-answering model is not available."
 
         if not context:
-            # Dynamically build context from training data
-            context = "\n".join(
-                [
-                    f"Definition: {definition.get('definition', '')}"
-                    for definition in self.training_data.get("definitions", [])
-                ] + [
-                    f"Synonyms: {', '.join(definition.get('synonyms', []))}"
-                    for definition in self.training_data.get("definitions", [])
-                    if definition.get("synonyms")
-                ] + [
-                    f"Related Topics: {', '.join(entry.get('results', []))}"
-                    for entry in self.training_data.get("research", [])
-                ]
-            )
+            # Only the passages most relevant to the question, so latency stays flat as training data grows
+            self.passage_index.sync(self.training_data)
+            context = "\n".join(self.passage_index.search(question))
             if not context:
                 return "I don't have enough information to answer that question."
 
@@ -526,79 +710,25 @@ class AIManager:
 
         print("AI trained on research results.")
 
-    def research_rampage(self, word, depth=3, visited=None):
+    def research_rampage(self, word, depth=3, visited=None, max_nodes=RESEARCH_CRAWL_MAX_NODES):
         """
-        Perform a recursive research rampage on a word or concept.
+        Research a word or concept and its related words breadth first, with concurrent fetches.
+        An interrupted rampage on the same word resumes from its checkpoint.
         :param word: The word or concept to research.
-        :param depth: The maximum depth of recursive research.
-        :param visited: A set of already visited words to avoid infinite loops.
-        :return: A dictionary containing the research results.
+        :param depth: The maximum depth of the research.
+        :param visited: A set of words not to research.
+        :param max_nodes: The maximum number of words to research.
+        :return: A dictionary containing the research results for the word.
         """
-        if visited is None:
-            visited = set()
-
-        # Stop recursion if depth is exceeded or word is already visited
-        if depth <= 0 or word in visited:
+        if depth <= 0 or (visited and word in visited):
             return {}
 
-        print(f"Researching: {word} (Depth: {depth})")
-        visited.add(word)
-
-        # Check memory before fetching new data
-        memory_data = self.retrieve_memory(word)
-        if memory_data:
-            print(f"Retrieved '{word}' from memory.")
-            return memory_data
-
-        # Fetch initial data for the word
-        research_results = self.filter_and_reference_data(word)
-
-        # Save the research results
-        self.training_data["research_results"] = self.training_data.get("research_results", {})
-        self.training_data["research_results"][word] = research_results
-        self.save_training_data()
-
-        # Update memory with new data
-        self.update_memory(word, research_results)
-
-        # Save the word to words.txt
-        category = categorize_entry(word, research_results)
-        append_word_to_file(word, category)
-
-        # Save related terms as a topic
-        topic_data = {
-            "word": word,
-            "definitions": research_results.get("definitions", []),
-            "examples": research_results.get("examples", []),
-            "synonyms": research_results.get("synonyms", []),
-            "antonyms": research_results.get("antonyms", []),
-            "related_topics": research_results.get("related_topics", []),
-        }
-        save_topic_to_file(word, topic_data)
-
-        # Extract related terms for recursive research
-        related_terms = set()
-
-        # Add synonyms, antonyms, and related topics
-        for meaning in research_results.get("definitions", []):
-            related_terms.update(meaning.get("synonyms", []))
-            related_terms.update(meaning.get("antonyms", []))
-
-        related_terms.update(research_results.get("related_topics", []))
-
-        # Add words from examples
-        for example in research_results.get("examples", []):
-            related_terms.update(example.split())
-
-        # Filter out already visited words
-        related_terms = {term.lower() for term in related_terms if term.lower() not in visited}
-
-        # Recursively research each related term
-        for term in related_terms:
-            time.sleep(0.5)  # Add delay to avoid hitting API rate limits
-            self.research_rampage(term, depth=depth - 1, visited=visited)
-
-        return research_results
+        crawler = ResearchCrawler(self, max_depth=depth, max_nodes=max_nodes)
+        with self.batched_saves():  # One commit for the whole rampage
+            crawler.crawl(word, visited=visited)
+        if crawler.root_data is not None:
+            return crawler.root_data
+        return self.training_data.get("research_results", {}).get(word, {})
 
     def process_and_categorize_data(self, word, data):
         """
@@ -657,21 +787,19 @@ class AIManager:
         :param riddles: A dictionary of riddles categorized by difficulty or topic.
         """
         print("Learning from riddles...")
-        for category, riddle_list in riddles.items():
-            for riddle, answer in riddle_list:
-                # Process the answer
-                answer_data = self.filter_and_reference_data(answer)
-                if answer_data:
-                    # Save the processed data
-                    self.training_data["riddles"].append({
-                        "riddle": riddle,
-                        "answer": answer,
-                        "data": answer_data
-                    })
-                    print(f"Learned from riddle: {riddle} -> {answer}")
-
-        # Save the updated training data
-        self.save_training_data()
+        with self.batched_saves():
+            for category, riddle_list in riddles.items():
+                for riddle, answer in riddle_list:
+                    # Process the answer
+                    answer_data = self.filter_and_reference_data(answer)
+                    if answer_data:
+                        # Save the processed data
+                        self.training_data["riddles"].append({
+                            "riddle": riddle,
+                            "answer": answer,
+                            "data": answer_data
+                        })
+                        print(f"Learned from riddle: {riddle} -> {answer}")
 
     def pull_existing_data(self, word):
         """
@@ -712,10 +840,16 @@ class AIManager:
         """
         print(f"Researching topic: {topic}")
 
+        # Local neighbours first, without running the encoder on the caller's thread
+        related_words = self.find_related_words(topic, encode=False)
+        self.sync_vector_index_async()  # Embeds new training data for later lookups
+
         # Fetch definitions and related data using the content manager
         word_data = fetch_word_definition(topic)
 
         if not word_data:
+            if related_words:
+                return {"word": topic, "definitions": [], "related_words": related_words}
             print(f"No data found for topic: {topic}")
             return f"No information found for '{topic}'."
 
@@ -726,7 +860,8 @@ class AIManager:
             "examples": word_data.get("examples", []),
             "synonyms": word_data.get("synonyms", []),
             "antonyms": word_data.get("antonyms", []),
-            "related_topics": word_data.get("related_topics", [])
+            "related_topics": word_data.get("related_topics", []),
+            "related_words": related_words,
         }
 
         return research_results
\ No newline at end of file
@@ -0,0 +1,152 @@
+# batching_pipeline.py
+# Dynamic request batching in front of a transformers pipeline.
+
+from collections import deque
+from concurrent.futures import Future
+from threading import Condition, Thread
+from time import monotonic
+
+from config import INFERENCE_MAX_BATCH_SIZE, INFERENCE_BATCH_WAIT_MS
+
+# Tasks whose pipelines unwrap single-sequence results when given a list of inputs
+UNWRAPPED_TASKS = ("text2text-generation", "summarization", "translation")
+
+
+class BatchingPipeline:
+    """
+    Wraps a pipeline so that concurrent calls with the same decoding parameters run as one
+    batched forward pass. Each call waits at most max_wait_ms for others to join its batch.
+    Calls that cannot be batched (several inputs, an explicit batch_size) run directly.
+    """
+
+    def __init__(self, pipe, task, max_batch_size=INFERENCE_MAX_BATCH_SIZE, max_wait_ms=INFERENCE_BATCH_WAIT_MS):
+        self.pipe = pipe
+        self.task = task
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.condition = Condition()
+        self.pending = deque()  # (params key, input, params, future)
+        self.closed = False
+        self.thread = None
+        self.batches = 0
+        self.requests = 0
+
+    def __getattr__(self, name):
+        if name == "pipe":
+            raise AttributeError(name)
+        return getattr(self.pipe, name)  # model, tokenizer and the rest of the pipeline
+
+    def __call__(self, *args, **kwargs):
+        return self.submit(*args, **kwargs).result()
+
+    def submit(self, *args, **kwargs):
+        """
+        Queue a call for the next batch.
+        :return: A Future resolving to what the pipeline returns for this call alone.
+        """
+        future = Future()
+        item = self._split(args, kwargs)
+        with self.condition:
+            queued = item is not None and not self.closed and self.max_batch_size > 1
+            if queued:
+                self.pending.append((*item, future))
+                if self.thread is None:
+                    self.thread = Thread(target=self._collect, name=f"batch-{self.task}", daemon=True)
+                    self.thread.start()
+                self.condition.notify()
+        if not queued:
+            try:
+                future.set_result(self.pipe(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        return future
+
+    def _split(self, args, kwargs):
+        """
+        Separate a call into its single input and its decoding parameters.
+        :return: (params key, input, params), or None if the call cannot be batched.
+        """
+        if "batch_size" in kwargs:
+            return None
+        if self.task == "question-answering":
+            question, context = kwargs.get("question"), kwargs.get("context")
+            if args or not isinstance(question, str) or not isinstance(context, str):
+                return None
+            params = {k: v for k, v in kwargs.items() if k not in ("question", "context")}
+            value = {"question": question, "context": context}
+        else:
+            if len(args) != 1 or not isinstance(args[0], str):
+                return None
+            params = kwargs
+            value = args[0]
+        return repr(sorted(params.items())), value, params
+
+    def _collect(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    if self.closed:
+                        self.thread = None
+                        return
+                    self.condition.wait()
+                deadline = monotonic() + self.max_wait
+                while len(self.pending) < self.max_batch_size and not self.closed:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                # Take the oldest call and every queued call sharing its parameters
+                key = self.pending[0][0]
+                batch, rest = [], deque()
+                for item in self.pending:
+                    if item[0] == key and len(batch) < self.max_batch_size:
+                        batch.append(item)
+                    else:
+                        rest.append(item)
+                self.pending = rest
+            self._run_batch(batch)
+
+    def _run_one(self, value, params):
+        if self.task == "question-answering":
+            return self.pipe(**value, **params)
+        return self.pipe(value, **params)
+
+    def _run_batch(self, batch):
+        params = batch[0][2]
+        outputs = None
+        if len(batch) > 1:
+            try:
+                outputs = self.pipe([item[1] for item in batch], batch_size=len(batch), **params)
+                if len(outputs) != len(batch):
+                    outputs = None
+            except Exception as e:
+                print(f"Error running batch of {len(batch)} {self.task} calls, retrying one at a time: {e}")
+        self.batches += 1
+        self.requests += len(batch)
+        for index, item in enumerate(batch):
+            future = item[3]
+            try:
+                if outputs is None:
+                    future.set_result(self._run_one(item[1], params))
+                else:
+                    output = outputs[index]
+                    if self.task in UNWRAPPED_TASKS and isinstance(output, dict):
+                        output = [output]  # Match the shape of a single call
+                    future.set_result(output)
+            except Exception as e:
+                future.set_exception(e)
+
+    def close(self):
+        """
+        Stop batching once queued calls are done; later calls run directly.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def get_stats(self):
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0,
+        }
@@ -1,5 +1,6 @@
 @echo off
 echo Clearing training data while preserving core files...
+echo Close the game, the AI assistant and the inference worker first, so no database is in use.
 
 :: Define the data folder
 set DATA_FOLDER=data
@@ -7,9 +8,16 @@ set DATA_FOLDER=data
 :: Change to the data folder
 cd %DATA_FOLDER%
 
-:: Delete all files except the core files
+:: Delete all files except the core files and player data. This removes:
+::   training_data.db, training_data.db-wal, training_data.db-shm  the AI training data store
+::   training_data.json                                              legacy training data, which a new store would migrate again
+::   definition_cache.db*, inference_cache.db*                       cached lookups and model outputs
+::   lexicon.bin, word_difficulty.npz, generated_files.json          derived files, rebuilt on demand
+::   inference_worker.log
+:: Kept: game content, scores, achievements, per-player word bags (player_bags.db and the legacy
+:: player_bags.json), the journal of unfinished rounds, the daily calendar and the inference worker's key.
 for %%f in (*) do (
-    if /i not "%%f"=="symbols.json" if /i not "%%f"=="predefined_words.json" if /i not "%%f"=="core_language_components.json" if /i not "%%f"=="words.txt" if /i not "%%f"=="riddles_easy.txt" if /i not "%%f"=="riddles_medium.txt" if /i not "%%f"=="riddles_hard.txt" if /i not "%%f"=="scores.json" if /i not "%%f"=="achievements.json" if /i not "%%f"=="riddles.txt" (
+    if /i not "%%f"=="symbols.json" if /i not "%%f"=="predefined_words.json" if /i not "%%f"=="core_language_components.json" if /i not "%%f"=="words.txt" if /i not "%%f"=="riddles_easy.txt" if /i not "%%f"=="riddles_medium.txt" if /i not "%%f"=="riddles_hard.txt" if /i not "%%f"=="scores.json" if /i not "%%f"=="achievements.json" if /i not "%%f"=="riddles.txt" if /i not "%%f"=="player_bags.db" if /i not "%%f"=="player_bags.db-wal" if /i not "%%f"=="player_bags.db-shm" if /i not "%%f"=="player_bags.json" if /i not "%%f"=="game_journal.log" if /i not "%%f"=="daily_calendar.json" if /i not "%%f"=="inference.key" (
         del "%%f"
     )
 )
@@ -21,6 +29,12 @@ if exist topics (
     cd ..
 )
 
+:: Delete the embeddings of the training data and unfinished research crawl checkpoints
+if exist vectors rmdir /s /q vectors
+if exist crawls rmdir /s /q crawls
+
+:: Saved replays in the replays folder are player data and are kept
+
 :: Return to the original directory
 cd ..
 
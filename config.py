@@ -19,3 +19,105 @@ AI_GENERATED_RIDDLES = True
 
 # Configurable TIMER_LIMIT based on difficulty
 TIMER_LIMITS = {1: 30, 2: 60, 3: 90}  # Timer limits for different difficulty levels
+
+# Definition cache settings
+DEFINITION_CACHE_FILE = "data/definition_cache.db"
+DEFINITION_CACHE_TTL = 30 * 24 * 3600  # Keep successful lookups for 30 days
+DEFINITION_CACHE_NEGATIVE_TTL = 24 * 3600  # Retry failed lookups after a day
+DEFINITION_CACHE_MAX_ENTRIES = 50000
+
+# Concurrent definition fetching
+DEFINITION_FETCH_WORKERS = 16
+DEFINITION_PROVIDER_CONCURRENCY = {"dictionaryapi": 8, "datamuse": 4, "wordnik": 2, "oxford": 2}
+DEFINITION_PROVIDER_RATE = {"dictionaryapi": 10, "datamuse": 10, "wordnik": 2, "oxford": 2}  # Requests started per second
+
+# Compiled lexicon bundle (build with: python lexicon_bundle.py build)
+LEXICON_BUNDLE_FILE = "data/lexicon.bin"
+
+# Multi-session game server
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+MAX_SESSIONS = 10000
+SESSION_IDLE_TIMEOUT = 300  # Seconds before an idle session is evicted to a snapshot
+SESSION_SNAPSHOT_LIMIT = 50000  # Evicted-session snapshots kept for transparent restore
+MAX_PLAYER_ID_LENGTH = 64  # Longer "player" names are rejected
+
+# Daily challenge calendar
+DAILY_CALENDAR_FILE = "data/daily_calendar.json"
+DAILY_CALENDAR_DAYS = 366  # Days precomputed from the first day requested
+
+# Game event journal
+GAME_JOURNAL_FILE = "data/game_journal.log"
+JOURNAL_FLUSH_INTERVAL = 0.2  # Seconds between batched writes; at most this much is lost on a crash
+JOURNAL_SNAPSHOT_EVENTS = 32  # Events per session before a snapshot replaces its tail
+JOURNAL_MAX_BYTES = 8 * 1024 * 1024  # Compact the log file once it grows past this size
+
+# Binary round replays
+REPLAY_DIR = "data/replays"
+REPLAY_SEGMENT_RECORDS = 10000  # Replays buffered before a segment file is written
+REPLAY_FLUSH_INTERVAL = 30  # Seconds a finished round may wait in memory before it is written
+
+# Word difficulty calibration (scores range from 0.0, easiest, to 1.0, hardest)
+WORD_DIFFICULTY_FILE = "data/word_difficulty.npz"
+WORD_DIFFICULTY_FILTER = True  # Pick words whose score falls in the difficulty level's range
+DIFFICULTY_SCORE_RANGES = {1: (0.0, 0.45), 2: (0.3, 0.75), 3: (0.6, 1.0)}
+
+# Per-player word scheduling
+PLAYER_BAGS_FILE = "data/player_bags.db"  # A player_bags.json from earlier versions is imported on first use
+WORD_SCHEDULER_SEED = None  # Set to an integer for reproducible per-player word orders
+SCHEDULER_MAX_PLAYERS = 10000  # Players whose bags are kept in memory; the least recently dealt to are written out
+SCHEDULER_MAX_STORED_PLAYERS = 100000  # Players kept on disk; the least recently updated are forgotten
+
+# AI model registry
+MODEL_MEMORY_BUDGET_MB = 2048  # Least recently used models are unloaded once loaded weights exceed this
+MODEL_IDLE_TIMEOUT = 600  # Seconds before an unused model is unloaded; 0 keeps models loaded
+MODEL_RETRY_BACKOFF = 60  # Seconds before a model that failed to load is tried again; doubles per failure
+MODEL_RETRY_MAX_BACKOFF = 3600  # Longest wait between attempts to load a failing model
+
+# Shared inference worker
+INFERENCE_WORKER = True  # Run the models once in a worker process shared by every front end
+INFERENCE_SOCKET = "data/inference.sock"
+INFERENCE_AUTHKEY_FILE = "data/inference.key"  # Shared secret clients must prove before any request is unpickled
+INFERENCE_TIMEOUT = 60  # Seconds to wait for a model call, which may include loading the model
+INFERENCE_CONNECT_TIMEOUT = 10  # Seconds to wait for a newly started worker to accept connections
+INFERENCE_WORKER_IDLE_EXIT = 1800  # Seconds without clients before the worker exits; 0 keeps it running
+INFERENCE_WORKER_LOG = "data/inference_worker.log"
+
+# Dynamic batching of concurrent model calls
+INFERENCE_MAX_BATCH_SIZE = 16  # Calls run together in one forward pass; 1 disables batching
+INFERENCE_BATCH_WAIT_MS = 5  # How long a call waits for others to join its batch
+
+# Inference result cache
+INFERENCE_CACHE_FILE = "data/inference_cache.db"
+INFERENCE_CACHE_MEMORY_ENTRIES = 2048  # Most recently used outputs kept in memory
+INFERENCE_CACHE_MAX_ENTRIES = 100000  # Oldest outputs are evicted from disk past this count
+
+# Question answering retrieval
+PASSAGE_TOP_K = 5  # Training data passages given to the question-answering model per question
+
+# Semantic vector index
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # CPU sentence encoder; None uses hashed word features
+VECTOR_INDEX_DIR = "data/vectors"
+
+# AI training data store (migrated from data/training_data.json on first use)
+TRAINING_STORE_FILE = "data/training_data.db"
+TRAINING_FLUSH_INTERVAL = 0.5  # Seconds changes wait before they are committed; at most this much is lost on a crash
+TRAINING_FLUSH_ITEMS = 1000  # Commit early once this many row writes are pending
+
+# AI word memory
+SHORT_TERM_MEMORY_ENTRIES = 100  # Most recently stored words kept in the short-term tier
+LONG_TERM_MEMORY_ENTRIES = 5000  # Words kept in the long-term tier, least frequently used evicted first
+LONG_TERM_MEMORY_BYTES = 16 * 1024 * 1024  # Serialized size limit of the long-term tier
+MEMORY_AGING_ACCESSES = 5000  # Halve every access count after this many memory hits
+
+# Research crawler
+RESEARCH_CRAWL_DIR = "data/crawls"  # Checkpoints of unfinished crawls, one per root word
+RESEARCH_CRAWL_WORKERS = 8  # Terms fetched concurrently; provider rate limits still apply
+RESEARCH_CRAWL_MAX_NODES = 500  # Terms researched per crawl
+RESEARCH_CHECKPOINT_INTERVAL = 5  # Seconds between checkpoints of a running crawl
+
+# Generated AI files
+GENERATED_FILES_MANIFEST = "data/generated_files.json"  # Input hashes and generation times of the AI's files
+
+# Quitting
+SHUTDOWN_TIMEOUT = 5  # Seconds to wait for running background jobs when the game window closes
@@ -6,6 +6,54 @@ import os
 import json
 import time  # Reintroduced for delay handling
 import re  # Import regex for sanitizing filenames
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock, Thread
+from config import DEFINITION_FETCH_WORKERS, DEFINITION_PROVIDER_CONCURRENCY, DEFINITION_PROVIDER_RATE, LEXICON_BUNDLE_FILE
+from definition_cache import get_definition_cache
+from lexicon_bundle import compute_source_signature, open_lexicon_bundle, write_lexicon_bundle
+
+
+class ProviderLimit:
+    """
+    Limits the requests to one dictionary provider across all threads: at most `concurrency`
+    in flight at once, and at most `rate` started per second.
+    """
+
+    def __init__(self, concurrency, rate=None):
+        self.semaphore = BoundedSemaphore(concurrency)
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+        self.lock = Lock()
+
+    def __enter__(self):
+        # Reserve a start slot before taking a concurrency slot, so threads waiting for the rate
+        # do not hold the semaphore while they sleep
+        if self.interval:
+            with self.lock:
+                now = time.monotonic()
+                start = max(now, self.next_start)
+                self.next_start = start + self.interval
+            if start > now:
+                time.sleep(start - now)
+        self.semaphore.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.semaphore.release()
+
+
+# Limit how many requests may be in flight against, and be started per second on, each dictionary provider
+provider_limits = {
+    provider: ProviderLimit(limit, DEFINITION_PROVIDER_RATE.get(provider))
+    for provider, limit in DEFINITION_PROVIDER_CONCURRENCY.items()
+}
+
+
+def has_api_key(*keys):
+    """
+    Check that every key a provider needs is set and is not the placeholder shipped in the source.
+    """
+    return all(key and not key.startswith("YOUR_") for key in keys)
 
 
 def categorize_entry(entry, dictionary_data):
@@ -35,38 +83,205 @@ def categorize_entry(entry, dictionary_data):
     return "uncategorized"
 
 
-def load_words(filepath="data/words.txt", ai_manager=None):
+DEFAULT_RIDDLE_FILES = {
+    "easy": "data/riddles_easy.txt",
+    "medium": "data/riddles_medium.txt",
+    "hard": "data/riddles_hard.txt",
+}
+
+
+def read_word_entries(filepath):
     """
-    Load words from a file into a dictionary by category.
-    Dynamically categorize words using the dictionary API.
-    Optionally train the AI on the loaded words.
+    Read the words listed in a words file.
+    :param filepath: The path to the words file.
+    :return: A list of uppercase words in file order.
     """
-    words = {"default": ["PYTHON", "GAME", "HANGMAN"]}  # Ensure a default category exists
-    all_words = []  # Collect all words for AI training
+    all_words = []
     try:
         with open(filepath, "r") as f:
             for line in f:
                 try:
                     category, word = line.strip().split(",", 1)
-                    word = word.upper()
-                    dictionary_data = fetch_word_definition(word)
-                    dynamic_category = categorize_entry(word, dictionary_data)
-                    words.setdefault(dynamic_category, []).append(word)
-                    all_words.append(word)
+                    all_words.append(word.upper())
                 except ValueError:
                     print(f"Malformed line in words file: {line}")
     except FileNotFoundError:
-        print(f"Words file not found. Using default words: {words['default']}")
+        print(f"Words file not found: {filepath}")
+    return all_words
 
-    # Dynamically include topics from the topics folder
-    topics_folder = "data/topics"
+
+def read_riddle_entries(difficulty_files):
+    """
+    Read the riddles listed in each difficulty file.
+    :param difficulty_files: A dictionary of difficulty -> riddle file path.
+    :return: A list of (riddle, answer) tuples in file order.
+    """
+    entries = []
+    for level, filepath in difficulty_files.items():
+        try:
+            with open(filepath, "r") as f:
+                for line in f:
+                    try:
+                        riddle, answer = line.strip().split(",", 1)
+                        entries.append((riddle, answer.upper()))
+                    except ValueError:
+                        print(f"Malformed line in {filepath}: {line}")
+        except FileNotFoundError:
+            print(f"Riddles file not found: {filepath}")
+    return entries
+
+
+def read_topic_words(topics_folder="data/topics"):
+    """
+    Read the word lists stored in the topics folder.
+    :param topics_folder: The folder where topic files are stored.
+    :return: A dictionary of topic name -> list of words.
+    """
+    topics = {}
     if os.path.exists(topics_folder):
         for topic_file in os.listdir(topics_folder):
             if topic_file.endswith(".json"):
                 topic_name = topic_file.replace("_", " ").replace(".json", "")
                 with open(os.path.join(topics_folder, topic_file), "r") as f:
                     topic_data = json.load(f)
-                    words[topic_name] = topic_data.get("results", [])
+                    topics[topic_name] = topic_data.get("results", [])
+    return topics
+
+
+def load_predefined_definitions(filepath="data/predefined_words.json"):
+    """
+    Load the predefined word data used to categorize words without a network lookup.
+    """
+    try:
+        with open(filepath, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def lookup_definitions(words, predefined=None, offline=False):
+    """
+    Look up definitions for a list of words, preferring predefined data over the network.
+    :param words: A list of words.
+    :param predefined: Predefined word data keyed by lowercase word.
+    :param offline: Only use predefined data and the definition cache; never touch the network.
+    :return: A list of definition dictionaries (or None) in input order.
+    """
+    predefined = predefined or {}
+    remote_words = [word for word in words if word.lower() not in predefined]
+    if offline:
+        cache = get_definition_cache()
+        remote_data = {word: cache.get(word)[1] for word in remote_words if word.isalpha()}
+    else:
+        remote_data = dict(zip(remote_words, fetch_word_definitions(remote_words)))
+    return [predefined.get(word.lower()) or remote_data.get(word) for word in words]
+
+
+def categorize_words(all_words, predefined=None, offline=False):
+    """
+    Group words into categories derived from their definitions.
+    :return: A dictionary of category -> list of words, including the default category.
+    """
+    words = {"default": ["PYTHON", "GAME", "HANGMAN"]}  # Ensure a default category exists
+    for word, dictionary_data in zip(all_words, lookup_definitions(all_words, predefined, offline)):
+        dynamic_category = categorize_entry(word, dictionary_data)
+        words.setdefault(dynamic_category, []).append(word)
+    return words
+
+
+def categorize_riddles(entries, predefined=None, offline=False):
+    """
+    Group riddles into categories derived from the definitions of their answers.
+    :return: A dictionary of category -> list of (riddle, answer) tuples.
+    """
+    riddles = {}
+    answers = [answer for _, answer in entries]
+    for (riddle, answer), dictionary_data in zip(entries, lookup_definitions(answers, predefined, offline)):
+        dynamic_category = categorize_entry(answer, dictionary_data)
+        riddles.setdefault(dynamic_category, []).append((riddle, answer))
+    return riddles
+
+
+def get_lexicon_signature(words_file="data/words.txt", difficulty_files=None,
+                          predefined_file="data/predefined_words.json"):
+    """
+    Compute the source signature of every file that feeds the lexicon bundle.
+    Topic files are written by every research crawl, so they are read at load time
+    instead of being compiled into the bundle, and are not part of the signature.
+    """
+    sources = [words_file, predefined_file]
+    sources.extend((difficulty_files or DEFAULT_RIDDLE_FILES).values())
+    return compute_source_signature(sources)
+
+
+def build_lexicon_bundle(output=LEXICON_BUNDLE_FILE, words_file="data/words.txt", difficulty_files=None,
+                         predefined_file="data/predefined_words.json"):
+    """
+    Categorize every word and riddle and compile them into a lexicon bundle.
+    """
+    difficulty_files = difficulty_files or DEFAULT_RIDDLE_FILES
+    signature = get_lexicon_signature(words_file, difficulty_files, predefined_file)
+    predefined = load_predefined_definitions(predefined_file)
+
+    words = categorize_words(read_word_entries(words_file), predefined)
+    riddles = categorize_riddles(read_riddle_entries(difficulty_files), predefined)
+
+    write_lexicon_bundle(output, words, riddles, signature)
+    print(f"Lexicon bundle written to {output}: {sum(len(w) for w in words.values())} words, "
+          f"{sum(len(r) for r in riddles.values())} riddles.")
+
+
+_bundle_rebuild = None  # Thread rebuilding an out-of-date lexicon bundle
+_bundle_rebuild_lock = Lock()
+
+
+def rebuild_lexicon_bundle_async(output=LEXICON_BUNDLE_FILE):
+    """
+    Rebuild an out-of-date lexicon bundle on a background thread, so the next start loads it
+    instead of categorizing every word again. At most one rebuild runs at a time.
+    """
+    global _bundle_rebuild
+    with _bundle_rebuild_lock:
+        if _bundle_rebuild is not None and _bundle_rebuild.is_alive():
+            return
+        _bundle_rebuild = Thread(target=_rebuild_lexicon_bundle, args=(output,), name="lexicon-bundle", daemon=True)
+        _bundle_rebuild.start()
+
+
+def _rebuild_lexicon_bundle(output):
+    try:
+        build_lexicon_bundle(output)
+    except Exception as e:
+        print(f"Error rebuilding lexicon bundle: {e}")
+
+
+def load_words(filepath="data/words.txt", ai_manager=None, offline=False):
+    """
+    Load words from a file into a dictionary by category.
+    Uses the compiled lexicon bundle when it is up to date, otherwise
+    dynamically categorizes words using the dictionary API.
+    Optionally train the AI on the loaded words.
+    With offline=True, words are categorized from cached definitions only.
+    """
+    bundle = None
+    if filepath == "data/words.txt":
+        bundle = open_lexicon_bundle(get_lexicon_signature())
+        if bundle is None and not offline and os.path.exists(LEXICON_BUNDLE_FILE):
+            rebuild_lexicon_bundle_async()  # Stale after new words were learned; this run takes the slow path
+
+    if bundle:
+        # Categories are decoded and shuffled on first access
+        if ai_manager:
+            ai_manager.train_on_words(bundle.get_all_words())
+        words = bundle.get_word_categories()
+        words.update(read_topic_words())
+        return words
+
+    all_words = read_word_entries(filepath)  # Collect all words for AI training
+    words = categorize_words(all_words, load_predefined_definitions(), offline)
+
+    # Dynamically include topics from the topics folder
+    words.update(read_topic_words())
 
     # Train the AI on the loaded words
     if ai_manager:
@@ -75,33 +290,22 @@ def load_words(filepath="data/words.txt", ai_manager=None):
     return {category: random.sample(words, len(words)) for category, words in words.items()}
 
 
-def load_riddles(difficulty=None, difficulty_files=None):
+def load_riddles(difficulty=None, difficulty_files=None, offline=False):
     """
     Load riddles from separate files for each difficulty level.
-    Dynamically categorize riddle answers using the dictionary API.
+    Uses the compiled lexicon bundle when it is up to date, otherwise
+    dynamically categorizes riddle answers using the dictionary API.
+    With offline=True, answers are categorized from cached definitions only.
     """
+    bundle = None
     if difficulty_files is None:
-        difficulty_files = {
-            "easy": "data/riddles_easy.txt",
-            "medium": "data/riddles_medium.txt",
-            "hard": "data/riddles_hard.txt",
-        }
+        bundle = open_lexicon_bundle(get_lexicon_signature())
+        difficulty_files = DEFAULT_RIDDLE_FILES
 
-    riddles = {}
-    for level, filepath in difficulty_files.items():
-        try:
-            with open(filepath, "r") as f:
-                for line in f:
-                    try:
-                        riddle, answer = line.strip().split(",", 1)
-                        answer = answer.upper()
-                        dictionary_data = fetch_word_definition(answer)
-                        dynamic_category = categorize_entry(answer, dictionary_data)
-                        riddles.setdefault(dynamic_category, []).append((riddle, answer))
-                    except ValueError:
-                        print(f"Malformed line in {filepath}: {line}")
-        except FileNotFoundError:
-            print(f"Riddles file not found: {filepath}")
+    if bundle:
+        riddles = bundle.get_riddle_categories()
+    else:
+        riddles = categorize_riddles(read_riddle_entries(difficulty_files), load_predefined_definitions(), offline)
 
     if difficulty:
         return riddles.get(difficulty, [])
@@ -157,7 +361,8 @@ def fetch_online_riddles(num_riddles=5, filepath="data/riddles.txt"):
 
 def fetch_word_definition(word):
     """
-    Fetch the definition of a word using multiple APIs as fallbacks.
+    Fetch the definition of a word, using the persistent definition cache before the network.
+    Failed lookups are cached too, so a word that no API knows is not retried on every call.
     :param word: The word to look up.
     :return: A dictionary containing the word's definition, synonyms, and example usage.
     """
@@ -166,10 +371,66 @@ def fetch_word_definition(word):
         print(f"Skipping unsupported input: '{word}'")
         return None
 
+    hit, data = get_definition_cache().get(word)
+    if hit:
+        return data
+    return fetch_and_cache_word_definition(word)
+
+
+def fetch_and_cache_word_definition(word):
+    """
+    Fetch a word's definition from the network and store the result in the definition cache.
+    :param word: The word to look up.
+    :return: The definition dictionary, or None if all APIs failed.
+    """
+    data = fetch_word_definition_online(word)
+    get_definition_cache().put(word, data)
+    return data
+
+
+def fetch_word_definitions(words, max_workers=DEFINITION_FETCH_WORKERS):
+    """
+    Fetch definitions for many words concurrently.
+    Duplicate words are looked up once, cached words skip the worker pool entirely,
+    and per-provider request limits still apply to the concurrent lookups.
+    :param words: A list of words to look up.
+    :param max_workers: The maximum number of concurrent lookups.
+    :return: A list of definition dictionaries (or None) in the same order as the input.
+    """
+    unique_words = list(dict.fromkeys(words))
+    results = {}
+    pending = []
+
+    cache = get_definition_cache()
+    for word in unique_words:
+        if not word.isalpha():
+            results[word] = None
+            continue
+        hit, data = cache.get(word)
+        if hit:
+            results[word] = data
+        else:
+            pending.append(word)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending)))) as executor:
+            for word, data in zip(pending, executor.map(fetch_and_cache_word_definition, pending)):
+                results[word] = data
+
+    return [results[word] for word in words]
+
+
+def fetch_word_definition_online(word):
+    """
+    Fetch the definition of a word using multiple APIs as fallbacks.
+    :param word: The word to look up.
+    :return: A dictionary containing the word's definition, synonyms, and example usage.
+    """
     # Primary API: DictionaryAPI
     url_primary = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
     try:
-        response = requests.get(url_primary, timeout=5)
+        with provider_limits["dictionaryapi"]:
+            response = requests.get(url_primary, timeout=5)
         response.raise_for_status()
         data = response.json()
         if isinstance(data, list) and len(data) > 0:
@@ -194,7 +455,8 @@ def fetch_word_definition(word):
     # Fallback API 1: Datamuse API
     url_datamuse = f"https://api.datamuse.com/words?sp={word}&md=d"
     try:
-        response = requests.get(url_datamuse, timeout=5)
+        with provider_limits["datamuse"]:
+            response = requests.get(url_datamuse, timeout=5)
         response.raise_for_status()
         data = response.json()
         if data:
@@ -210,45 +472,49 @@ def fetch_word_definition(word):
     # Fallback API 2: Wordnik API (requires API key)
     api_key_wordnik = "YOUR_WORDNIK_API_KEY"  # Replace with your Wordnik API key
     url_wordnik = f"https://api.wordnik.com/v4/word.json/{word}/definitions?api_key={api_key_wordnik}"
-    try:
-        response = requests.get(url_wordnik, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        if data:
-            definitions = [{"definition": entry.get("text", "")} for entry in data]
-            return {
-                "word": word,
-                "definitions": definitions,
-                "phonetics": [],
-            }
-    except requests.exceptions.RequestException as e:
-        print(f"Wordnik API failed for '{word}': {e}")
+    if has_api_key(api_key_wordnik):  # Skip providers whose key is unset or still the placeholder
+        try:
+            with provider_limits["wordnik"]:
+                response = requests.get(url_wordnik, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+            if data:
+                definitions = [{"definition": entry.get("text", "")} for entry in data]
+                return {
+                    "word": word,
+                    "definitions": definitions,
+                    "phonetics": [],
+                }
+        except requests.exceptions.RequestException as e:
+            print(f"Wordnik API failed for '{word}': {e}")
 
     # Fallback API 3: Oxford Dictionaries API (requires API key)
     app_id_oxford = "YOUR_OXFORD_APP_ID"  # Replace with your Oxford App ID
     app_key_oxford = "YOUR_OXFORD_APP_KEY"  # Replace with your Oxford App Key
     url_oxford = f"https://od-api.oxforddictionaries.com/api/v2/entries/en-us/{word}"
     headers_oxford = {"app_id": app_id_oxford, "app_key": app_key_oxford}
-    try:
-        response = requests.get(url_oxford, headers=headers_oxford, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        if "results" in data:
-            definitions = []
-            for lexical_entry in data["results"][0].get("lexicalEntries", []):
-                for entry in lexical_entry.get("entries", []):
-                    for sense in entry.get("senses", []):
-                        definitions.append({
-                            "definition": sense.get("definitions", [""])[0],
-                            "example": sense.get("examples", [{}])[0].get("text", ""),
-                        })
-            return {
-                "word": word,
-                "definitions": definitions,
-                "phonetics": [],
-            }
-    except requests.exceptions.RequestException as e:
-        print(f"Oxford API failed for '{word}': {e}")
+    if has_api_key(app_id_oxford, app_key_oxford):
+        try:
+            with provider_limits["oxford"]:
+                response = requests.get(url_oxford, headers=headers_oxford, timeout=5)
+            response.raise_for_status()
+            data = response.json()
+            if "results" in data:
+                definitions = []
+                for lexical_entry in data["results"][0].get("lexicalEntries", []):
+                    for entry in lexical_entry.get("entries", []):
+                        for sense in entry.get("senses", []):
+                            definitions.append({
+                                "definition": sense.get("definitions", [""])[0],
+                                "example": sense.get("examples", [{}])[0].get("text", ""),
+                            })
+                return {
+                    "word": word,
+                    "definitions": definitions,
+                    "phonetics": [],
+                }
+        except requests.exceptions.RequestException as e:
+            print(f"Oxford API failed for '{word}': {e}")
 
     # If all APIs fail
     print(f"All APIs failed for '{word}'.")
@@ -0,0 +1,197 @@
+# daily_challenge.py
+
+import hashlib
+import json
+import os
+import random
+from datetime import date, timedelta
+
+from config import DAILY_CALENDAR_FILE, DAILY_CALENDAR_DAYS
+
+# Bump when the selection rules change so cached calendars are rebuilt
+CALENDAR_VERSION = 1
+
+
+def _canonical_words(words):
+    """
+    Return the word categories with sorted, string-only entries, skipping empty categories.
+    Loaded categories are shuffled, so selection must not depend on their order.
+    """
+    canonical = {}
+    for category in sorted(words):
+        entries = sorted({word for word in words[category] if isinstance(word, str) and word})
+        if entries:
+            canonical[category] = entries
+    return canonical
+
+
+def _canonical_riddles(riddles):
+    canonical = {}
+    for category in sorted(riddles):
+        entries = sorted({(riddle, answer) for riddle, answer in riddles[category]})
+        if entries:
+            canonical[category] = entries
+    return canonical
+
+
+def compute_lexicon_fingerprint(words, riddles):
+    """
+    Hash the content of the word and riddle categories.
+    Unlike the bundle signature this ignores file timestamps, so every node with the
+    same lexicon computes the same fingerprint and therefore the same calendar.
+    :param words: Canonical word categories from _canonical_words.
+    :param riddles: Canonical riddle categories from _canonical_riddles.
+    :return: A hex digest.
+    """
+    digest = hashlib.sha256(f"calendar-v{CALENDAR_VERSION}\n".encode())
+    for category, entries in words.items():
+        digest.update(f"W\0{category}\0{len(entries)}\n".encode())
+        digest.update("\0".join(entries).encode())
+    for category, entries in riddles.items():
+        digest.update(f"R\0{category}\0{len(entries)}\n".encode())
+        digest.update("\0".join(f"{riddle}\1{answer}" for riddle, answer in entries).encode())
+    return digest.hexdigest()
+
+
+class DailyChallengeCalendar:
+    """
+    Precomputed daily word and riddle challenges.
+    Each day's pick comes from its own random.Random seeded with the lexicon fingerprint
+    and the date, so it never touches the global RNG or any game's RNG, and any day can be
+    recomputed independently. The calendar is cached on disk and rebuilt when the lexicon
+    changes or a date outside the cached range is requested. A rebuild keeps the entries
+    for today and earlier days, since players may already have seen them; only future days
+    follow the new lexicon.
+    """
+
+    def __init__(self, words, riddles, path=DAILY_CALENDAR_FILE, days=DAILY_CALENDAR_DAYS):
+        self.path = path
+        self.days = days
+        self.words = _canonical_words(words)
+        self.riddles = _canonical_riddles(riddles)
+        self.fingerprint = compute_lexicon_fingerprint(self.words, self.riddles)
+        self.start = None
+        self.word_challenges = []
+        self.riddle_challenges = []
+        self.stale = False  # Loaded from a different lexicon; kept only for its published days
+        self.load()
+
+    def pick(self, day):
+        """
+        Compute the challenges for a single day.
+        :return: A tuple (word, (riddle, answer)); either may be None if the lexicon has none.
+        """
+        rng = random.Random(f"{self.fingerprint}|{day.isoformat()}")
+        word = riddle = None
+        if self.words:
+            category = rng.choice(list(self.words))
+            word = rng.choice(self.words[category])
+        if self.riddles:
+            category = rng.choice(list(self.riddles))
+            riddle = rng.choice(self.riddles[category])
+        return word, riddle
+
+    def published(self):
+        """
+        Return the current calendar's entries for today and the earlier days still in range.
+        :return: A dictionary of date -> (word, (riddle, answer)).
+        """
+        today = date.today()
+        entries = {}
+        if self.start is None:
+            return entries
+        for offset, word in enumerate(self.word_challenges):
+            day = self.start + timedelta(days=offset)
+            if day > today:
+                break
+            if (today - day).days < self.days:
+                entries[day] = (word, self.riddle_challenges[offset])
+        return entries
+
+    def build(self, start):
+        """
+        Precompute the calendar from a start date and write it to disk.
+        Published entries of the previous calendar are kept, so the calendar may start earlier.
+        """
+        published = self.published()
+        first = min([start, *published])
+        self.start = first
+        self.word_challenges, self.riddle_challenges = [], []
+        for offset in range((start - first).days + self.days):
+            day = first + timedelta(days=offset)
+            word, riddle = published.get(day) or self.pick(day)
+            self.word_challenges.append(word)
+            self.riddle_challenges.append(riddle)
+        self.stale = False
+        self.save()
+
+    def save(self):
+        """
+        Write the calendar atomically so a concurrent reader never sees a partial file.
+        """
+        calendar = {
+            "version": CALENDAR_VERSION,
+            "fingerprint": self.fingerprint,
+            "start": self.start.isoformat(),
+            "words": self.word_challenges,
+            "riddles": self.riddle_challenges,
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(calendar, f)
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            print(f"Error saving daily challenge calendar: {e}")
+
+    def load(self):
+        """
+        Load the cached calendar. One built from a different lexicon is kept as stale,
+        so the next build can keep its published entries.
+        :return: True if a current calendar was loaded.
+        """
+        try:
+            with open(self.path, "r") as f:
+                calendar = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading daily challenge calendar: {e}")
+            return False
+        if calendar.get("version") != CALENDAR_VERSION:
+            return False
+        self.start = date.fromisoformat(calendar["start"])
+        self.word_challenges = calendar["words"]
+        self.riddle_challenges = [tuple(riddle) if riddle else None for riddle in calendar["riddles"]]
+        self.stale = calendar.get("fingerprint") != self.fingerprint
+        return not self.stale
+
+    def _offset(self, day):
+        if self.stale or self.start is None or not 0 <= (day - self.start).days < len(self.word_challenges):
+            self.build(day)
+        return (day - self.start).days
+
+    def get_word(self, day=None):
+        """
+        Return the daily challenge word for a date (today by default).
+        """
+        offset = self._offset(day or date.today())
+        return self.word_challenges[offset]
+
+    def get_riddle(self, day=None):
+        """
+        Return the daily challenge (riddle, answer) tuple for a date (today by default).
+        """
+        offset = self._offset(day or date.today())
+        return self.riddle_challenges[offset]
+
+    def get_challenge(self, mode, day=None):
+        """
+        Return the daily challenge for a game mode: a word for 'word_guess', a (riddle, answer)
+        tuple for 'riddle_time', or None for any other mode.
+        """
+        if mode == "word_guess":
+            return self.get_word(day)
+        if mode == "riddle_time":
+            return self.get_riddle(day)
+        return None
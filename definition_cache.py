@@ -0,0 +1,159 @@
+# definition_cache.py
+
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+
+from config import (
+    DEFINITION_CACHE_FILE,
+    DEFINITION_CACHE_TTL,
+    DEFINITION_CACHE_NEGATIVE_TTL,
+    DEFINITION_CACHE_MAX_ENTRIES,
+)
+
+
+class DefinitionCache:
+    """
+    Persistent on-disk cache for dictionary lookups.
+    Entries expire after a per-entry TTL, failed lookups are cached for a shorter
+    time, and the oldest entries are evicted once the cache grows past its size limit.
+    """
+
+    def __init__(
+        self,
+        db_path=DEFINITION_CACHE_FILE,
+        ttl=DEFINITION_CACHE_TTL,
+        negative_ttl=DEFINITION_CACHE_NEGATIVE_TTL,
+        max_entries=DEFINITION_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS definitions (
+                word TEXT PRIMARY KEY,
+                data TEXT,
+                stored_at REAL,
+                expires_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_definitions_stored_at ON definitions (stored_at)")
+        self.conn.commit()
+        self.size = self.conn.execute("SELECT COUNT(*) FROM definitions").fetchone()[0]
+
+    def get(self, word):
+        """
+        Look up a word in the cache.
+        :param word: The word to look up.
+        :return: A tuple (hit, data). data is None for cached failures.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT data, expires_at FROM definitions WHERE word = ?", (word.lower(),)
+            ).fetchone()
+            if row is None or row[1] < time.time():
+                self.misses += 1
+                return False, None
+
+            self.hits += 1
+            if row[0] is None:
+                self.negative_hits += 1
+                return True, None
+            return True, json.loads(row[0])
+
+    def put(self, word, data):
+        """
+        Store a lookup result. A result of None records that all APIs failed.
+        :param word: The word that was looked up.
+        :param data: The definition data, or None.
+        """
+        now = time.time()
+        ttl = self.ttl if data is not None else self.negative_ttl
+        payload = json.dumps(data) if data is not None else None
+        with self.lock:
+            cursor = self.conn.execute(
+                "UPDATE definitions SET data = ?, stored_at = ?, expires_at = ? WHERE word = ?",
+                (payload, now, now + ttl, word.lower()),
+            )
+            if cursor.rowcount == 0:
+                self.conn.execute(
+                    "INSERT INTO definitions (word, data, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (word.lower(), payload, now, now + ttl),
+                )
+                self.size += 1
+            if self.size > self.max_entries:
+                self._evict(now)
+            self.conn.commit()
+
+    def _evict(self, now):
+        """
+        Drop expired entries first, then the oldest entries until the cache fits its limit.
+        Caller must hold the lock.
+        """
+        removed = self.conn.execute("DELETE FROM definitions WHERE expires_at < ?", (now,)).rowcount
+        overflow = self.size - removed - self.max_entries
+        if overflow > 0:
+            removed += self.conn.execute(
+                "DELETE FROM definitions WHERE word IN "
+                "(SELECT word FROM definitions ORDER BY stored_at LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        self.size -= removed
+        self.evictions += removed
+
+    def clear(self):
+        """
+        Remove every entry from the cache and reset the counters.
+        """
+        with self.lock:
+            self.conn.execute("DELETE FROM definitions")
+            self.conn.commit()
+            self.size = 0
+            self.hits = self.misses = self.negative_hits = self.evictions = 0
+
+    def get_stats(self):
+        """
+        Return the cache counters as a dictionary.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+_definition_cache = None
+_definition_cache_lock = Lock()
+
+
+def get_definition_cache():
+    """
+    Return the process-wide definition cache, opening it on first use.
+    """
+    global _definition_cache
+    if _definition_cache is None:
+        with _definition_cache_lock:
+            if _definition_cache is None:
+                _definition_cache = DefinitionCache()
+    return _definition_cache
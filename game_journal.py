@@ -0,0 +1,203 @@
+# game_journal.py
+
+import json
+import os
+from threading import Condition, Lock, Thread
+from time import time
+
+from config import GAME_JOURNAL_FILE, JOURNAL_FLUSH_INTERVAL, JOURNAL_SNAPSHOT_EVENTS, JOURNAL_MAX_BYTES
+
+# Events carrying a full game state, which replaces the session's earlier history
+STATE_EVENTS = ("start", "snapshot")
+# Events that finish a session; finished sessions are not recovered
+END_EVENTS = ("end", "close")
+
+
+class GameJournal:
+    """
+    Append-only log of game events for any number of sessions, one JSON record per line.
+    Records are buffered and written by a flusher thread with a single fsync per batch, so
+    thousands of sessions guessing at once cost one disk sync every flush interval.
+    Each live session is kept in memory as its last full state plus the events since. After
+    JOURNAL_SNAPSHOT_EVENTS events a snapshot replaces that tail, and once the file grows past
+    JOURNAL_MAX_BYTES it is rewritten with only the live histories, so recovery replays little.
+    """
+
+    def __init__(self, path=GAME_JOURNAL_FILE, flush_interval=JOURNAL_FLUSH_INTERVAL,
+                 snapshot_events=JOURNAL_SNAPSHOT_EVENTS, max_bytes=JOURNAL_MAX_BYTES):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.snapshot_events = snapshot_events
+        self.max_bytes = max_bytes
+        self.condition = Condition()
+        self.write_lock = Lock()
+        self.buffer = []
+        self.sessions = {}  # session id -> [state record, later event records...]
+        self.closed = False
+        self.records_written = 0
+        self.syncs = 0
+        self.compactions = 0
+
+        self.recover()
+        self.file = open(path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+        self.flusher = Thread(target=self._flush_loop, name="game-journal", daemon=True)
+        self.flusher.start()
+
+    def recover(self):
+        """
+        Rebuild the live session histories from the log file.
+        A record torn by a crash can only be the last line; it is dropped and truncated away
+        so new records are not appended to it.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        except IOError as e:
+            print(f"Error reading game journal: {e}")
+            return
+
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+        for line in data[:end].splitlines():
+            try:
+                self._track(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                continue  # Skip records that cannot be parsed rather than losing the rest
+
+    def _track(self, record):
+        """
+        Apply a record to the in-memory session histories.
+        :return: False if the record belongs to no live session and need not be written.
+        """
+        session_id, event = record["session"], record["event"]
+        if event in STATE_EVENTS:
+            self.sessions[session_id] = [record]
+        elif event in END_EVENTS:
+            return self.sessions.pop(session_id, None) is not None
+        elif session_id in self.sessions:
+            self.sessions[session_id].append(record)
+        else:
+            return False
+        return True
+
+    def record(self, session_id, event, game=None, **data):
+        """
+        Append an event to a session's journal. The write happens in the next batch.
+        :param session_id: The session the event belongs to.
+        :param event: One of 'start', 'guess', 'hint', 'power_up', 'pause', 'resume', 'end' or 'close'.
+        :param game: The HangmanGame, used to take a snapshot once the session's tail grows long.
+        :param data: Event fields, such as the guessed letter.
+        """
+        record = {"session": session_id, "event": event, "time": time(), **data}
+        with self.condition:
+            if self.closed or not self._track(record):
+                return
+            self.buffer.append(record)
+            history = self.sessions.get(session_id)
+            if game is not None and history and len(history) > self.snapshot_events:
+                snapshot = {"session": session_id, "event": "snapshot", "time": record["time"],
+                            "state": game.get_game_state()}
+                self._track(snapshot)
+                self.buffer.append(snapshot)
+
+    def get_session(self, session_id):
+        """
+        Return what is needed to resume a session.
+        :return: A tuple (state, events) of the last full game state and the events since,
+                 or None if the session is unknown or finished.
+        """
+        with self.condition:
+            history = self.sessions.get(session_id)
+            if not history:
+                return None
+            return history[0]["state"], list(history[1:])
+
+    def get_live_sessions(self):
+        """
+        Return the ids of every session that has not finished.
+        """
+        with self.condition:
+            return list(self.sessions)
+
+    def _flush_loop(self):
+        while True:
+            with self.condition:
+                if not self.closed:
+                    self.condition.wait(self.flush_interval)
+                closed = self.closed
+            self.flush()
+            if closed:
+                return
+
+    def flush(self):
+        """
+        Write and fsync every buffered record, compacting the file if it has grown too large.
+        """
+        with self.write_lock:
+            with self.condition:
+                batch, self.buffer = self.buffer, []
+            if batch:
+                data = "".join(json.dumps(record) + "\n" for record in batch)
+                try:
+                    self.file.write(data)
+                    self.file.flush()
+                    os.fsync(self.file.fileno())
+                    self.size += len(data)
+                    self.records_written += len(batch)
+                    self.syncs += 1
+                except (IOError, OSError) as e:
+                    print(f"Error writing game journal: {e}")
+            if self.size > self.max_bytes:
+                self._compact()
+
+    def _compact(self):
+        """
+        Rewrite the log with only the live session histories. Must hold write_lock.
+        Buffered records are already part of those histories, so the buffer is dropped.
+        """
+        with self.condition:
+            histories = [list(history) for history in self.sessions.values()]
+            self.buffer = []
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for history in histories:
+                    f.write("".join(json.dumps(record) + "\n" for record in history))
+                f.flush()
+                os.fsync(f.fileno())
+            self.file.close()
+            os.replace(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            print(f"Error compacting game journal: {e}")
+        if self.file.closed:
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+        self.compactions += 1
+
+    def close(self):
+        """
+        Stop the flusher after writing everything still buffered.
+        """
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        self.flusher.join()
+        self.file.close()
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                "live_sessions": len(self.sessions),
+                "buffered": len(self.buffer),
+                "records_written": self.records_written,
+                "syncs": self.syncs,
+                "compactions": self.compactions,
+                "bytes": self.size,
+            }
@@ -1,17 +1,25 @@
-from datetime import date  # Reintroduced for daily challenge
 from time import time
+import atexit
+import copy
 import json
+import os
 import random
-import hashlib
-from config import DIFFICULTY_ATTEMPTS, HINTS_PER_GAME
+from config import DIFFICULTY_ATTEMPTS, HINTS_PER_GAME, WORD_DIFFICULTY_FILTER, DIFFICULTY_SCORE_RANGES
 from content_manager import (
     load_words,
     load_riddles,
     fetch_online_riddles,
     fetch_word_definition,  # Ensure this is used
 )
-from ai_manager import AIManager
 from powerup_manager import PowerUpManager
+from job_queue import BackgroundJobQueue, PRIORITY_NORMAL, PRIORITY_LOW
+from word_solver import LexiconIndex
+from daily_challenge import DailyChallengeCalendar
+from word_difficulty import load_word_difficulty
+from word_scheduler import WordScheduler
+
+# Bit assigned to each letter in the guessed-letter mask
+LETTER_BITS = {chr(ord("A") + i): 1 << i for i in range(26)}
 
 
 class AchievementsManager:
@@ -83,83 +91,402 @@ class AchievementsManager:
             }
 
 
+class GameContext:
+
+    def __init__(self, words=None, riddles=None, ai_manager=None, fetch_online=True, headless=False, journal=None,
+                 replays=None):
+        """
+        Long-lived state shared by every game in a session: the word lexicon, the riddle store,
+        the AI manager and achievements. Build it once and pass it to each HangmanGame so that
+        starting a round does not reload content or models.
+        Anything not passed in is loaded here. A headless context has no AI manager and loads
+        content without network access, so games run without models, pygame or HTTP.
+        Pass a GameJournal to record the events of games that have a session id, and a
+        ReplayWriter to store a replay of every finished round.
+        """
+        self.headless = headless
+        if headless:
+            self.ai_manager = None
+            fetch_online = False
+        elif ai_manager is not None:
+            self.ai_manager = ai_manager
+        else:
+            from ai_manager import AIManager  # Imported here so headless runs never load torch
+
+            self.ai_manager = AIManager()
+        self.words = words if words is not None else load_words(offline=headless)
+        self.riddles = riddles if riddles is not None else load_riddles(offline=headless)
+        self.lexicon_riddles = self.riddles  # Riddles from the data files, without online ones
+        if fetch_online:
+            self.riddles = dict(self.riddles)
+            self.riddles.update(fetch_online_riddles())  # Fetch online riddles
+        self.achievements_manager = AchievementsManager()
+        self.achievements_manager.load_achievements()
+        self.achievements_manager.generate_default_achievements()  # Ensure defaults exist
+        self.jobs = BackgroundJobQueue(name="game-jobs")  # Slow round side effects run here
+        self.lexicon_index = None
+        self.daily_calendar = None
+        self.word_difficulty = None
+        self.difficulty_words = {}  # (category, difficulty) -> (category size, words in the score range)
+        self.word_scheduler = None
+        self.journal = journal
+        self.replays = replays
+        self.self_play_context = None
+
+    def get_lexicon_index(self):
+        """
+        Return the pattern index over the lexicon used by the AI guesser, building it on first use.
+        """
+        if self.lexicon_index is None:
+            self.lexicon_index = LexiconIndex.from_context(self)
+        return self.lexicon_index
+
+    def get_self_play_context(self):
+        """
+        Return a context for rounds the computer plays by itself, such as the AI guesser mode.
+        It shares this context's content, job queue and achievements but has no AI manager,
+        journal or replay writer, so those rounds are not recorded as the player's and do not
+        queue learning jobs.
+        """
+        if self.self_play_context is None:
+            self.get_lexicon_index()  # Built once and shared by both contexts
+            self_play = copy.copy(self)
+            self_play.ai_manager = None
+            self_play.journal = None
+            self_play.replays = None
+            self_play.self_play_context = self_play
+            self.self_play_context = self_play
+        return self.self_play_context
+
+    def get_word_difficulty(self):
+        """
+        Return the difficulty scores of every lexicon word, calibrating them on first use.
+        The AI manager's corpus letter frequency is used when it has one.
+        """
+        if self.word_difficulty is None:
+            words = [word for category in self.words for word in self.words[category]]
+            frequency = self.ai_manager.letter_frequency if self.ai_manager else None
+            self.word_difficulty = load_word_difficulty(words, frequency or None)
+        return self.word_difficulty
+
+    def get_difficulty_words(self, category, difficulty):
+        """
+        Return the words of a category whose score is in the difficulty level's range.
+        Falls back to the whole category when no word is in range. The selection is cached
+        until the category changes size.
+        """
+        entries = self.words[category]
+        cached = self.difficulty_words.get((category, difficulty))
+        if cached is None or cached[0] != len(entries):
+            low, high = DIFFICULTY_SCORE_RANGES[difficulty]
+            selected = self.get_word_difficulty().filter(entries, low, high)
+            cached = (len(entries), selected or entries)
+            self.difficulty_words[(category, difficulty)] = cached
+        return cached[1]
+
+    def get_word_scheduler(self):
+        """
+        Return the per-player word scheduler, creating it on first use.
+        """
+        if self.word_scheduler is None:
+            self.word_scheduler = WordScheduler(self)
+        return self.word_scheduler
+
+    def get_daily_calendar(self):
+        """
+        Return the daily challenge calendar, loading or building it on first use.
+        Online riddles vary between runs, so only the riddles from the data files are used.
+        """
+        if self.daily_calendar is None:
+            self.daily_calendar = DailyChallengeCalendar(self.words, self.lexicon_riddles)
+        return self.daily_calendar
+
+    def shutdown(self, timeout=None, drop_low_priority=False):
+        """
+        Finish queued background jobs and flush training data, the journal and replays to disk.
+        :param timeout: Maximum seconds to wait for the job workers; jobs still running are abandoned.
+        :param drop_low_priority: Discard queued low-priority jobs (learning and file generation), which may
+                                  go to the network, instead of running them first.
+        """
+        dropped = self.jobs.shutdown(timeout, drop_priority=PRIORITY_LOW if drop_low_priority else None)
+        if dropped:
+            print(f"Skipped {dropped} queued background jobs.")
+        if self.word_scheduler:
+            self.word_scheduler.save()  # Its queued save may have been dropped
+        if self.journal:
+            self.journal.close()
+        if self.replays:
+            self.replays.close()
+        if self.ai_manager:
+            self.ai_manager.flush_training_data()
+
+
+_default_context = None
+
+
+def get_default_context():
+    """
+    Return the process-wide game context, building it on first use.
+    """
+    global _default_context
+    if _default_context is None:
+        _default_context = GameContext()
+        atexit.register(_default_context.shutdown)
+    return _default_context
+
+
 class HangmanGame:
 
-    def __init__(self, mode="word_guess", difficulty=1):
+    def __init__(self, mode="word_guess", difficulty=1, context=None, rng=None, session_id=None, state=None,
+                 player_id=None):
         """
         Initialize the game with a mode and difficulty level.
         Modes: 'word_guess', 'riddle_time'
         Difficulty: 1 (6 attempts), 2 (9 attempts), 3 (13 attempts)
-        """
+        The shared GameContext supplies words, riddles, the AI manager and achievements;
+        the process-wide default context is used when none is given.
+        Pass a seeded random.Random as rng for reproducible word selection.
+        With a player_id, words are dealt from the player's no-repeat bag and the game uses
+        the player's own random stream unless an rng is given.
+        With a session_id, events are recorded in the context's journal. Pass a state from
+        get_game_state to continue that round instead of starting a new one.
+        """
+        context = context or get_default_context()
+        self.context = context
+        self.player_id = player_id
+        if rng is None:
+            rng = context.get_word_scheduler().get_rng(player_id) if player_id is not None else random.Random()
+        self.rng = rng
         self.mode = mode
         self.difficulty = difficulty
         self.attempts_left = DIFFICULTY_ATTEMPTS[difficulty]
         self.hint_count = HINTS_PER_GAME
         self.guessed_letters = set()
+        self.guess_order = []  # The same letters in the order they were guessed
         self.hangman_stage = 0
         self.max_stages = {1: 6, 2: 9, 3: 13}
-        self.words = load_words()
-        self.riddles = load_riddles()
-        self.riddles.update(fetch_online_riddles())  # Fetch online riddles
+        self.words = context.words
+        self.riddles = context.riddles
         self.power_ups = PowerUpManager()
-        self.ai_manager = AIManager()
-        self.achievements_manager = AchievementsManager()
-        self.achievements_manager.load_achievements()
-        self.achievements_manager.generate_default_achievements()  # Ensure defaults exist
+        self.ai_manager = context.ai_manager
+        self.achievements_manager = context.achievements_manager
         self.current_definition = None
         self.time_limit = 60 - (difficulty - 1) * 10  # 60s easy, 50s med, 40s hard
         self.start_time = None
         self.is_paused = False  # Add a paused state flag
         self.pause_start_time = None  # Track when the game was paused
         self.total_pause_time = 0  # Track total time spent in paused state
-        self.reset_game()
+        self.session_id = session_id
+        self.replaying = False  # Set while journaled events are re-applied
+        self.replays = context.replays
+        self.actions = []  # (guessed letter, hint or power-up, ms since the round started); kept only for replays
+        self.round_finished = False
+        if state:
+            self.apply_game_state(state)
+            # Continue the round clock from the journaled time, or the last recorded action in older states
+            elapsed = state.get("elapsed")
+            if elapsed is None:
+                elapsed = self.actions[-1][1] / 1000 if self.actions else 0
+            self.start_time = time() - elapsed
+            if self.is_paused:
+                self.pause_start_time = time()  # Still paused; the pause continues from now
+        else:
+            self.reset_game()
+
+    @classmethod
+    def resume(cls, context, session_id):
+        """
+        Rebuild an unfinished round from the context's journal, e.g. after a crash.
+        :return: The resumed HangmanGame, or None if the journal has no live round for the session.
+        """
+        history = context.journal.get_session(session_id) if context.journal else None
+        if not history:
+            return None
+        state, events = history
+        game = cls(state["mode"], state["difficulty"], context=context, session_id=session_id, state=state,
+                   player_id=state.get("player_id"))
+        game.replay_events(events)
+        return game
+
+    def record_action(self, action):
+        """
+        Add a guess, hint or power-up to the round's action log used for replays.
+        """
+        if self.replays is None:
+            return
+        elapsed = time() - self.start_time if self.start_time else 0
+        self.actions.append((action, int(elapsed * 1000)))
+
+    def finish_round(self, win):
+        """
+        Record the end of the round in the journal and store its replay. Only the first call
+        per round has an effect, so rounds that end on a guess and are then tracked are stored once.
+        """
+        if self.round_finished:
+            return
+        self.round_finished = True
+        self.record_event("end", win=win)
+        if self.replays is not None and not self.replaying:
+            self.replays.record_game(self, win)
+
+    def record_event(self, event, **data):
+        """
+        Record a game event in the journal if this game has a session id.
+        """
+        journal = self.context.journal
+        if journal and self.session_id is not None and not self.replaying:
+            if self.start_time and event != "start":
+                data.setdefault("elapsed", time() - self.start_time)  # Restores the round clock on resume
+            journal.record(self.session_id, event, self, **data)
+
+    def replay_events(self, events):
+        """
+        Re-apply journaled events on top of a restored state without journaling them again.
+        """
+        self.replaying = True
+        try:
+            for record in events:
+                event = record["event"]
+                if "elapsed" in record:
+                    self.start_time = time() - record["elapsed"]
+                if event == "guess":
+                    self.guess_letter(record["letter"])
+                elif event == "hint":
+                    self.hint_count = max(0, self.hint_count - 1)
+                    self.record_action("hint")
+                elif event == "power_up":
+                    self.record_action(record["power_up"])
+                    # A revealed letter is journaled as its own hint event
+                    self.power_ups.power_ups[record["power_up"]] -= 1
+                    if record["power_up"] == "extra_attempt":
+                        self.attempts_left += 1
+                elif event == "pause":
+                    self.pause_game()
+                elif event == "resume":
+                    self.resume_game()
+                    self.total_pause_time = record["total_pause_time"]
+        finally:
+            self.replaying = False
 
     def reset_game(self):
         """
         Reset game state with a new word or riddle.
         """
         if self.mode == "word_guess":
-            # Use AI-generated word if available
-            self.current_word = self.ai_manager.generate_word()
+            # A player's words come from their scheduler, so they do not repeat until the bag is used up.
+            # Otherwise use an AI-generated word if one is ready; generation itself never runs on this thread.
+            self.current_word = None
+            if self.player_id is not None:
+                self.current_word = self.context.get_word_scheduler().next_word(self.player_id, self.difficulty)
+            if not self.current_word and self.ai_manager:
+                self.current_word = self.ai_manager.get_generated_word()
             if not self.current_word:
-                category = random.choice(list(self.words.keys()))
-                self.current_word = random.choice(self.words[category])
+                category = self.rng.choice(list(self.words.keys()))
+                if WORD_DIFFICULTY_FILTER:
+                    candidates = self.context.get_difficulty_words(category, self.difficulty)
+                else:
+                    candidates = self.words[category]
+                self.current_word = self.rng.choice(candidates)
             self.current_riddle = None
+            self.current_definition = None
 
-            definition_data = fetch_word_definition(self.current_word)
-            if definition_data:
-                self.ai_manager.training_data["definitions"].append(definition_data)
-                self.ai_manager.save_training_data()
-            self.current_definition = definition_data
-
-            self.ai_manager.learn_from_riddles(
-                self.riddles
-            )  # Learn from riddles dynamically
-            self.ai_manager.retrain()  # Retrain the AI with new vocabulary
+            if self.ai_manager:
+                self.context.jobs.submit(
+                    self.learn_current_definition, self.current_word, priority=PRIORITY_NORMAL
+                )
+            self.schedule_learning()
 
         elif self.mode == "riddle_time":
-            category = random.choice(list(self.riddles.keys()))
-            if category == "ai_generated":
-                self.current_word = random.choice(self.words["default"])
+            category = self.rng.choice(list(self.riddles.keys()))
+            if category == "ai_generated" and self.ai_manager:
+                self.current_word = self.rng.choice(self.words["default"])
                 self.current_riddle = self.ai_manager.generate_riddle(self.current_word)
             else:
-                self.current_riddle, self.current_word = random.choice(
+                self.current_riddle, self.current_word = self.rng.choice(
                     self.riddles[category]
                 )
             self.current_definition = None
-            self.ai_manager.learn_from_riddles(
-                self.riddles
-            )  # Learn from riddles dynamically
-            self.ai_manager.retrain()  # Retrain the AI with new vocabulary
+            if self.ai_manager:
+                # Rephrase ahead of time so a hint never waits on the model
+                self.context.jobs.submit(
+                    self.ai_manager.rephrase_riddle, self.current_riddle, priority=PRIORITY_NORMAL
+                )
+            self.schedule_learning()
 
         self.guessed_letters.clear()
+        self.guess_order = []
+        self.index_current_word()
         self.attempts_left = DIFFICULTY_ATTEMPTS[self.difficulty]
         self.hangman_stage = 0
         self.start_time = time()
         self.is_paused = False  # Reset pause state
         self.pause_start_time = None
         self.total_pause_time = 0
-        self.ai_manager.generate_files()  # Save AI state dynamically
+        self.actions = []
+        self.round_finished = False
+        if self.ai_manager:
+            self.context.jobs.submit(
+                self.ai_manager.generate_files, priority=PRIORITY_LOW, key="generate_files"
+            )  # Save AI state dynamically
+        if self.session_id is not None:
+            self.record_event("start", state=self.get_game_state())
+
+    def learn_current_definition(self, word):
+        """
+        Fetch the definition of the round's word and add it to the AI's training data.
+        Runs on the background job queue.
+        """
+        definition_data = fetch_word_definition(word)
+        if definition_data:
+            self.ai_manager.training_data["definitions"].append(definition_data)
+            self.ai_manager.save_training_data()
+        if self.current_word == word:
+            self.current_definition = definition_data
+
+    def index_current_word(self):
+        """
+        Precompute the per-word lookup tables used by guesses, win checks and rendering.
+        Must be called whenever current_word changes; letters already guessed are re-applied in guess order.
+        """
+        self.letter_positions = {}
+        for position, letter in enumerate(self.current_word):
+            self.letter_positions.setdefault(letter, []).append(position)
+        self.guessed_mask = 0
+        self.display_letters = ["_"] * len(self.current_word)
+        self.unrevealed_count = len(self.current_word)
+        self.incorrect_guesses = []
+        for letter in self.guess_order:
+            self.apply_guess(letter)
+        self.display_word = " ".join(self.display_letters)
+
+    def apply_guess(self, letter):
+        """
+        Record a new guess in the lookup tables.
+        :return: True if the letter occurs in the current word.
+        """
+        self.guessed_mask |= LETTER_BITS.get(letter, 0)
+        positions = self.letter_positions.get(letter)
+        if not positions:
+            self.incorrect_guesses.append(letter)
+            return False
+        for position in positions:
+            self.display_letters[position] = letter
+        self.unrevealed_count -= len(positions)
+        return True
+
+    def schedule_learning(self):
+        """
+        Queue riddle learning and retraining. Duplicate requests from consecutive rounds
+        coalesce into a single pending job each.
+        """
+        if not self.ai_manager:
+            return
+        self.context.jobs.submit(
+            self.ai_manager.learn_from_riddles, self.riddles, priority=PRIORITY_LOW, key="learn_from_riddles"
+        )  # Learn from riddles dynamically
+        self.context.jobs.submit(
+            self.ai_manager.retrain, priority=PRIORITY_LOW, key="retrain"
+        )  # Retrain the AI with new vocabulary
 
     def get_time_left(self):
         """
@@ -186,6 +513,7 @@ class HangmanGame:
         if not self.is_paused:
             self.is_paused = True
             self.pause_start_time = time()
+            self.record_event("pause")
 
     def resume_game(self):
         """
@@ -196,6 +524,7 @@ class HangmanGame:
             # Add the time spent in pause to total pause time
             self.total_pause_time += time() - self.pause_start_time
             self.pause_start_time = None
+            self.record_event("resume", total_pause_time=self.total_pause_time)
 
     def start_two_player(self, player1_word):
         """
@@ -205,31 +534,44 @@ class HangmanGame:
         self.current_word = player1_word.upper()
         self.current_riddle = None
         self.guessed_letters.clear()
+        self.guess_order = []
+        self.index_current_word()
         self.attempts_left = DIFFICULTY_ATTEMPTS[self.difficulty]
         self.hangman_stage = 0
+        self.start_time = time()
+        self.actions = []
+        self.round_finished = False
+        if self.session_id is not None:
+            self.record_event("start", state=self.get_game_state())
 
     def guess_letter(self, letter):
         """
         Process a letter guess. Returns True if correct, False if incorrect or invalid.
         """
         letter = letter.upper()
-        if letter in self.guessed_letters or len(letter) != 1 or not letter.isalpha():
+        if len(letter) != 1 or not letter.isalpha():
+            return False
+        bit = LETTER_BITS.get(letter)
+        if (self.guessed_mask & bit) if bit else letter in self.guessed_letters:
             return False
 
         self.guessed_letters.add(letter)
-        if self.mode == "word_guess" and letter not in self.current_word:
-            self.attempts_left -= 1
-            self.hangman_stage = min(
-                self.hangman_stage + 1, self.max_stages[self.difficulty]
-            )
-            return False
-        elif self.mode == "riddle_time" and letter not in self.current_word:
+        self.guess_order.append(letter)
+        correct = self.apply_guess(letter)
+        self.display_word = " ".join(self.display_letters)
+        result = True
+        if not correct and self.mode in ("word_guess", "riddle_time"):
             self.attempts_left -= 1
             self.hangman_stage = min(
                 self.hangman_stage + 1, self.max_stages[self.difficulty]
             )
-            return False
-        return True
+            result = False
+        self.record_action(letter)
+        if self.session_id is not None:
+            self.record_event("guess", letter=letter)
+        if self.unrevealed_count == 0 or self.attempts_left <= 0:
+            self.finish_round(self.unrevealed_count == 0)
+        return result
 
     def track_player_stats(self, player_name, win):
         """
@@ -238,6 +580,7 @@ class HangmanGame:
         """
         from score_manager import ScoreManager
 
+        self.finish_round(win)  # Also covers rounds lost on time
         score_manager = ScoreManager()
 
         # Get the player's current streak from the score manager
@@ -260,10 +603,13 @@ class HangmanGame:
         """
         Return the word with guessed letters revealed and others as underscores.
         """
-        return " ".join(
-            letter if letter in self.guessed_letters else "_"
-            for letter in self.current_word
-        )
+        return self.display_word
+
+    def get_incorrect_guesses(self):
+        """
+        Return the incorrect guesses in the order they were made.
+        """
+        return self.incorrect_guesses
 
     def provide_hint(self):
         """
@@ -273,28 +619,51 @@ class HangmanGame:
         if self.hint_count <= 0:
             return None
 
+        if not self.ai_manager:
+            self.hint_count -= 1
+            self.record_action("hint")
+            self.record_event("hint")
+            return "No hints available."
+
         if self.mode == "word_guess":
             filtered_data = self.ai_manager.training_data.get("filtered_data", {}).get(
                 self.current_word, {}
             )
             if filtered_data:
                 self.hint_count -= 1
-                return f"Hint: {random.choice(filtered_data.get('definitions', [{'definition': 'No hints available.'}]))['definition']}"
+                self.record_action("hint")
+                self.record_event("hint")
+                return f"Hint: {self.rng.choice(filtered_data.get('definitions', [{'definition': 'No hints available.'}]))['definition']}"
             else:
                 self.hint_count -= 1
+                self.record_action("hint")
+                self.record_event("hint")
                 return "No hints available."
 
         elif self.mode == "riddle_time":
             self.hint_count -= 1
-            return self.ai_manager.rephrase_riddle(self.current_riddle)
+            self.record_action("hint")
+            self.record_event("hint")
+            return self.ai_manager.rephrase_riddle(self.current_riddle, wait=False) or "No hints available."
 
         return None
 
+    def use_power_up(self, power_up):
+        """
+        Use a power-up on this game.
+        :return: True if the power-up was available and applied.
+        """
+        used = self.power_ups.use_power_up(power_up, self)
+        if used:
+            self.record_action(power_up)
+            self.record_event("power_up", power_up=power_up)
+        return used
+
     def check_win(self):
         """
         Check if the player has won by guessing all letters.
         """
-        return all(letter in self.guessed_letters for letter in self.current_word)
+        return self.unrevealed_count == 0
 
     def check_lose(self):
         """
@@ -310,22 +679,34 @@ class HangmanGame:
             "mode": self.mode,
             "difficulty": self.difficulty,
             "attempts_left": self.attempts_left,
-            "guessed_letters": list(self.guessed_letters),
+            "guessed_letters": list(self.guess_order),  # In guess order
             "current_word": self.current_word,
             "current_riddle": self.current_riddle,
             "is_paused": self.is_paused,
             "total_pause_time": self.total_pause_time,
+            "hangman_stage": self.hangman_stage,
+            "hint_count": self.hint_count,
+            "power_ups": dict(self.power_ups.power_ups),
+            "actions": list(self.actions),
+            "player_id": self.player_id,
+            "elapsed": (self.pause_start_time or time()) - self.start_time if self.start_time else 0,
         }
 
     def save_game_state(self, filepath="data/game_state.json"):
         """
         Save the current game state to a file.
+        The state is written to a temporary file and renamed over the old one, so a crash
+        leaves either the previous or the new state, never a partial file.
         """
         state = self.get_game_state()
+        tmp_path = f"{filepath}.tmp"
         try:
-            with open(filepath, "w") as f:
+            with open(tmp_path, "w") as f:
                 json.dump(state, f)
-        except IOError as e:
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except (IOError, OSError) as e:
             print(f"Error saving game state: {e}")
 
     def load_game_state(self, filepath="data/game_state.json"):
@@ -334,27 +715,38 @@ class HangmanGame:
         """
         try:
             with open(filepath, "r") as f:
-                state = json.load(f)
-                self.mode = state["mode"]
-                self.difficulty = state["difficulty"]
-                self.attempts_left = state["attempts_left"]
-                self.guessed_letters = set(state["guessed_letters"])
-                self.current_word = state["current_word"]
-                self.current_riddle = state["current_riddle"]
-                # Load pause state if available
-                self.is_paused = state.get("is_paused", False)
-                self.total_pause_time = state.get("total_pause_time", 0)
+                self.apply_game_state(json.load(f))
         except (IOError, json.JSONDecodeError) as e:
             print(f"Error loading game state: {e}")
 
+    def apply_game_state(self, state):
+        """
+        Restore the game from a state dictionary produced by get_game_state.
+        """
+        self.mode = state["mode"]
+        self.difficulty = state["difficulty"]
+        self.attempts_left = state["attempts_left"]
+        self.guess_order = list(dict.fromkeys(state["guessed_letters"]))
+        self.guessed_letters = set(self.guess_order)
+        self.current_word = state["current_word"]
+        self.current_riddle = state["current_riddle"]
+        self.index_current_word()
+        # Load pause state if available
+        self.is_paused = state.get("is_paused", False)
+        self.total_pause_time = state.get("total_pause_time", 0)
+        self.hangman_stage = state.get(
+            "hangman_stage", min(len(self.incorrect_guesses), self.max_stages[self.difficulty])
+        )
+        self.hint_count = state.get("hint_count", self.hint_count)
+        if "power_ups" in state:
+            self.power_ups.power_ups = dict(state["power_ups"])
+        self.actions = [tuple(action) for action in state.get("actions", [])]
+        self.round_finished = self.check_win() or self.check_lose()
+
     def get_daily_challenge(self):
         """
-        Generate a daily challenge word or riddle based on the current date.
+        Return the daily challenge for the current mode and date: a word for 'word_guess'
+        or a (riddle, answer) tuple for 'riddle_time'. Every game sharing the same lexicon
+        gets the same challenge, and neither the global nor the game RNG is reseeded.
         """
-        seed = hashlib.md5(str(date.today()).encode()).hexdigest()
-        random.seed(seed)
-        if self.mode == "word_guess":
-            category = random.choice(list(self.words.keys()))
-            return random.choice(self.words[category])
-        elif self.mode == "riddle_time":
-            category = random.choice(list(self.riddles.keys()))
+        return self.context.get_daily_calendar().get_challenge(self.mode)
@@ -0,0 +1,361 @@
+# game_server.py
+# Asyncio server hosting many independent Hangman sessions over a local TCP socket.
+#
+# Protocol: one JSON object per line in each direction. Every request has an "op" and an
+# optional "id" that is echoed back. Responses carry "ok" and either a result or "error".
+#   {"op": "new", "mode": "word_guess", "difficulty": 1,
+#    "player": "alice"}                                       -> {"session": ..., "state": {...}}
+#   {"op": "guess", "session": ..., "letter": "E"}            -> {"correct": true, "state": {...}}
+#   {"op": "hint", "session": ...}                            -> {"hint": ..., "state": {...}}
+#   {"op": "state", "session": ...}                           -> {"state": {...}}
+#   {"op": "reset", "session": ...}                           -> {"state": {...}}
+#   {"op": "snapshot", "session": ...}                        -> {"snapshot": ...}
+#   {"op": "restore", "snapshot": ...}                        -> {"session": ..., "state": {...}}
+#   {"op": "close", "session": ...}                           -> {}
+#   {"op": "stats"}                                           -> {"stats": {...}}
+
+import argparse
+import asyncio
+import json
+import uuid
+from collections import OrderedDict
+from time import monotonic
+
+from config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    MAX_SESSIONS,
+    SESSION_IDLE_TIMEOUT,
+    SESSION_SNAPSHOT_LIMIT,
+    MAX_PLAYER_ID_LENGTH,
+)
+from game_journal import GameJournal
+from game_logic import GameContext, HangmanGame
+from replay_store import ReplayWriter
+
+
+class SessionError(Exception):
+    """
+    Raised for requests that reference unknown sessions or are otherwise invalid.
+    """
+
+
+class Session:
+    def __init__(self, session_id, game):
+        self.session_id = session_id
+        self.game = game
+        self.last_access = monotonic()
+
+    def get_public_state(self):
+        """
+        Return the state a client may see; the answer is only revealed once the round is over.
+        """
+        game = self.game
+        won, lost = game.check_win(), game.check_lose()
+        state = {
+            "mode": game.mode,
+            "difficulty": game.difficulty,
+            "display_word": game.get_display_word(),
+            "riddle": game.current_riddle,
+            "attempts_left": game.attempts_left,
+            "hints_left": game.hint_count,
+            "guessed_letters": sorted(game.guessed_letters),
+            "incorrect_guesses": list(game.get_incorrect_guesses()),
+            "won": won,
+            "lost": lost,
+        }
+        if won or lost:
+            state["word"] = game.current_word
+        return state
+
+
+class SessionStore:
+    """
+    Sessions ordered by last access, so idle eviction only touches the sessions it removes.
+    Evicted sessions are kept as get_game_state snapshots and restored transparently on next use.
+    With a journal on the context, sessions also survive a server restart.
+    """
+
+    def __init__(self, context, max_sessions=MAX_SESSIONS, idle_timeout=SESSION_IDLE_TIMEOUT,
+                 snapshot_limit=SESSION_SNAPSHOT_LIMIT):
+        self.context = context
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.snapshot_limit = snapshot_limit
+        self.sessions = OrderedDict()
+        self.snapshots = OrderedDict()  # Evicted session id -> game state
+        self.saved = OrderedDict()  # Snapshot id handed to a client -> game state, kept on the server
+        self.created = 0
+        self.evicted = 0
+        self.restored = 0
+
+    def create(self, mode="word_guess", difficulty=1, snapshot=None, player_id=None):
+        if mode not in ("word_guess", "riddle_time"):
+            raise SessionError(f"Unknown mode: {mode}")
+        if difficulty not in (1, 2, 3):
+            raise SessionError(f"Unknown difficulty: {difficulty}")
+        if len(self.sessions) >= self.max_sessions:
+            self.evict_idle(force=1)
+
+        session_id = uuid.uuid4().hex
+        # Named players get their own random stream and no-repeat word bag
+        game = HangmanGame(mode, difficulty, context=self.context, session_id=session_id,
+                           state=snapshot, player_id=player_id)
+        if snapshot:
+            game.record_event("start", state=game.get_game_state())
+        session = Session(session_id, game)
+        self.sessions[session_id] = session
+        self.created += 1
+        return session
+
+    def get(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            snapshot = self.snapshots.pop(session_id, None)
+            if snapshot is not None:
+                game = HangmanGame(snapshot["mode"], snapshot["difficulty"], context=self.context,
+                                   session_id=session_id, state=snapshot, player_id=snapshot.get("player_id"))
+            else:
+                game = HangmanGame.resume(self.context, session_id)  # Sessions from before a restart
+                if game is None:
+                    raise SessionError(f"Unknown session: {session_id}")
+            if len(self.sessions) >= self.max_sessions:
+                self.evict_idle(force=1)
+            session = Session(session_id, game)
+            self.sessions[session_id] = session
+            self.restored += 1
+        else:
+            self.sessions.move_to_end(session_id)
+        session.last_access = monotonic()
+        return session
+
+    def save(self, session):
+        """
+        Keep a copy of a session's state for a later restore. Clients only get its id, so they
+        can neither read the answer nor restore a state the server did not produce.
+        :return: The snapshot id.
+        """
+        snapshot_id = uuid.uuid4().hex
+        self.saved[snapshot_id] = session.game.get_game_state()
+        while len(self.saved) > self.snapshot_limit:
+            self.saved.popitem(last=False)
+        return snapshot_id
+
+    def restore(self, snapshot_id):
+        """
+        Start a new session from a saved snapshot, for the same player.
+        """
+        snapshot = self.saved.get(snapshot_id) if isinstance(snapshot_id, str) else None
+        if snapshot is None:
+            raise SessionError(f"Unknown snapshot: {snapshot_id}")
+        self.saved.move_to_end(snapshot_id)
+        return self.create(snapshot["mode"], snapshot["difficulty"], snapshot=snapshot,
+                           player_id=snapshot.get("player_id"))
+
+    def close(self, session_id):
+        journal = self.context.journal
+        live = self.sessions.pop(session_id, None) is not None
+        live = self.snapshots.pop(session_id, None) is not None or live
+        if not live and not (journal and journal.get_session(session_id)):
+            raise SessionError(f"Unknown session: {session_id}")
+        if journal:
+            journal.record(session_id, "close")
+
+    def evict_idle(self, force=0):
+        """
+        Snapshot and drop sessions idle for longer than the timeout.
+        :param force: Evict at least this many of the least recently used sessions regardless of age.
+        :return: The number of sessions evicted.
+        """
+        cutoff = monotonic() - self.idle_timeout
+        count = 0
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.last_access > cutoff and count >= force:
+                break
+            del self.sessions[session_id]
+            self.snapshots[session_id] = session.game.get_game_state()
+            count += 1
+        while len(self.snapshots) > self.snapshot_limit:
+            self.snapshots.popitem(last=False)
+        self.evicted += count
+        return count
+
+    def get_stats(self):
+        return {
+            "active_sessions": len(self.sessions),
+            "snapshots": len(self.snapshots),
+            "saved_snapshots": len(self.saved),
+            "created": self.created,
+            "evicted": self.evicted,
+            "restored": self.restored,
+        }
+
+
+class GameServer:
+    def __init__(self, context=None, host=SERVER_HOST, port=SERVER_PORT, **store_options):
+        self.context = context or GameContext(headless=True)
+        self.host = host
+        self.port = port
+        self.store = SessionStore(self.context, **store_options)
+        self.requests = 0
+        self.server = None
+        self.eviction_task = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, limit=1 << 20)
+        self.port = self.server.sockets[0].getsockname()[1]  # Resolve port 0 to the bound port
+        self.eviction_task = asyncio.create_task(self.evict_periodically())
+        print(f"Hangman server listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        if self.eviction_task:
+            self.eviction_task.cancel()
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def evict_periodically(self):
+        interval = max(1.0, min(30.0, self.store.idle_timeout / 4))
+        while True:
+            await asyncio.sleep(interval)
+            evicted = self.store.evict_idle()
+            if evicted:
+                print(f"Evicted {evicted} idle sessions.")
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await self.read_line(reader)
+                if line is None:
+                    writer.write((json.dumps({"ok": False, "error": "Request line too long"}) + "\n").encode())
+                elif not line:
+                    break
+                else:
+                    writer.write(self.handle_line(line))
+                await writer.drain()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def read_line(reader):
+        """
+        Read one request line.
+        :return: The line, b"" at end of stream, or None for a line over the stream limit, which is skipped whole.
+        """
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            return e.partial
+        except asyncio.LimitOverrunError as e:
+            consumed = e.consumed
+        while True:  # Drop the oversized line up to and including its newline
+            await reader.readexactly(consumed)
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.LimitOverrunError as e:
+                consumed = e.consumed
+
+    def handle_line(self, line):
+        """
+        Handle one request line and return the encoded response line.
+        Game operations are microseconds of pure Python, so they run inline on the event loop.
+        """
+        self.requests += 1
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise SessionError("Request must be a JSON object")
+            request_id = request.get("id")
+            response = self.dispatch(request)
+            response["ok"] = True
+        except (SessionError, KeyError, TypeError, ValueError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:  # A bad request must never end the client's connection
+            print(f"Error handling request: {e}")
+            response = {"ok": False, "error": f"Internal error: {e}"}
+        if request_id is not None:
+            response["id"] = request_id
+        return (json.dumps(response) + "\n").encode()
+
+    def dispatch(self, request):
+        op = request["op"]
+        store = self.store
+        if op == "new":
+            player_id = request.get("player")
+            if player_id is not None:
+                player_id = str(player_id)
+                if not player_id or len(player_id) > MAX_PLAYER_ID_LENGTH:
+                    raise SessionError(f"Player names must be 1 to {MAX_PLAYER_ID_LENGTH} characters")
+            session = store.create(request.get("mode", "word_guess"), int(request.get("difficulty", 1)),
+                                   player_id=player_id)
+            return {"session": session.session_id, "state": session.get_public_state()}
+        if op == "restore":
+            session = store.restore(request["snapshot"])
+            return {"session": session.session_id, "state": session.get_public_state()}
+        if op == "stats":
+            stats = {**store.get_stats(), "requests": self.requests}
+            if self.context.journal:
+                stats["journal"] = self.context.journal.get_stats()
+            return {"stats": stats}
+
+        session_id = request["session"]
+        if op == "close":
+            store.close(session_id)
+            return {}
+
+        session = store.get(session_id)
+        game = session.game
+        if op == "guess":
+            letter = str(request["letter"])
+            correct = game.guess_letter(letter) if not (game.check_win() or game.check_lose()) else False
+            return {"correct": correct, "state": session.get_public_state()}
+        if op == "hint":
+            return {"hint": game.provide_hint(), "state": session.get_public_state()}
+        if op == "state":
+            return {"state": session.get_public_state()}
+        if op == "reset":
+            game.reset_game()
+            return {"state": session.get_public_state()}
+        if op == "snapshot":
+            return {"snapshot": store.save(session)}
+        raise SessionError(f"Unknown op: {op}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve many Hangman sessions over a local socket.")
+    parser.add_argument("--host", default=SERVER_HOST, help="Address to bind (localhost by default).")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Port to bind.")
+    parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS, help="Maximum live sessions.")
+    parser.add_argument("--idle-timeout", type=float, default=SESSION_IDLE_TIMEOUT, help="Idle seconds before eviction.")
+    parser.add_argument("--with-ai", action="store_true", help="Load the AI manager for hints (slower startup).")
+    parser.add_argument("--journal", action="store_true", help="Journal game events so sessions survive a restart.")
+    parser.add_argument("--replays", action="store_true", help="Store a binary replay of every finished round.")
+    args = parser.parse_args()
+
+    journal = GameJournal() if args.journal else None
+    replays = ReplayWriter() if args.replays else None
+    if args.with_ai:
+        context = GameContext(fetch_online=False, journal=journal, replays=replays)
+    else:
+        context = GameContext(headless=True, journal=journal, replays=replays)
+    server = GameServer(context, args.host, args.port, max_sessions=args.max_sessions, idle_timeout=args.idle_timeout)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Server stopped.")
+    finally:
+        context.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# inference_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from config import (
+    INFERENCE_CACHE_FILE,
+    INFERENCE_CACHE_MEMORY_ENTRIES,
+    INFERENCE_CACHE_MAX_ENTRIES,
+)
+
+# Tasks whose pipelines sample unless told otherwise (gpt2 enables sampling for text generation)
+SAMPLING_TASKS = ("text-generation",)
+
+
+class InferenceCache:
+    """
+    Content-addressed cache of model outputs, keyed by model id, inputs and decoding parameters.
+    A small in-memory LRU tier sits in front of a SQLite tier shared by every process.
+    Outputs are stored as JSON, so each hit returns a fresh copy the caller may modify.
+    """
+
+    def __init__(
+        self,
+        db_path=INFERENCE_CACHE_FILE,
+        memory_entries=INFERENCE_CACHE_MEMORY_ENTRIES,
+        max_entries=INFERENCE_CACHE_MAX_ENTRIES,
+    ):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.memory = OrderedDict()  # key -> JSON text, most recently used last
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = Lock()
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS outputs (
+                key TEXT PRIMARY KEY,
+                data TEXT,
+                stored_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_outputs_stored_at ON outputs (stored_at)")
+        self.conn.commit()
+        self.size = self.conn.execute("SELECT COUNT(*) FROM outputs").fetchone()[0]
+
+    @staticmethod
+    def make_key(model_id, args, kwargs):
+        """
+        Hash a model call into its cache key.
+        :return: The key, or None if the call's arguments cannot be serialized.
+        """
+        try:
+            payload = json.dumps([model_id, args, kwargs], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key):
+        """
+        Look up a cached output.
+        :return: A tuple (hit, output).
+        """
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return True, json.loads(data)
+            row = self.conn.execute("SELECT data FROM outputs WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.disk_hits += 1
+            self._remember(key, row[0])
+            return True, json.loads(row[0])
+
+    def put(self, key, output):
+        """
+        Store a model output in both tiers. Outputs that are not JSON serializable are skipped.
+        """
+        try:
+            data = json.dumps(output, default=float)  # Scores may be NumPy floats
+        except (TypeError, ValueError):
+            return
+        with self.lock:
+            now = time.time()
+            cursor = self.conn.execute("UPDATE outputs SET data = ?, stored_at = ? WHERE key = ?", (data, now, key))
+            if cursor.rowcount == 0:
+                self.conn.execute("INSERT INTO outputs (key, data, stored_at) VALUES (?, ?, ?)", (key, data, now))
+                self.size += 1
+            if self.size > self.max_entries:
+                self._evict()
+            self.conn.commit()
+            self._remember(key, data)
+
+    def _remember(self, key, data):
+        """
+        Add an entry to the memory tier. Caller must hold the lock.
+        """
+        self.memory[key] = data
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _evict(self):
+        """
+        Drop the oldest disk entries until the cache fits its limit. Caller must hold the lock.
+        """
+        self.size = self.conn.execute("SELECT COUNT(*) FROM outputs").fetchone()[0]  # Other processes write too
+        overflow = self.size - self.max_entries
+        if overflow > 0:
+            removed = self.conn.execute(
+                "DELETE FROM outputs WHERE key IN (SELECT key FROM outputs ORDER BY stored_at LIMIT ?)", (overflow,)
+            ).rowcount
+            self.size -= removed
+            self.evictions += removed
+
+    def clear(self):
+        """
+        Remove every entry from both tiers and reset the counters.
+        """
+        with self.lock:
+            self.conn.execute("DELETE FROM outputs")
+            self.conn.commit()
+            self.memory.clear()
+            self.size = 0
+            self.memory_hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def get_stats(self):
+        """
+        Return the cache counters as a dictionary.
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "entries": self.size,
+            "memory_entries": len(self.memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CachedPipeline:
+    """
+    Serves repeated pipeline calls from an InferenceCache.
+    Sampled calls are passed straight through, since callers expect a fresh sample each time,
+    unless the caller opts in with cache_sampled=True.
+    """
+
+    def __init__(self, pipe, cache, model_id, task):
+        self.pipe = pipe
+        self.cache = cache
+        self.model_id = model_id
+        self.task = task
+
+    def _key(self, args, kwargs, cache_sampled):
+        if kwargs.get("do_sample", self.task in SAMPLING_TASKS) and not cache_sampled:
+            return None
+        return self.cache.make_key(self.model_id, args, kwargs)
+
+    def __call__(self, *args, cache_sampled=False, **kwargs):
+        key = self._key(args, kwargs, cache_sampled)
+        if key is None:
+            return self.pipe(*args, **kwargs)
+        hit, output = self.cache.get(key)
+        if hit:
+            return output
+        output = self.pipe(*args, **kwargs)
+        self.cache.put(key, output)
+        return output
+
+    def lookup(self, *args, cache_sampled=False, **kwargs):
+        """
+        Return a cached output without running the model.
+        :return: A tuple (hit, output).
+        """
+        key = self._key(args, kwargs, cache_sampled)
+        return self.cache.get(key) if key else (False, None)
+
+
+_inference_cache = None
+_inference_cache_lock = Lock()
+
+
+def get_inference_cache():
+    """
+    Return the process-wide inference cache, opening it on first use.
+    """
+    global _inference_cache
+    if _inference_cache is None:
+        with _inference_cache_lock:
+            if _inference_cache is None:
+                _inference_cache = InferenceCache()
+    return _inference_cache
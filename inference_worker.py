@@ -0,0 +1,327 @@
+# inference_worker.py
+# One local process that holds the AI models for every front end on the machine.
+#
+# Clients connect over a Unix socket (a named pipe on Windows) with multiprocessing.connection
+# and send (op, args) tuples; the worker replies with ("ok", result), ("unavailable", message)
+# when a model cannot be loaded, or ("error", message).
+#   ("pipeline", (name, args, kwargs))  -> the pipeline's output
+#   ("vocab", (checkpoint,))            -> the tokenizer vocabulary
+#   ("device", ())                      -> "cuda" or "cpu"
+#   ("stats", ())                       -> the registry stats
+#
+# Run it directly with: python inference_worker.py
+# Front ends spawn it on first use when it is not already running.
+
+import hashlib
+import os
+import secrets
+import subprocess
+import sys
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from threading import Lock, Thread
+from time import monotonic, sleep
+
+from config import (
+    INFERENCE_SOCKET,
+    INFERENCE_AUTHKEY_FILE,
+    INFERENCE_TIMEOUT,
+    INFERENCE_CONNECT_TIMEOUT,
+    INFERENCE_WORKER_IDLE_EXIT,
+    INFERENCE_WORKER_LOG,
+    MODEL_RETRY_BACKOFF,
+)
+from model_registry import ModelRegistry
+
+
+class InferenceError(Exception):
+    """
+    Raised when the inference worker cannot be reached, times out, or fails a request.
+    """
+
+
+def get_worker_address(path=INFERENCE_SOCKET):
+    """
+    Return the address the worker listens on. Windows pipe names are global to the host,
+    so the name carries a hash of this data directory's key instead of being shared by every user.
+    """
+    if sys.platform == "win32":
+        return r"\\.\pipe\hangman-inference-" + hashlib.sha256(get_worker_authkey()).hexdigest()[:16]
+    return path
+
+
+def get_worker_authkey(path=INFERENCE_AUTHKEY_FILE):
+    """
+    Return the secret shared by the worker and its clients, creating it on first use.
+    The file is created readable by this user only, so other local users cannot connect
+    and have requests unpickled, even where socket permissions do not apply (Windows pipes).
+    """
+    try:
+        with open(path, "rb") as f:
+            key = f.read()
+        if key:
+            return key
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    key = secrets.token_bytes(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "rb") as f:  # Another process created it first
+            return f.read()
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+class InferenceWorker:
+    def __init__(self, address=None, registry=None, idle_exit=INFERENCE_WORKER_IDLE_EXIT):
+        self.address = address or get_worker_address()
+        self.registry = registry or ModelRegistry()
+        self.idle_exit = idle_exit
+        self.lock = Lock()
+        self.clients = 0
+        self.last_activity = monotonic()
+        self.requests = 0
+
+    def serve_forever(self):
+        """
+        Accept clients until the process is stopped, or exits after sitting idle.
+        """
+        if sys.platform != "win32":
+            if os.path.exists(self.address):
+                try:
+                    Client(self.address, authkey=get_worker_authkey()).close()
+                    print("An inference worker is already running.")
+                    return
+                except (ConnectionRefusedError, FileNotFoundError, AuthenticationError, EOFError):
+                    os.unlink(self.address)  # Left behind by a worker that crashed
+            os.makedirs(os.path.dirname(self.address) or ".", exist_ok=True)
+        old_umask = os.umask(0o077)  # Create the socket owner-only, leaving no window before a chmod
+        try:
+            listener = Listener(self.address, authkey=get_worker_authkey())
+        except OSError as e:
+            print(f"Error starting inference worker: {e}")
+            return
+        finally:
+            os.umask(old_umask)
+        print(f"Inference worker listening on {self.address}")
+        if self.idle_exit:
+            Thread(target=self._exit_when_idle, name="inference-idle", daemon=True).start()
+        with listener:
+            while True:
+                try:
+                    conn = listener.accept()  # Runs the authkey challenge before anything is unpickled
+                except (AuthenticationError, EOFError, OSError) as e:
+                    print(f"Rejected inference client: {e}")
+                    continue
+                Thread(target=self.handle_client, args=(conn,), daemon=True).start()
+
+    def _exit_when_idle(self):
+        while True:
+            sleep(max(1.0, self.idle_exit / 10))
+            with self.lock:
+                idle = self.clients == 0 and monotonic() - self.last_activity > self.idle_exit
+            if idle:
+                print("Inference worker idle; exiting.")
+                if sys.platform != "win32" and os.path.exists(self.address):
+                    os.unlink(self.address)
+                os._exit(0)  # accept() cannot be interrupted portably from another thread
+
+    def handle_client(self, conn):
+        with self.lock:
+            self.clients += 1
+        try:
+            while True:
+                try:
+                    op, args = conn.recv()
+                except (EOFError, OSError):
+                    break
+                with self.lock:
+                    self.requests += 1
+                    self.last_activity = monotonic()
+                try:
+                    conn.send(self.dispatch(op, args))
+                except (BrokenPipeError, OSError):
+                    break  # The client timed out and went away
+        finally:
+            conn.close()
+            with self.lock:
+                self.clients -= 1
+                self.last_activity = monotonic()
+
+    def dispatch(self, op, args):
+        registry = self.registry
+        try:
+            if op == "pipeline":
+                name, call_args, call_kwargs = args
+                pipe = registry.get(name)
+                if pipe is None:
+                    return ("unavailable", f"Model '{name}' could not be loaded.")
+                return ("ok", pipe(*call_args, **call_kwargs))
+            if op == "vocab":
+                tokenizer = registry.get_tokenizer(args[0])
+                if tokenizer is None:
+                    return ("unavailable", f"Tokenizer '{args[0]}' could not be loaded.")
+                return ("ok", tokenizer.get_vocab())
+            if op == "device":
+                return ("ok", registry.device)
+            if op == "stats":
+                return ("ok", {**registry.get_stats(), "clients": self.clients, "requests": self.requests})
+            return ("error", f"Unknown op: {op}")
+        except Exception as e:
+            return ("error", f"{type(e).__name__}: {e}")
+
+
+class RemotePipeline:
+    """
+    Callable stand-in for a pipeline that runs in the inference worker.
+    """
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __call__(self, *args, **kwargs):
+        return self.registry.call("pipeline", self.name, args, kwargs)
+
+
+class RemoteTokenizer:
+    def __init__(self, registry, checkpoint):
+        self.registry = registry
+        self.checkpoint = checkpoint
+
+    def get_vocab(self):
+        return self.registry.call("vocab", self.checkpoint)
+
+
+class RemoteModelRegistry:
+    """
+    Client with the ModelRegistry surface AIManager uses, forwarding every model call to the
+    shared inference worker. Calls time out instead of hanging, raising InferenceError.
+    Bare model objects stay in the worker, so get_model always returns None.
+    """
+
+    def __init__(self, address=None, timeout=INFERENCE_TIMEOUT, connect_timeout=INFERENCE_CONNECT_TIMEOUT,
+                 spawn=True):
+        self.address = address or get_worker_address()
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.spawn = spawn
+        self.lock = Lock()
+        self.idle = []  # Connections not in use by any thread
+        self.failed = {}  # Pipeline name -> monotonic time after which the worker is asked again
+        self._device = None
+        self.spawned_at = None
+
+    @property
+    def device(self):
+        if self._device is None:
+            try:
+                self._device = self.call("device")
+            except InferenceError:
+                return "unknown"
+        return self._device
+
+    def get(self, name):
+        if monotonic() < self.failed.get(name, 0):
+            return None  # The worker backs off its own retries; don't ask before it would
+        return RemotePipeline(self, name)
+
+    def get_model(self, checkpoint, model_class="AutoModelForSeq2SeqLM"):
+        return None
+
+    def get_tokenizer(self, checkpoint):
+        return RemoteTokenizer(self, checkpoint)
+
+    def get_stats(self):
+        return self.call("stats")
+
+    def call(self, op, *args, timeout=None):
+        """
+        Send one request to the worker and wait for its reply.
+        :param timeout: Seconds to wait for the reply; defaults to the registry timeout.
+        :return: The result of the request.
+        """
+        conn = self._checkout()
+        try:
+            conn.send((op, args))
+            if not conn.poll(timeout or self.timeout):
+                conn.close()  # A late reply would be read by the next request on this connection
+                raise InferenceError(f"Inference worker did not answer '{op}' in time.")
+            reply = conn.recv()
+        except (EOFError, OSError) as e:
+            conn.close()
+            raise InferenceError(f"Lost connection to inference worker: {e}")
+        with self.lock:
+            self.idle.append(conn)
+        status, result = reply
+        if status == "unavailable":
+            if op == "pipeline":
+                self.failed[args[0]] = monotonic() + MODEL_RETRY_BACKOFF
+            raise InferenceError(result)
+        if status != "ok":
+            raise InferenceError(result)
+        return result
+
+    def _checkout(self):
+        with self.lock:
+            if self.idle:
+                return self.idle.pop()
+        try:
+            return self._connect()
+        except (ConnectionRefusedError, FileNotFoundError):
+            if not self.spawn:
+                raise InferenceError("Inference worker is not running.")
+        self._spawn_worker()
+        deadline = monotonic() + self.connect_timeout
+        while monotonic() < deadline:
+            sleep(0.1)
+            try:
+                return self._connect()
+            except (ConnectionRefusedError, FileNotFoundError):
+                pass
+        raise InferenceError("Inference worker did not start in time.")
+
+    def _connect(self):
+        """
+        Open an authenticated connection to the worker.
+        A worker started with a different key is reported as an InferenceError, like any other failure.
+        """
+        try:
+            return Client(self.address, authkey=get_worker_authkey())
+        except (AuthenticationError, EOFError) as e:
+            raise InferenceError(f"Inference worker rejected the connection: {e}")
+
+    def _spawn_worker(self):
+        """
+        Start a detached worker that outlives this front end, so later ones can share it.
+        """
+        with self.lock:
+            if self.spawned_at and monotonic() - self.spawned_at < self.connect_timeout:
+                return  # Another thread already started one
+            self.spawned_at = monotonic()
+            print("Starting inference worker...")
+            os.makedirs(os.path.dirname(INFERENCE_WORKER_LOG) or ".", exist_ok=True)
+            with open(INFERENCE_WORKER_LOG, "a") as log:
+                options = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if sys.platform == "win32" \
+                    else {"start_new_session": True}
+                subprocess.Popen(
+                    [sys.executable, "-u", os.path.abspath(__file__)],
+                    stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **options,
+                )
+
+    def close(self):
+        with self.lock:
+            for conn in self.idle:
+                conn.close()
+            self.idle.clear()
+
+
+def main():
+    InferenceWorker().serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# job_queue.py
+
+import heapq
+import itertools
+from threading import Condition, Thread
+
+# Lower numbers run first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+class BackgroundJobQueue:
+    """
+    Prioritized background job scheduler.
+    Jobs submitted with a key are coalesced: while a job with the same key is still
+    queued, later submissions replace its function and arguments instead of queueing
+    a duplicate, and the job keeps the higher of the two priorities.
+    """
+
+    def __init__(self, num_workers=1, name="background-jobs"):
+        self.name = name
+        self.condition = Condition()
+        self.heap = []
+        self.pending = {}  # key -> queued job entry
+        self.counter = itertools.count()
+        self.active = 0
+        self.closed = False
+        self.completed = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.workers = [
+            Thread(target=self._worker, name=f"{name}-{i}", daemon=True) for i in range(num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, func, *args, priority=PRIORITY_NORMAL, key=None, **kwargs):
+        """
+        Queue a job to run on a worker thread.
+        :param func: The callable to run.
+        :param priority: Lower values run first.
+        :param key: Optional coalescing key; a queued job with the same key is replaced.
+        :return: True if the job was queued or merged, False if the queue is closed.
+        """
+        with self.condition:
+            if self.closed:
+                return False
+            if key is not None and key in self.pending:
+                entry = self.pending[key]
+                self.coalesced += 1
+                if priority < entry[0]:
+                    # Re-queue at the higher priority; the cancelled entry is skipped when popped
+                    entry[3] = None
+                    self._push(priority, key, (func, args, kwargs))
+                    self.condition.notify()
+                else:
+                    entry[3] = (func, args, kwargs)
+                return True
+            self._push(priority, key, (func, args, kwargs))
+            self.condition.notify()
+            return True
+
+    def _push(self, priority, key, job):
+        entry = [priority, next(self.counter), key, job]
+        heapq.heappush(self.heap, entry)
+        if key is not None:
+            self.pending[key] = entry
+
+    def _worker(self):
+        while True:
+            with self.condition:
+                while not self.heap and not self.closed:
+                    self.condition.wait()
+                if not self.heap:
+                    return
+                entry = heapq.heappop(self.heap)
+                _, _, key, job = entry
+                if job is None:
+                    self.condition.notify_all()  # Cancelled entry; wake anyone waiting for the queue to drain
+                    continue
+                if key is not None:
+                    self.pending.pop(key, None)
+                self.active += 1
+
+            func, args, kwargs = job
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                self.failed += 1
+                print(f"Background job {getattr(func, '__name__', func)} failed: {e}")
+            finally:
+                with self.condition:
+                    self.active -= 1
+                    self.completed += 1
+                    self.condition.notify_all()
+
+    def wait_until_idle(self, timeout=None):
+        """
+        Block until every queued job has finished.
+        :return: True if the queue drained, False on timeout.
+        """
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.heap and self.active == 0, timeout)
+
+    def shutdown(self, timeout=None, drop_priority=None):
+        """
+        Stop accepting jobs, run everything that is already queued and stop the workers.
+        :param timeout: Maximum seconds to wait for each worker.
+        :param drop_priority: If set, discard queued jobs at this priority or lower instead of running them.
+        :return: The number of jobs discarded.
+        """
+        with self.condition:
+            self.closed = True
+            dropped = 0
+            if drop_priority is not None:
+                kept = []
+                for entry in self.heap:
+                    if entry[0] >= drop_priority:
+                        if entry[3] is not None:
+                            dropped += 1
+                        if entry[2] is not None and self.pending.get(entry[2]) is entry:
+                            del self.pending[entry[2]]
+                    else:
+                        kept.append(entry)
+                heapq.heapify(kept)
+                self.heap = kept
+            self.condition.notify_all()
+        for worker in self.workers:
+            worker.join(timeout)
+        return dropped
+
+    def get_stats(self):
+        with self.condition:
+            return {
+                "queued": len(self.heap),
+                "active": self.active,
+                "completed": self.completed,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+            }
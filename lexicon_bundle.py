@@ -0,0 +1,344 @@
+# lexicon_bundle.py
+
+import argparse
+import hashlib
+import mmap
+import os
+import random
+import struct
+import weakref
+from bisect import bisect_left
+from collections.abc import MutableMapping
+
+from config import LEXICON_BUNDLE_FILE
+
+# Bump when categorization rules or the on-disk layout change so stale bundles are rebuilt
+BUNDLE_MAGIC = b"HLEX"
+BUNDLE_VERSION = 1
+
+# magic, version, signature, then (offset, count) for each section
+HEADER_FORMAT = "<4sI32s" + "II" * 7
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+def compute_source_signature(paths):
+    """
+    Compute a signature over the size and modification time of every source file.
+    Missing files are part of the signature too, so adding a file invalidates the bundle.
+    :param paths: The source file paths the bundle was built from.
+    :return: A 32-byte digest.
+    """
+    digest = hashlib.sha256(struct.pack("<I", BUNDLE_VERSION))
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}\n".encode())
+        except OSError:
+            digest.update(f"{path}|missing\n".encode())
+    return digest.digest()
+
+
+def write_lexicon_bundle(path, word_categories, riddle_categories, signature):
+    """
+    Compile categorized words and riddles into a single indexed binary file.
+    Layout: a header, a string offset table and UTF-8 string pool, a category table and
+    word-id array for words, a category table and (riddle, answer) pair array for riddles,
+    and a sorted answer index mapping each answer to the riddles it solves.
+    :param path: Where to write the bundle.
+    :param word_categories: A dictionary of category -> list of words.
+    :param riddle_categories: A dictionary of category -> list of (riddle, answer) tuples.
+    :param signature: The source signature from compute_source_signature.
+    """
+    strings = {}
+
+    def intern(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    word_table, word_ids = [], []
+    for category, words in word_categories.items():
+        word_table.append((intern(category), len(word_ids), len(words)))
+        word_ids.extend(intern(word) for word in words)
+
+    riddle_table, riddle_pairs = [], []
+    answer_riddles = {}
+    for category, riddles in riddle_categories.items():
+        riddle_table.append((intern(category), len(riddle_pairs) // 2, len(riddles)))
+        for riddle, answer in riddles:
+            riddle_id, answer_id = intern(riddle), intern(answer)
+            riddle_pairs.extend((riddle_id, answer_id))
+            answer_riddles.setdefault(answer, []).append(riddle_id)
+
+    # Sort the answer index by answer text so lookups can binary search it
+    answer_table, answer_riddle_ids = [], []
+    for answer in sorted(answer_riddles):
+        ids = answer_riddles[answer]
+        answer_table.append((strings[answer], len(answer_riddle_ids), len(ids)))
+        answer_riddle_ids.extend(ids)
+
+    pool = bytearray()
+    string_offsets = []
+    for text in strings:  # Dictionaries preserve insertion order, which matches the ids
+        string_offsets.append(len(pool))
+        pool.extend(text.encode("utf-8"))
+    string_offsets.append(len(pool))
+    pool.extend(b"\0" * (-len(pool) % 4))  # Keep the following sections 4-byte aligned
+
+    sections = [
+        (struct.pack(f"<{len(string_offsets)}I", *string_offsets), len(strings)),
+        (bytes(pool), len(pool)),
+        (struct.pack(f"<{len(word_table) * 3}I", *[v for row in word_table for v in row]), len(word_table)),
+        (struct.pack(f"<{len(word_ids)}I", *word_ids), len(word_ids)),
+        (struct.pack(f"<{len(riddle_table) * 3}I", *[v for row in riddle_table for v in row]), len(riddle_table)),
+        (struct.pack(f"<{len(riddle_pairs)}I", *riddle_pairs), len(riddle_pairs) // 2),
+        (struct.pack(f"<{len(answer_table) * 3}I", *[v for row in answer_table for v in row]
+                     ) + struct.pack(f"<{len(answer_riddle_ids)}I", *answer_riddle_ids), len(answer_table)),
+    ]
+
+    header_fields = []
+    offset = HEADER_SIZE
+    for data, count in sections:
+        header_fields.extend((offset, count))
+        offset += len(data)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(struct.pack(HEADER_FORMAT, BUNDLE_MAGIC, BUNDLE_VERSION, signature, *header_fields))
+        for data, _ in sections:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+class LazyCategories(MutableMapping):
+    """
+    A category -> entries mapping whose entry lists are decoded from the bundle on first access.
+    Assigned or updated categories are kept in memory and shadow the bundle.
+    """
+
+    def __init__(self, categories, decode, shuffle=False):
+        self._categories = categories  # category name -> index in the bundle table
+        self._decode = decode
+        self._shuffle = shuffle
+        self._decoded = {}
+
+    def materialize(self):
+        """
+        Decode every category still in the bundle, so the mapping outlives the bundle's file mapping.
+        """
+        for category in list(self._categories):
+            self[category]
+        self._categories = {category: None for category in self._categories}
+        self._decode = None
+
+    def __getitem__(self, category):
+        if category not in self._decoded:
+            if category not in self._categories:
+                raise KeyError(category)
+            entries = self._decode(self._categories[category])
+            if self._shuffle:
+                random.shuffle(entries)
+            self._decoded[category] = entries
+        return self._decoded[category]
+
+    def __setitem__(self, category, entries):
+        self._decoded[category] = entries
+
+    def __delitem__(self, category):
+        if category not in self._decoded and category not in self._categories:
+            raise KeyError(category)
+        self._decoded.pop(category, None)
+        self._categories.pop(category, None)
+
+    def __iter__(self):
+        yield from self._categories
+        yield from (category for category in self._decoded if category not in self._categories)
+
+    def __len__(self):
+        return len(self._categories) + sum(1 for category in self._decoded if category not in self._categories)
+
+    def __contains__(self, category):
+        return category in self._categories or category in self._decoded
+
+
+class LexiconBundle:
+    """
+    Read-only view over a compiled lexicon bundle, memory-mapped from disk.
+    """
+
+    def __init__(self, path=LEXICON_BUNDLE_FILE):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        fields = struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+        magic, version, self.signature = fields[:3]
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f"Unsupported lexicon bundle: {path}")
+
+        (offsets_at, self.string_count, pool_at, pool_size,
+         word_table_at, self.word_category_count, word_ids_at, word_count,
+         riddle_table_at, self.riddle_category_count, pairs_at, riddle_count,
+         answers_at, self.answer_count) = fields[3:]
+
+        self._string_offsets = self._view[offsets_at:offsets_at + 4 * (self.string_count + 1)].cast("I")
+        self._pool = self._view[pool_at:pool_at + pool_size]
+        self._word_table = self._view[word_table_at:word_table_at + 12 * self.word_category_count].cast("I")
+        self._word_ids = self._view[word_ids_at:word_ids_at + 4 * word_count].cast("I")
+        self._riddle_table = self._view[riddle_table_at:riddle_table_at + 12 * self.riddle_category_count].cast("I")
+        self._riddle_pairs = self._view[pairs_at:pairs_at + 8 * riddle_count].cast("I")
+        answer_ids_at = answers_at + 12 * self.answer_count
+        self._answer_table = self._view[answers_at:answer_ids_at].cast("I")
+        self._answer_riddle_ids = self._view[answer_ids_at:].cast("I")  # The answer index is the last section
+        self.word_count = word_count
+        self.riddle_count = riddle_count
+        self._handed_out = []  # Weak references to the LazyCategories decoding from this mapping
+
+    def string(self, string_id):
+        """
+        Decode a single string from the pool.
+        """
+        start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+        return bytes(self._pool[start:end]).decode("utf-8")
+
+    def is_current(self, signature):
+        """
+        Check whether the bundle was built from sources matching the given signature.
+        """
+        return self.signature == signature
+
+    def _decode_words(self, index):
+        _, start, count = self._word_table[3 * index:3 * index + 3]
+        return [self.string(word_id) for word_id in self._word_ids[start:start + count]]
+
+    def _decode_riddles(self, index):
+        _, start, count = self._riddle_table[3 * index:3 * index + 3]
+        pairs = self._riddle_pairs[2 * start:2 * (start + count)]
+        return [(self.string(pairs[i]), self.string(pairs[i + 1])) for i in range(0, len(pairs), 2)]
+
+    def get_word_categories(self, shuffle=True):
+        """
+        Return the word categories as a lazily decoded mapping.
+        :param shuffle: Shuffle each category's words when it is first decoded.
+        """
+        categories = {self.string(self._word_table[3 * i]): i for i in range(self.word_category_count)}
+        lazy = LazyCategories(categories, self._decode_words, shuffle=shuffle)
+        self._handed_out.append(weakref.ref(lazy))
+        return lazy
+
+    def get_riddle_categories(self):
+        """
+        Return the riddle categories as a lazily decoded mapping of (riddle, answer) lists.
+        """
+        categories = {self.string(self._riddle_table[3 * i]): i for i in range(self.riddle_category_count)}
+        lazy = LazyCategories(categories, self._decode_riddles)
+        self._handed_out.append(weakref.ref(lazy))
+        return lazy
+
+    def get_all_words(self):
+        """
+        Decode every word in the bundle, in category order.
+        """
+        return [self.string(word_id) for word_id in self._word_ids]
+
+    def find_riddles(self, answer):
+        """
+        Return every riddle whose answer is the given word.
+        :param answer: The answer to look up (case-sensitive, as stored).
+        :return: A list of riddle strings.
+        """
+        keys = _AnswerKeys(self)
+        index = bisect_left(keys, answer)
+        if index == self.answer_count or keys[index] != answer:
+            return []
+        _, start, count = self._answer_table[3 * index:3 * index + 3]
+        return [self.string(riddle_id) for riddle_id in self._answer_riddle_ids[start:start + count]]
+
+    def close(self):
+        """
+        Unmap the bundle. Category mappings handed out earlier are decoded in full first, so they stay usable.
+        """
+        for ref in self._handed_out:
+            lazy = ref()
+            if lazy is not None:
+                lazy.materialize()
+        self._handed_out = []
+        for view in (self._string_offsets, self._pool, self._word_table, self._word_ids,
+                     self._riddle_table, self._riddle_pairs, self._answer_table, self._answer_riddle_ids):
+            view.release()
+        self._view.release()
+        self._mmap.close()
+
+
+class _AnswerKeys:
+    """
+    Sequence adapter over the sorted answer index, decoding keys only as bisect probes them.
+    """
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+
+    def __len__(self):
+        return self.bundle.answer_count
+
+    def __getitem__(self, index):
+        return self.bundle.string(self.bundle._answer_table[3 * index])
+
+
+_bundle_cache = {}
+
+
+def open_lexicon_bundle(signature, path=LEXICON_BUNDLE_FILE):
+    """
+    Open the lexicon bundle if it exists and matches the current sources.
+    :param signature: The current source signature.
+    :param path: The bundle path.
+    :return: A LexiconBundle, or None if the bundle is missing or stale.
+    """
+    bundle = _bundle_cache.get(path)
+    if bundle is not None:
+        if bundle.is_current(signature):
+            return bundle
+        del _bundle_cache[path]
+        bundle.close()
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = LexiconBundle(path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Error opening lexicon bundle: {e}")
+        return None
+    if not bundle.is_current(signature):
+        print(f"Lexicon bundle {path} is out of date; it is rebuilt in the background, "
+              f"or run 'python lexicon_bundle.py build'.")
+        bundle.close()
+        return None
+    _bundle_cache[path] = bundle
+    return bundle
+
+
+def main():
+    from content_manager import build_lexicon_bundle
+
+    parser = argparse.ArgumentParser(description="Compile the word and riddle lexicon into a binary bundle.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Build the lexicon bundle from the data folder.")
+    build_parser.add_argument("--output", default=LEXICON_BUNDLE_FILE, help="Path of the bundle to write.")
+    info_parser = subparsers.add_parser("info", help="Show the contents of an existing bundle.")
+    info_parser.add_argument("--path", default=LEXICON_BUNDLE_FILE, help="Path of the bundle to inspect.")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_lexicon_bundle(args.output)
+    else:
+        bundle = LexiconBundle(args.path)
+        print(f"Strings: {bundle.string_count}")
+        print(f"Words: {bundle.word_count} in {bundle.word_category_count} categories")
+        print(f"Riddles: {bundle.riddle_count} in {bundle.riddle_category_count} categories")
+        print(f"Distinct answers: {bundle.answer_count}")
+        bundle.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# load_generator.py
+# Drives a game_server.py instance with many concurrent clients and reports throughput
+# and guess round-trip latency.
+
+import argparse
+import asyncio
+import json
+import random
+from time import perf_counter, perf_counter_ns
+
+from config import SERVER_HOST, SERVER_PORT
+from simulate import ENGLISH_FREQUENCY_ORDER, LatencyRecorder
+
+
+class GameClient:
+    """
+    A single connection speaking the newline-delimited JSON protocol of game_server.py.
+    Requests on one connection are answered in order, so no request ids are needed.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, host=SERVER_HOST, port=SERVER_PORT):
+        reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+        return cls(reader, writer)
+
+    async def request(self, op, **fields):
+        self.writer.write((json.dumps({"op": op, **fields}) + "\n").encode())
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        if not response.get("ok"):
+            raise RuntimeError(response.get("error", "request failed"))
+        return response
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def play_sessions(client, sessions, mode, difficulty, latency, results, player=None):
+    """
+    Play a number of sessions to completion on one connection with the frequency strategy.
+    """
+    fields = {"player": player} if player is not None else {}
+    for _ in range(sessions):
+        response = await client.request("new", mode=mode, difficulty=difficulty, **fields)
+        session_id, state = response["session"], response["state"]
+        for letter in ENGLISH_FREQUENCY_ORDER:
+            if state["won"] or state["lost"]:
+                break
+            t0 = perf_counter_ns()
+            state = (await client.request("guess", session=session_id, letter=letter))["state"]
+            latency.record(perf_counter_ns() - t0)
+        results["wins" if state["won"] else "losses"] += 1
+        await client.request("close", session=session_id)
+
+
+async def run_load(clients=100, sessions_per_client=50, mode="word_guess", difficulty=1,
+                   host=SERVER_HOST, port=SERVER_PORT, seed=0, players=0):
+    """
+    Run concurrent clients against a server.
+    :param players: Spread the clients over this many named players; 0 plays anonymously.
+    :return: A dictionary of results.
+    """
+    latency = LatencyRecorder(random.Random(seed))
+    results = {"wins": 0, "losses": 0}
+    connections = [await GameClient.connect(host, port) for _ in range(clients)]
+
+    started = perf_counter()
+    await asyncio.gather(*(
+        play_sessions(client, sessions_per_client, mode, difficulty, latency, results,
+                      f"load-{index % players}" if players else None)
+        for index, client in enumerate(connections)
+    ))
+    elapsed = perf_counter() - started
+
+    stats = (await connections[0].request("stats"))["stats"]
+    for client in connections:
+        await client.close()
+
+    total = clients * sessions_per_client
+    return {
+        "clients": clients,
+        "sessions": total,
+        "elapsed_s": elapsed,
+        "sessions_per_sec": total / elapsed if elapsed else 0.0,
+        "win_rate": results["wins"] / total if total else 0.0,
+        "guess": latency.summary(),
+        "server": stats,
+    }
+
+
+async def run_with_server(args):
+    server = None
+    if args.spawn_server:
+        from game_journal import GameJournal
+        from game_logic import GameContext
+        from game_server import GameServer
+        server = GameServer(GameContext(headless=True, journal=GameJournal() if args.journal else None),
+                            host=args.host, port=0)
+        await server.start()
+    try:
+        return await run_load(args.clients, args.sessions, args.mode, args.difficulty,
+                              args.host, server.port if server else args.port, args.seed, args.players)
+    finally:
+        if server:
+            await server.stop()
+            server.context.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Hangman game server.")
+    parser.add_argument("--host", default=SERVER_HOST, help="Server address.")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="Server port.")
+    parser.add_argument("--clients", type=int, default=100, help="Concurrent client connections.")
+    parser.add_argument("--sessions", type=int, default=50, help="Sessions played by each client.")
+    parser.add_argument("--mode", choices=["word_guess", "riddle_time"], default="word_guess", help="Game mode.")
+    parser.add_argument("--difficulty", type=int, choices=[1, 2, 3], default=1, help="Difficulty level.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency sampling.")
+    parser.add_argument("--players", type=int, default=0, help="Number of named players (0 for anonymous).")
+    parser.add_argument("--spawn-server", action="store_true", help="Run a headless server in this process.")
+    parser.add_argument("--journal", action="store_true", help="Journal game events on the spawned server.")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_with_server(args))
+    guess = results["guess"]
+    print(f"Sessions: {results['sessions']} over {results['clients']} clients in {results['elapsed_s']:.2f}s "
+          f"({results['sessions_per_sec']:.0f} sessions/sec)")
+    print(f"Win rate: {results['win_rate']:.2%}")
+    if guess["count"]:
+        print(f"guess round trip: n={guess['count']} mean={guess['mean_us']:.0f}us "
+              f"p50={guess['p50_us']:.0f}us p90={guess['p90_us']:.0f}us p99={guess['p99_us']:.0f}us")
+    print(f"Server: {results['server']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
 # main.py
 import pygame
-from config import WIDTH, HEIGHT, FPS
-from game_logic import HangmanGame, load_words
+from config import WIDTH, HEIGHT, FPS, SHUTDOWN_TIMEOUT
+from game_logic import HangmanGame, GameContext, load_words
+from game_journal import GameJournal
+from replay_store import ReplayWriter
 from ui_manager import UIManager
 from powerup_manager import PowerUpManager
 from time import time
@@ -9,6 +11,7 @@ from theme_manager import ThemeManager
 from voice_input import VoiceInput
 from ai_manager import AIManager
 from threading import Thread
+from word_solver import AIGuesser
 
 try:
     pygame.init()
@@ -30,16 +33,24 @@ Thread(target=ui.load_theme_assets_async).start()  # Load theme assets in a sepa
 voice_input = VoiceInput()
 ai_manager = AIManager()  # Initialize AIManager with training data support
 words = load_words(ai_manager=ai_manager)  # Train AI on loaded words
+context = GameContext(
+    words=words, ai_manager=ai_manager, journal=GameJournal(), replays=ReplayWriter()
+)  # Shared by every round
 paused = False
+pause_started = 0
 
 start_time = time()
 time_limit = 60  # 60 seconds for timed mode
 
 player_turn = None
+ai_guesser = None
+AI_GUESS_INTERVAL = 0.6  # Seconds between AI guesses so the player can follow along
+last_ai_guess_time = 0
+LOCAL_SESSION = "local"  # Journal session for the player's rounds, resumed after a crash
 
 def start_word_guess():
     global game, game_mode, start_time
-    game = HangmanGame("word_guess", difficulty)
+    game = HangmanGame("word_guess", difficulty, context=context, session_id=LOCAL_SESSION, player_id=player_name)
     game.power_ups = PowerUpManager()
     game_mode = "word_guess"
     start_time = time()
@@ -51,7 +62,7 @@ def start_word_guess():
 
 def start_riddle_time():
     global game, game_mode, start_time
-    game = HangmanGame("riddle_time", difficulty)
+    game = HangmanGame("riddle_time", difficulty, context=context, session_id=LOCAL_SESSION, player_id=player_name)
     game.power_ups = PowerUpManager()
     game_mode = "riddle_time"
     start_time = time()
@@ -61,6 +72,44 @@ def start_riddle_time():
         use_extra_attempt=lambda: handle_power_up("extra_attempt"),
     )
 
+def resume_saved_round():
+    """
+    Continue the round that was in progress when the game last exited without finishing it.
+    Returns True if a round was resumed.
+    """
+    global game, game_mode, start_time, paused, pause_started
+    history = context.journal.get_session(LOCAL_SESSION)
+    if history is None or history[0].get("player_id") != player_name:
+        return False  # Another player's round is not resumed; starting a new round replaces it
+    saved = HangmanGame.resume(context, LOCAL_SESSION)
+    if saved is None:
+        return False
+    game = saved
+    game_mode = game.mode
+    # Continue the round timer where it stopped instead of giving the round a fresh one
+    start_time = time() - (game.time_limit - game.get_time_left())
+    paused = game.is_paused
+    pause_started = time()
+    ui.create_game_buttons(
+        use_hint=lambda: handle_hint(),
+        use_reveal_letter=lambda: handle_power_up("reveal_letter"),
+        use_extra_attempt=lambda: handle_power_up("extra_attempt"),
+    )
+    return True
+
+def start_ai_guesser():
+    """
+    Start a round in which the computer guesses the word.
+    """
+    global game, game_mode, start_time, ai_guesser, last_ai_guess_time
+    self_play = context.get_self_play_context()  # Not journaled, replayed or learned from
+    game = HangmanGame("word_guess", difficulty, context=self_play)
+    if ai_guesser is None:
+        ai_guesser = AIGuesser(self_play.get_lexicon_index())
+    game_mode = "ai_guesser"
+    start_time = last_ai_guess_time = time()
+    ui.buttons = []
+
 def set_difficulty(level):
     global difficulty
     difficulty = level
@@ -89,8 +138,17 @@ def handle_voice_guess():
         game.guess_letter(guess[0])
 
 def toggle_pause():
-    global paused
+    global paused, pause_started, start_time
     paused = not paused
+    if paused:
+        pause_started = time()
+    else:
+        start_time += time() - pause_started  # Time spent paused does not count against the round
+    if game and game_mode in ["word_guess", "riddle_time"]:
+        if paused:
+            game.pause_game()
+        else:
+            game.resume_game()
 
 def show_achievements():
     global game_mode
@@ -104,7 +162,7 @@ def change_theme():
     ui.load_theme_assets()
 
 def create_menu_buttons():
-    ui.create_menu_buttons(start_word_guess, start_riddle_time, set_difficulty, show_achievements, change_theme)
+    ui.create_menu_buttons(start_word_guess, start_riddle_time, set_difficulty, show_achievements, change_theme, start_ai_guesser)
 
 # Main game loop
 running = True
@@ -117,8 +175,9 @@ while running:
             # Handle confirm button on name input screen
             if game_mode == "name_input" and ui.buttons:
                 if ui.buttons[0].is_clicked(event) and player_name.strip():
-                    game_mode = "menu"
-                    create_menu_buttons()
+                    if not resume_saved_round():
+                        game_mode = "menu"
+                        create_menu_buttons()
             # Handle play again button
             if game_mode == "game_over" and ui.buttons:
                 if ui.buttons[0].is_clicked(event):
@@ -144,7 +203,18 @@ while running:
         continue
 
     # Update game state
-    if game_mode in ["word_guess", "riddle_time"]:
+    if game_mode == "ai_guesser":
+        if game.check_win() or game.check_lose():
+            game_mode = "game_over"
+            ui.draw_game_over(game, win=game.check_win())
+        elif time() - last_ai_guess_time >= AI_GUESS_INTERVAL:
+            letter = ai_guesser.next_guess(game)
+            if letter:
+                game.guess_letter(letter)
+            else:
+                game_mode = "game_over"
+            last_ai_guess_time = time()
+    elif game_mode in ["word_guess", "riddle_time"]:
         if game.check_win():
             game.track_player_stats(player_name, win=True)
             game_mode = "game_over"
@@ -159,6 +229,8 @@ while running:
         ui.draw_name_input(player_name)
     elif game_mode == "menu":
         ui.draw_menu()
+    elif game_mode == "ai_guesser":
+        ui.draw_game(game)
     elif game_mode in ["word_guess", "riddle_time"]:
         time_left = max(0, time_limit - int(time() - start_time))
         ui.draw_game(game)
@@ -167,9 +239,10 @@ while running:
     elif game_mode == "game_over":
         ui.draw_game_over(game, win=False)
     elif game_mode == "achievements":
-        ui.draw_achievements(game.achievements_manager.achievements)
+        ui.draw_achievements(context.achievements_manager.achievements)
 
     pygame.display.flip()
     clock.tick(FPS)
 
+context.shutdown(timeout=SHUTDOWN_TIMEOUT, drop_low_priority=True)  # Flush training data without waiting on learning jobs
 pygame.quit()
\ No newline at end of file
@@ -0,0 +1,295 @@
+# model_registry.py
+# Loads AI models on first use, shares weights between pipelines built on the same checkpoint
+# and unloads models that sit idle or push the process over its memory budget.
+
+import gc
+from threading import Event, Lock, RLock, Thread
+from time import monotonic
+
+from batching_pipeline import BatchingPipeline
+from config import (
+    MODEL_MEMORY_BUDGET_MB,
+    MODEL_IDLE_TIMEOUT,
+    MODEL_RETRY_BACKOFF,
+    MODEL_RETRY_MAX_BACKOFF,
+    INFERENCE_WORKER,
+    EMBEDDING_MODEL,
+)
+
+MB = 1024 * 1024
+
+# Pipeline name -> (task, checkpoint). Names sharing a task and checkpoint share one pipeline.
+MODEL_SPECS = {
+    "text_generator": ("text-generation", "gpt2"),
+    "text_rephraser": ("text2text-generation", "t5-small"),
+    "synonym_generator": ("text2text-generation", "t5-small"),
+    "text_classifier": ("zero-shot-classification", "facebook/bart-large-mnli"),
+    "question_answering_model": ("question-answering", "distilbert-base-cased-distilled-squad"),
+    "sentence_encoder": ("feature-extraction", EMBEDDING_MODEL),
+}
+
+# Task -> transformers auto class its checkpoint is loaded with
+TASK_MODEL_CLASSES = {
+    "text-generation": "AutoModelForCausalLM",
+    "text2text-generation": "AutoModelForSeq2SeqLM",
+    "zero-shot-classification": "AutoModelForSequenceClassification",
+    "question-answering": "AutoModelForQuestionAnswering",
+    "feature-extraction": "AutoModel",
+}
+
+
+class ModelUnavailable(Exception):
+    """
+    Raised when a checkpoint is not configured or its tokenizer could not be loaded.
+    """
+
+
+class LoadedModel:
+    def __init__(self, model, size):
+        self.model = model
+        self.size = size  # Estimated bytes of parameters and buffers
+        self.pipelines = {}  # task -> pipeline over this model
+        self.last_used = monotonic()
+
+
+class ModelRegistry:
+    """
+    Process-wide store of loaded models keyed by (auto class, checkpoint).
+    torch and transformers are only imported when the first model is loaded. Unloading drops the
+    registry's references; callers still holding a pipeline keep it alive until they finish.
+    """
+
+    def __init__(self, specs=None, memory_budget_mb=MODEL_MEMORY_BUDGET_MB, idle_timeout=MODEL_IDLE_TIMEOUT,
+                 device=None, retry_backoff=MODEL_RETRY_BACKOFF, max_retry_backoff=MODEL_RETRY_MAX_BACKOFF):
+        self.specs = dict(specs or MODEL_SPECS)
+        self.memory_budget = memory_budget_mb * MB
+        self.idle_timeout = idle_timeout
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._device = device
+        self.lock = RLock()
+        self.load_locks = {}  # key -> Lock, so one slow load does not block other models
+        self.models = {}  # (auto class, checkpoint) -> LoadedModel
+        self.tokenizers = {}  # checkpoint -> tokenizer; small, so kept across unloads
+        self.failed = {}  # key -> (error message, monotonic time of next attempt, consecutive failures)
+        self.loads = 0
+        self.unloads = 0
+        self.stopped = Event()
+        self.reaper = None
+
+    @property
+    def device(self):
+        if self._device is None:
+            try:
+                import torch
+                self._device = "cuda" if torch.cuda.is_available() else "cpu"
+            except ImportError:
+                self._device = "cpu"
+            print(f"Device set to use {self._device}")
+        return self._device
+
+    def get(self, name):
+        """
+        Return the pipeline registered under a name, loading its model on first use.
+        :param name: A key of the registry's specs, e.g. "text_generator".
+        :return: The pipeline, or None if the model could not be loaded.
+        """
+        task, checkpoint = self.specs[name]
+        entry = self._acquire(TASK_MODEL_CLASSES[task], checkpoint, task)
+        return entry.pipelines.get(task) if entry else None
+
+    def get_model(self, checkpoint, model_class="AutoModelForSeq2SeqLM"):
+        """
+        Return the bare model for a checkpoint, shared with any pipeline built on it.
+        :return: The model, or None if it could not be loaded.
+        """
+        entry = self._acquire(model_class, checkpoint)
+        return entry.model if entry else None
+
+    def get_tokenizer(self, checkpoint):
+        """
+        Return the tokenizer for a checkpoint without loading the model weights.
+        :return: The tokenizer, or None if it could not be loaded.
+        """
+        key = ("AutoTokenizer", checkpoint)
+        tokenizer = self.tokenizers.get(checkpoint)
+        if tokenizer is None and not self._backing_off(key):
+            with self._load_lock(key):
+                tokenizer = self.tokenizers.get(checkpoint)
+                if tokenizer is None:
+                    try:
+                        if checkpoint is None:
+                            raise ModelUnavailable("no checkpoint is configured")
+                        from transformers import AutoTokenizer
+                        tokenizer = self.tokenizers[checkpoint] = AutoTokenizer.from_pretrained(checkpoint)
+                        self._record_success(key)
+                    except Exception as e:
+                        self._record_failure(key, e)
+        return tokenizer
+
+    def _load_lock(self, key):
+        with self.lock:
+            return self.load_locks.setdefault(key, Lock())
+
+    def _backing_off(self, key):
+        """
+        Return whether a key failed to load recently and should not be tried again yet.
+        """
+        failure = self.failed.get(key)
+        return failure is not None and monotonic() < failure[1]
+
+    def _record_failure(self, key, error):
+        with self.lock:
+            attempts = self.failed[key][2] + 1 if key in self.failed else 1
+            delay = min(self.retry_backoff * 2 ** (attempts - 1), self.max_retry_backoff)
+            self.failed[key] = (str(error), monotonic() + delay, attempts)
+        print(f"AI model {key[1]} could not be loaded: {error}")
+        print(f"AI-powered features will be limited; retrying in {delay:.0f}s.")
+
+    def _record_success(self, key):
+        with self.lock:
+            self.failed.pop(key, None)
+
+    def _acquire(self, model_class, checkpoint, task=None):
+        """
+        Return the loaded entry for a checkpoint, loading it and building the task's pipeline if needed.
+        """
+        key = (model_class, checkpoint)
+        entry = self.models.get(key)
+        if entry is None or (task and task not in entry.pipelines):
+            if self._backing_off(key):
+                return None
+            with self._load_lock(key):
+                entry = self.models.get(key)
+                try:
+                    if checkpoint is None:
+                        raise ModelUnavailable("no checkpoint is configured")
+                    if entry is None:
+                        entry = self._load(model_class, checkpoint)
+                    if task and task not in entry.pipelines:
+                        from transformers import pipeline
+                        tokenizer = self.get_tokenizer(checkpoint)
+                        if tokenizer is None:
+                            raise ModelUnavailable(f"tokenizer for {checkpoint} could not be loaded")
+                        if tokenizer.pad_token is None and tokenizer.eos_token is not None:
+                            # Batched inputs need padding; decoder-only models pad on the left
+                            tokenizer.pad_token = tokenizer.eos_token
+                            tokenizer.padding_side = "left"
+                        entry.pipelines[task] = BatchingPipeline(pipeline(
+                            task, model=entry.model, tokenizer=tokenizer,
+                            device=0 if self.device == "cuda" else -1,
+                        ), task)
+                    self._record_success(key)
+                except Exception as e:
+                    self._record_failure(key, e)
+                    return None
+        entry.last_used = monotonic()
+        return entry
+
+    def _load(self, model_class, checkpoint):
+        import transformers
+        start = monotonic()
+        model = getattr(transformers, model_class).from_pretrained(checkpoint).to(self.device)
+        model.eval()
+        size = sum(t.numel() * t.element_size() for t in model.parameters())
+        size += sum(t.numel() * t.element_size() for t in model.buffers())
+        entry = LoadedModel(model, size)
+        with self.lock:
+            self.models[(model_class, checkpoint)] = entry
+            self.loads += 1
+            self._enforce_budget(keep=(model_class, checkpoint))
+            if self.idle_timeout and self.reaper is None:
+                self.reaper = Thread(target=self._reap_idle, name="model-reaper", daemon=True)
+                self.reaper.start()
+        print(f"Loaded {checkpoint} ({size / MB:.0f} MB) in {monotonic() - start:.1f}s")
+        return entry
+
+    def _enforce_budget(self, keep):
+        """
+        Unload least recently used models until the loaded total fits the memory budget.
+        The model just loaded is kept even if it alone exceeds the budget.
+        """
+        total = sum(entry.size for entry in self.models.values())
+        for key, entry in sorted(self.models.items(), key=lambda item: item[1].last_used):
+            if total <= self.memory_budget:
+                break
+            if key != keep:
+                total -= entry.size
+                self.unload(key)
+
+    def _reap_idle(self):
+        interval = max(1.0, self.idle_timeout / 4)
+        while not self.stopped.wait(interval):
+            self.unload_idle()
+
+    def unload_idle(self):
+        """
+        Unload models unused for longer than the idle timeout.
+        :return: The number of models unloaded.
+        """
+        cutoff = monotonic() - self.idle_timeout
+        with self.lock:
+            idle = [key for key, entry in self.models.items() if entry.last_used < cutoff]
+            for key in idle:
+                self.unload(key)
+        return len(idle)
+
+    def unload(self, key):
+        """
+        Drop a loaded model and every pipeline built on it.
+        :param key: The (auto class, checkpoint) pair the model was loaded under.
+        """
+        with self.lock:
+            entry = self.models.pop(key, None)
+            if entry is None:
+                return
+            self.unloads += 1
+        for pipe in entry.pipelines.values():
+            pipe.close()  # Lets the batching thread exit and release the model
+        del entry
+        print(f"Unloaded model {key[1]}")
+        gc.collect()
+        if self._device == "cuda":
+            import torch
+            torch.cuda.empty_cache()
+
+    def close(self):
+        """
+        Stop the idle reaper and unload every model.
+        """
+        self.stopped.set()
+        with self.lock:
+            for key in list(self.models):
+                self.unload(key)
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "loaded": {key[1]: round(entry.size / MB) for key, entry in self.models.items()},
+                "loaded_mb": round(sum(entry.size for entry in self.models.values()) / MB),
+                "budget_mb": round(self.memory_budget / MB),
+                "loads": self.loads,
+                "unloads": self.unloads,
+                "failed": sorted(str(key[1]) for key in self.failed),
+                "batching": {
+                    task: pipe.get_stats() for entry in self.models.values() for task, pipe in entry.pipelines.items()
+                },
+            }
+
+
+_default_registry = None
+
+
+def get_default_registry():
+    """
+    Return the process-wide model registry, so every AIManager shares one set of weights.
+    With the inference worker enabled this is a client of the worker, shared by every front end.
+    """
+    global _default_registry
+    if _default_registry is None:
+        if INFERENCE_WORKER:
+            from inference_worker import RemoteModelRegistry
+            _default_registry = RemoteModelRegistry()
+        else:
+            _default_registry = ModelRegistry()
+    return _default_registry
@@ -0,0 +1,214 @@
+# passage_index.py
+# BM25 retrieval over the AI's training data, so question answering only reads the relevant passages.
+
+import heapq
+import math
+import re
+from threading import Lock
+
+from config import PASSAGE_TOP_K
+
+BM25_K1 = 1.5  # Term frequency saturation
+BM25_B = 0.75  # Document length normalization
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i in is it its of on or "
+    "that the their this to was what when where which who why will with you your".split()
+)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def definition_passages(word, definitions):
+    """
+    Turn a list of definition dictionaries into one passage per definition.
+    """
+    for definition in definitions:
+        if not isinstance(definition, dict) or not definition.get("definition"):
+            continue
+        passage = f"{word}: {definition['definition']}" if word else f"Definition: {definition['definition']}"
+        if definition.get("example"):
+            passage += f" Example: {definition['example']}"
+        synonyms = definition.get("synonyms")
+        if synonyms:
+            passage += f" Synonyms: {', '.join(synonyms) if isinstance(synonyms, list) else synonyms}"
+        yield passage
+
+
+def entry_passages(word, entry):
+    """
+    Passages for one definitions, research_results or dynamic_memory entry, whichever shape it has.
+    """
+    if not isinstance(entry, dict):
+        return
+    if "definitions" in entry:
+        yield from definition_passages(entry.get("word", word), entry["definitions"])
+    elif "definition" in entry:
+        yield from definition_passages(word, [entry])
+    for key in ("synonyms", "related_topics"):
+        values = entry.get(key)
+        if values and isinstance(values, list) and all(isinstance(value, str) for value in values):
+            yield f"{word} {key.replace('_', ' ')}: {', '.join(values)}"
+
+
+class PassageIndex:
+    """
+    Inverted index with BM25 scoring over definitions, research and dynamic memory in training data.
+    sync() only indexes what changed since the previous call; identical passages are indexed once.
+    Dict entries that are rewritten, such as a re-researched term, replace their old passages.
+    """
+
+    def __init__(self, top_k=PASSAGE_TOP_K):
+        self.top_k = top_k
+        self.lock = Lock()
+        self.reset()
+
+    def reset(self):
+        self.passages = []  # doc id -> passage text, or None once removed
+        self.doc_ids = {}  # passage text -> doc id
+        self.refs = []  # doc id -> number of entries holding the passage
+        self.doc_lengths = []
+        self.total_length = 0
+        self.live = 0  # Passages not removed
+        self.postings = {}  # term -> [(passage id, term frequency)]
+        self.synced_lists = {}  # training data key -> (list object, items indexed)
+        self.synced_versions = {}  # training data key -> (section generation, store version) last synced
+        self.entry_docs = {}  # (training data key, dict key) -> doc ids of the entry's passages
+
+    def add(self, passage):
+        """
+        Index one passage.
+        :return: True if it was new.
+        """
+        return self._acquire(passage)[1]
+
+    def _acquire(self, passage):
+        """
+        Index a passage, or count one more holder of an indexed one.
+        :return: (doc id, whether it was new); the doc id is None for a passage with no terms.
+        """
+        doc_id = self.doc_ids.get(passage)
+        if doc_id is not None:
+            self.refs[doc_id] += 1
+            return doc_id, False
+        terms = tokenize(passage)
+        if not terms:
+            return None, False
+        doc_id = len(self.passages)
+        self.doc_ids[passage] = doc_id
+        self.passages.append(passage)
+        self.refs.append(1)
+        self.doc_lengths.append(len(terms))
+        self.total_length += len(terms)
+        self.live += 1
+        counts = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, count in counts.items():
+            self.postings.setdefault(term, []).append((doc_id, count))
+        return doc_id, True
+
+    def _release(self, doc_id):
+        """
+        Drop one holder of a passage, removing it from the index when none are left.
+        """
+        self.refs[doc_id] -= 1
+        if self.refs[doc_id]:
+            return
+        passage = self.passages[doc_id]
+        del self.doc_ids[passage]
+        self.passages[doc_id] = None
+        self.total_length -= self.doc_lengths[doc_id]
+        self.doc_lengths[doc_id] = 0
+        self.live -= 1
+        for term in set(tokenize(passage)):
+            postings = [posting for posting in self.postings[term] if posting[0] != doc_id]
+            if postings:
+                self.postings[term] = postings
+            else:
+                del self.postings[term]
+
+    def _reindex(self, key, word, entry):
+        """
+        Replace the passages of one dict entry with those of its current value.
+        :return: The number of new passages.
+        """
+        added, doc_ids = 0, []
+        for passage in entry_passages(word, entry):
+            doc_id, new = self._acquire(passage)
+            if doc_id is not None:
+                doc_ids.append(doc_id)
+                added += new
+        for doc_id in self.entry_docs.pop((key, word), ()):
+            self._release(doc_id)  # After acquiring, so unchanged passages are kept as they are
+        if entry is not None:
+            self.entry_docs[(key, word)] = doc_ids
+        return added
+
+    def sync(self, training_data):
+        """
+        Index entries added to the training data since the last sync.
+        A list that was replaced or shrank is re-read from the start; duplicates are skipped.
+        With a TrainingStore, dict entries set or deleted since the last sync are reindexed
+        from its change log; a plain dict is checked for new keys only.
+        :return: The number of new passages.
+        """
+        added = 0
+        with self.lock:
+            for key in ("definitions", "research"):
+                items = training_data.get(key) or []
+                synced_list, count = self.synced_lists.get(key, (None, 0))
+                if synced_list is not items or count > len(items):
+                    count = 0
+                for item in items[count:]:
+                    if key == "research":
+                        word = item.get("word", "")
+                        passages = (f"{word}: {result}" for result in item.get("results", []) if isinstance(result, str))
+                    else:
+                        passages = entry_passages("", item)
+                    added += sum(self.add(passage) for passage in passages)
+                self.synced_lists[key] = (items, len(items))
+            for key in ("research_results", "dynamic_memory"):
+                entries = training_data.get(key) or {}
+                if hasattr(training_data, "changes_since"):
+                    generation, version = self.synced_versions.get(key, (None, 0))
+                    current, words, version = training_data.changes_since(key, version)
+                    if current != generation:  # First sync, or the section was replaced
+                        words = set(entries) | {word for section, word in self.entry_docs if section == key}
+                    self.synced_versions[key] = (current, version)
+                else:
+                    words = [word for word in entries if (key, word) not in self.entry_docs]
+                for word in words:
+                    added += self._reindex(key, word, entries.get(word))
+        return added
+
+    def search(self, query, k=None):
+        """
+        Return the top passages for a query by BM25 score, best first.
+        :param query: The question or search text.
+        :param k: The number of passages; defaults to the index's top_k.
+        """
+        k = k or self.top_k
+        with self.lock:
+            count = self.live
+            if not count:
+                return []
+            average_length = self.total_length / count
+            scores = {}
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [self.passages[doc_id] for doc_id, _ in best]
+
+    def get_stats(self):
+        return {"passages": self.live, "terms": len(self.postings)}
@@ -0,0 +1,382 @@
+# replay_store.py
+
+import argparse
+import mmap
+import os
+import struct
+from collections import Counter, namedtuple
+from threading import Condition, Thread
+from time import monotonic, time
+
+from config import REPLAY_DIR, REPLAY_SEGMENT_RECORDS, REPLAY_FLUSH_INTERVAL
+
+SEGMENT_MAGIC = b"HRPL"
+FOOTER_MAGIC = b"HRPF"
+SEGMENT_VERSION = 1
+
+# magic, version
+SEGMENT_HEADER = struct.Struct("<4sI")
+# footer offset, record count, word count, magic; always the last bytes of a segment
+SEGMENT_TRAILER = struct.Struct("<QII4s")
+# record length, word id, flags, difficulty, hints used, power-ups used, start time, duration in ms
+RECORD_HEADER = struct.Struct("<HIBBBBII")
+
+FLAG_RIDDLE = 1
+FLAG_WIN = 2
+
+# Action codes: 0-25 are guesses of A-Z; other letters are stored as UTF-8 after ACTION_OTHER_LETTER
+ACTION_HINT = 26
+ACTION_REVEAL_LETTER = 27
+ACTION_EXTRA_ATTEMPT = 28
+ACTION_OTHER_LETTER = 29
+POWER_UP_ACTIONS = {"reveal_letter": ACTION_REVEAL_LETTER, "extra_attempt": ACTION_EXTRA_ATTEMPT}
+ACTION_NAMES = {ACTION_HINT: "hint", ACTION_REVEAL_LETTER: "reveal_letter", ACTION_EXTRA_ATTEMPT: "extra_attempt"}
+
+Replay = namedtuple(
+    "Replay", "word mode difficulty win started_at duration_ms hints_used power_ups_used actions"
+)
+
+
+def encode_actions(actions):
+    """
+    Pack a round's actions into bytes.
+    Each action is a code byte followed by the milliseconds since the previous action as a varint.
+    :param actions: A list of (action, ms since the round started) tuples, where action is a
+                    guessed letter or one of 'hint', 'reveal_letter' and 'extra_attempt'.
+    """
+    data = bytearray()
+    previous = 0
+    for action, at_ms in actions:
+        if action == "hint":
+            data.append(ACTION_HINT)
+        elif action in POWER_UP_ACTIONS:
+            data.append(POWER_UP_ACTIONS[action])
+        elif "A" <= action <= "Z" and len(action) == 1:
+            data.append(ord(action) - 65)
+        else:
+            encoded = action.encode("utf-8")
+            data.append(ACTION_OTHER_LETTER)
+            data.append(len(encoded))
+            data.extend(encoded)
+        delta = max(0, at_ms - previous)
+        previous = max(previous, at_ms)
+        while delta >= 0x80:
+            data.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        data.append(delta)
+    return bytes(data)
+
+
+def decode_actions(data):
+    """
+    Unpack bytes from encode_actions into a list of (action, ms since the round started) tuples.
+    """
+    actions = []
+    position, at_ms = 0, 0
+    end = len(data)
+    while position < end:
+        code = data[position]
+        position += 1
+        if code < 26:
+            action = chr(65 + code)
+        elif code == ACTION_OTHER_LETTER:
+            size = data[position]
+            action = bytes(data[position + 1:position + 1 + size]).decode("utf-8")
+            position += 1 + size
+        else:
+            action = ACTION_NAMES[code]
+        delta, shift = 0, 0
+        while True:
+            byte = data[position]
+            position += 1
+            delta |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        at_ms += delta
+        actions.append((action, at_ms))
+    return actions
+
+
+class ReplayWriter:
+    """
+    Buffers finished rounds as binary records and writes them out in segment files.
+    A segment is the records, then a footer holding the segment's word table and an offset
+    index of every record, then a fixed-size trailer pointing at the footer. Segments are
+    written to a temporary name and renamed, so readers only ever see complete files.
+    A flusher thread writes the buffer once its oldest replay has waited flush_interval
+    seconds, so a crash loses at most that much, even when segments fill slowly.
+    """
+
+    def __init__(self, directory=REPLAY_DIR, segment_records=REPLAY_SEGMENT_RECORDS,
+                 flush_interval=REPLAY_FLUSH_INTERVAL):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.flush_interval = flush_interval
+        self.lock = Condition()
+        self._reset_segment()
+        self.segments_written = 0
+        self.replays_written = 0
+        self.closed = False
+        os.makedirs(directory, exist_ok=True)
+        self.flusher = Thread(target=self._flush_loop, name="replay-writer", daemon=True)
+        self.flusher.start()
+
+    def _reset_segment(self):
+        self.records = []
+        self.word_ids = {}  # Words are stored once per segment and referenced by id
+        self.first_buffered = None  # monotonic() when the oldest buffered replay was added
+
+    def add(self, word, mode, difficulty, win, started_at, actions, duration_ms=None):
+        """
+        Buffer the replay of a finished round.
+        :param actions: A list of (action, ms since the round started) tuples; see encode_actions.
+        :param duration_ms: Milliseconds from the start to the end of the round; the time of the last action by default.
+        """
+        packed = encode_actions(actions)
+        hints = sum(1 for action, _ in actions if action == "hint")
+        power_ups = sum(1 for action, _ in actions if action in POWER_UP_ACTIONS)
+        if duration_ms is None:
+            duration_ms = actions[-1][1] if actions else 0
+        flags = (FLAG_RIDDLE if mode == "riddle_time" else 0) | (FLAG_WIN if win else 0)
+        with self.lock:
+            word_id = self.word_ids.setdefault(word, len(self.word_ids))
+            self.records.append(RECORD_HEADER.pack(
+                RECORD_HEADER.size + len(packed), word_id, flags, difficulty,
+                min(hints, 255), min(power_ups, 255), int(started_at), max(0, min(duration_ms, 0xFFFFFFFF)),
+            ) + packed)
+            if self.first_buffered is None:
+                self.first_buffered = monotonic()
+                self.lock.notify()  # Start the flush timer
+            if len(self.records) >= self.segment_records:
+                self._write_segment()
+
+    def record_game(self, game, win):
+        """
+        Buffer the replay of a HangmanGame round that has just finished.
+        """
+        ended_ms = int((time() - game.start_time) * 1000) if game.start_time else None
+        self.add(game.current_word, game.mode, game.difficulty, win, game.start_time or time(), game.actions,
+                 duration_ms=ended_ms)
+
+    def _flush_loop(self):
+        with self.lock:
+            while not self.closed:
+                if self.first_buffered is None:
+                    self.lock.wait()
+                    continue
+                wait = self.first_buffered + self.flush_interval - monotonic()
+                if wait > 0:
+                    self.lock.wait(wait)
+                    continue
+                self._write_segment()
+
+    def _write_segment(self):
+        if not self.records:
+            return
+        words = sorted(self.word_ids, key=self.word_ids.get)
+        body = bytearray(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_VERSION))
+        offsets = []
+        for record in self.records:
+            offsets.append(len(body))
+            body.extend(record)
+
+        footer_offset = len(body)
+        for word in words:
+            encoded = word.encode("utf-8")
+            body.extend(struct.pack("<H", len(encoded)))
+            body.extend(encoded)
+        body.extend(struct.pack(f"<{len(offsets)}Q", *offsets))
+        body.extend(SEGMENT_TRAILER.pack(footer_offset, len(offsets), len(words), FOOTER_MAGIC))
+
+        name = f"replays-{int(time() * 1000):014d}-{os.getpid()}-{self.segments_written:06d}.seg"
+        path = os.path.join(self.directory, name)
+        try:
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(body)
+            os.replace(f"{path}.tmp", path)
+            self.segments_written += 1
+            self.replays_written += len(self.records)
+        except (IOError, OSError) as e:
+            print(f"Error writing replay segment: {e}")
+        self._reset_segment()
+
+    def flush(self):
+        """
+        Write every buffered replay to a segment, even if it is not full.
+        """
+        with self.lock:
+            self._write_segment()
+
+    def close(self):
+        """
+        Stop the flusher and write every buffered replay.
+        """
+        with self.lock:
+            self.closed = True
+            self.lock.notify_all()
+        self.flusher.join()
+        self.flush()
+
+
+class ReplaySegment:
+    """
+    Memory-mapped view of one segment file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mmap)
+        magic, version = SEGMENT_HEADER.unpack_from(self._mmap, 0)
+        footer_offset, self.count, word_count, footer_magic = SEGMENT_TRAILER.unpack_from(
+            self._mmap, size - SEGMENT_TRAILER.size
+        )
+        if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION or footer_magic != FOOTER_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a replay segment: {path}")
+
+        self.words = []
+        position = footer_offset
+        for _ in range(word_count):
+            (length,) = struct.unpack_from("<H", self._mmap, position)
+            self.words.append(self._mmap[position + 2:position + 2 + length].decode("utf-8"))
+            position += 2 + length
+        self._offsets_at = position
+
+    def offset(self, index):
+        return struct.unpack_from("<Q", self._mmap, self._offsets_at + 8 * index)[0]
+
+    def get(self, index, with_actions=True):
+        """
+        Decode one replay by its index in the segment.
+        """
+        return self._decode(self.offset(index), with_actions)
+
+    def _decode(self, offset, with_actions):
+        length, word_id, flags, difficulty, hints, power_ups, started_at, duration_ms = RECORD_HEADER.unpack_from(
+            self._mmap, offset
+        )
+        actions = None
+        if with_actions:
+            actions = decode_actions(self._mmap[offset + RECORD_HEADER.size:offset + length])
+        return Replay(
+            self.words[word_id], "riddle_time" if flags & FLAG_RIDDLE else "word_guess", difficulty,
+            bool(flags & FLAG_WIN), started_at, duration_ms, hints, power_ups, actions,
+        )
+
+    def __iter__(self):
+        return self.iter_replays()
+
+    def iter_replays(self, with_actions=True):
+        """
+        Yield every replay in file order. Records are contiguous, so this walks their length
+        prefixes instead of the offset index.
+        """
+        offset = SEGMENT_HEADER.size
+        for _ in range(self.count):
+            yield self._decode(offset, with_actions)
+            offset += struct.unpack_from("<H", self._mmap, offset)[0]
+
+    def close(self):
+        self._mmap.close()
+
+
+class ReplayReader:
+    """
+    Streams replays from every segment in a directory, one segment mapped at a time,
+    so scanning millions of rounds needs memory for one segment's word table only.
+    """
+
+    def __init__(self, directory=REPLAY_DIR):
+        self.directory = directory
+
+    def segment_paths(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".seg")
+        )
+
+    def iter_replays(self, with_actions=True):
+        """
+        Yield every stored replay, oldest segment first.
+        :param with_actions: Decode the guess sequence; skip it for faster summary scans.
+        """
+        for path in self.segment_paths():
+            try:
+                segment = ReplaySegment(path)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Error opening replay segment {path}: {e}")
+                continue
+            try:
+                yield from segment.iter_replays(with_actions)
+            finally:
+                segment.close()
+
+    def __iter__(self):
+        return self.iter_replays()
+
+    def count(self):
+        """
+        Count stored replays from the segment trailers alone.
+        """
+        total = 0
+        for path in self.segment_paths():
+            with open(path, "rb") as f:
+                f.seek(-SEGMENT_TRAILER.size, os.SEEK_END)
+                total += SEGMENT_TRAILER.unpack(f.read(SEGMENT_TRAILER.size))[1]
+        return total
+
+
+def summarize(replays):
+    """
+    Aggregate win rates, guess counts and the most often missed letters over a replay stream.
+    """
+    games = wins = guesses = hints = power_ups = 0
+    by_difficulty = Counter()
+    wins_by_difficulty = Counter()
+    misses = Counter()
+    for replay in replays:
+        games += 1
+        wins += replay.win
+        by_difficulty[replay.difficulty] += 1
+        wins_by_difficulty[replay.difficulty] += replay.win
+        hints += replay.hints_used
+        power_ups += replay.power_ups_used
+        letters = set(replay.word)
+        for action, _ in replay.actions:
+            if len(action) == 1:
+                guesses += 1
+                if action not in letters:
+                    misses[action] += 1
+    return {
+        "games": games,
+        "win_rate": wins / games if games else 0.0,
+        "guesses_per_game": guesses / games if games else 0.0,
+        "hints_per_game": hints / games if games else 0.0,
+        "power_ups_per_game": power_ups / games if games else 0.0,
+        "win_rate_by_difficulty": {
+            level: wins_by_difficulty[level] / count for level, count in sorted(by_difficulty.items())
+        },
+        "most_missed_letters": misses.most_common(5),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect stored Hangman replays.")
+    parser.add_argument("command", choices=["count", "stats"], help="Count replays or summarize them.")
+    parser.add_argument("--dir", default=REPLAY_DIR, help="Replay segment directory.")
+    args = parser.parse_args()
+
+    reader = ReplayReader(args.dir)
+    if args.command == "count":
+        print(f"Replays: {reader.count()} in {len(reader.segment_paths())} segments")
+        return
+    for key, value in summarize(reader).items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# research_crawler.py
+# Breadth-first research crawl over related words, fetched by a worker pool and checkpointed to disk.
+#
+# A checkpoint (data/crawls/<root>.json) holds the crawl settings, the frontier still to research,
+# the visited set and the elapsed time. It is written every RESEARCH_CHECKPOINT_INTERVAL seconds and
+# when the crawl is interrupted, and removed when the crawl finishes, so starting the same crawl again
+# resumes it.
+
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config import (
+    RESEARCH_CRAWL_DIR,
+    RESEARCH_CRAWL_WORKERS,
+    RESEARCH_CRAWL_MAX_NODES,
+    RESEARCH_CHECKPOINT_INTERVAL,
+)
+from content_manager import categorize_entry, append_word_to_file, save_topic_to_file
+from passage_index import tokenize
+
+
+def related_terms(research_results):
+    """
+    Words worth researching next: synonyms, antonyms, related topics and the words of the examples.
+    """
+    if not isinstance(research_results, dict):
+        return set()  # Memory entries stored by older versions may have another shape
+    terms = set()
+    for meaning in research_results.get("definitions", []):
+        if isinstance(meaning, dict):
+            terms.update(meaning.get("synonyms", []))
+            terms.update(meaning.get("antonyms", []))
+    terms.update(research_results.get("related_topics", []))
+    for example in research_results.get("examples", []):
+        if isinstance(example, str):
+            terms.update(tokenize(example))
+    return {term.lower() for term in terms if isinstance(term, str) and term.isalpha()}
+
+
+class ResearchCrawler:
+    """
+    Researches a word and its related words breadth first, up to max_depth levels and max_nodes terms.
+    Workers only fetch; results are stored by the crawling thread, so training data, memory and
+    word files see one writer. Requests are paced by the per-provider limits in content_manager,
+    not by sleeping between terms.
+    """
+
+    def __init__(self, ai_manager, max_depth=3, max_nodes=RESEARCH_CRAWL_MAX_NODES, workers=RESEARCH_CRAWL_WORKERS,
+                 directory=RESEARCH_CRAWL_DIR, checkpoint_interval=RESEARCH_CHECKPOINT_INTERVAL):
+        self.ai_manager = ai_manager
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.workers = workers
+        self.directory = directory
+        self.checkpoint_interval = checkpoint_interval
+        self.root = None
+        self.frontier = deque()  # (term, depth) still to research, in breadth-first order
+        self.visited = set()  # Terms researched or queued
+        self.nodes = 0  # Terms researched, including earlier runs of a resumed crawl
+        self.fetched = 0  # Terms fetched from the network in this run
+        self.elapsed = 0.0  # Seconds spent by earlier runs
+        self.root_data = None
+
+    def checkpoint_path(self, root):
+        slug = re.sub(r"[^a-z0-9]+", "_", root.lower()).strip("_") or "crawl"
+        return os.path.join(self.directory, f"{slug}.json")
+
+    def load_checkpoint(self, root):
+        """
+        Resume an unfinished crawl of the same root with the same settings.
+        :return: True if a checkpoint was loaded.
+        """
+        try:
+            with open(self.checkpoint_path(root), "r") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error reading crawl checkpoint for '{root}': {e}")
+            return False
+        if state.get("root") != root or state.get("max_depth") != self.max_depth:
+            return False
+        self.frontier = deque((term, depth) for term, depth in state["frontier"])
+        self.visited = set(state["visited"])
+        self.nodes = state["nodes"]
+        self.elapsed = state["elapsed"]
+        return True
+
+    def save_checkpoint(self, in_flight=()):
+        """
+        Write the crawl state atomically. Terms being fetched go back to the front of the frontier.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        state = {
+            "root": self.root,
+            "max_depth": self.max_depth,
+            "frontier": list(in_flight) + list(self.frontier),
+            "visited": sorted(self.visited),
+            "nodes": self.nodes,
+            "elapsed": self.elapsed,
+        }
+        path = self.checkpoint_path(self.root)
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, path)
+        except IOError as e:
+            print(f"Error saving crawl checkpoint: {e}")
+
+    def crawl(self, root, visited=None):
+        """
+        Research a word and the words related to it, resuming an interrupted crawl of the same word.
+        :param root: The word or concept to start from.
+        :param visited: Words not to research.
+        :return: Crawl statistics, including throughput in terms per second.
+        """
+        self.root = root
+        if not self.load_checkpoint(root):
+            self.frontier = deque([(root, 0)])
+            self.visited = set(visited or ()) | {root}
+        else:
+            print(f"Resuming research crawl of '{root}' with {len(self.frontier)} terms queued.")
+
+        started = time.monotonic()
+        last_checkpoint = started
+        in_flight = {}  # future -> (term, depth)
+        finished = False
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="research") as executor:
+                while self.frontier or in_flight:
+                    while (self.frontier and len(in_flight) < self.workers
+                           and self.nodes + len(in_flight) < self.max_nodes):
+                        term, depth = self.frontier.popleft()
+                        memory_data = self.ai_manager.retrieve_memory(term)
+                        if memory_data:
+                            self._record(term, depth, memory_data, from_memory=True)
+                            continue
+                        future = executor.submit(self.ai_manager.filter_and_reference_data, term)
+                        in_flight[future] = (term, depth)
+                    if not in_flight:
+                        break  # Node budget reached
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        term, depth = in_flight[future]
+                        try:
+                            research_results = future.result()
+                        except Exception as e:
+                            print(f"Error researching '{term}': {e}")
+                            research_results = {}
+                        del in_flight[future]  # Only once handled, so an interrupted term is checkpointed
+                        self.fetched += 1
+                        self._record(term, depth, research_results)
+                    if time.monotonic() - last_checkpoint >= self.checkpoint_interval:
+                        self.elapsed += time.monotonic() - started
+                        started = last_checkpoint = time.monotonic()
+                        self.save_checkpoint(in_flight.values())
+            finished = True
+        finally:
+            self.elapsed += time.monotonic() - started
+            if finished:
+                try:
+                    os.remove(self.checkpoint_path(root))
+                except FileNotFoundError:
+                    pass
+            else:
+                self.save_checkpoint(in_flight.values())
+                print(f"Research crawl of '{root}' interrupted; it will resume from its checkpoint.")
+
+        stats = self.get_stats()
+        print(f"Research crawl of '{root}' finished: {stats['nodes']} terms, "
+              f"{stats['terms_per_second']:.1f} terms/sec.")
+        return stats
+
+    def _record(self, term, depth, research_results, from_memory=False):
+        """
+        Store a researched term and queue its related words for the next level.
+        Terms found in memory are not stored again, but are still expanded from the remembered results,
+        so repeating a crawl over researched words reaches the words beyond them without refetching.
+        """
+        self.nodes += 1
+        if term == self.root:
+            self.root_data = research_results
+        if not from_memory:
+            self._store(term, depth, research_results)
+        if depth + 1 < self.max_depth:
+            for related in sorted(related_terms(research_results) - self.visited):
+                self.visited.add(related)
+                self.frontier.append((related, depth + 1))
+
+    def _store(self, term, depth, research_results):
+        print(f"Researched: {term} (Depth: {depth})")
+        training_data = self.ai_manager.training_data
+        training_data.setdefault("research_results", {})[term] = research_results
+        self.ai_manager.update_memory(term, research_results)
+
+        append_word_to_file(term, categorize_entry(term, research_results))
+        save_topic_to_file(term, {
+            "word": term,
+            "definitions": research_results.get("definitions", []),
+            "examples": research_results.get("examples", []),
+            "synonyms": research_results.get("synonyms", []),
+            "antonyms": research_results.get("antonyms", []),
+            "related_topics": research_results.get("related_topics", []),
+        })
+
+    def get_stats(self):
+        return {
+            "root": self.root,
+            "nodes": self.nodes,
+            "fetched": self.fetched,
+            "queued": len(self.frontier),
+            "visited": len(self.visited),
+            "elapsed": round(self.elapsed, 3),
+            "terms_per_second": self.nodes / self.elapsed if self.elapsed else 0.0,
+        }
@@ -0,0 +1,187 @@
+# simulate.py
+# Headless simulator: plays many games against the real word and riddle sets without
+# pygame, network access or transformer models, and reports throughput and latency.
+
+import argparse
+import random
+import string
+from time import perf_counter, perf_counter_ns
+
+from game_logic import GameContext, HangmanGame
+from replay_store import ReplayWriter
+from word_solver import AIGuesser
+
+ENGLISH_FREQUENCY_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+
+class RandomStrategy:
+    """
+    Guess unguessed letters uniformly at random.
+    """
+
+    def __init__(self, context, rng):
+        self.rng = rng
+
+    def next_guess(self, game):
+        remaining = [letter for letter in string.ascii_uppercase if letter not in game.guessed_letters]
+        return self.rng.choice(remaining) if remaining else None
+
+
+class FrequencyStrategy:
+    """
+    Guess letters in order of their frequency in English text.
+    """
+
+    def __init__(self, context, rng):
+        pass
+
+    def next_guess(self, game):
+        for letter in ENGLISH_FREQUENCY_ORDER:
+            if letter not in game.guessed_letters:
+                return letter
+        return None
+
+
+class SolverStrategy(AIGuesser):
+    """
+    Information-gain guesser over the pattern-indexed lexicon.
+    """
+
+    def __init__(self, context, rng):
+        super().__init__(context.get_lexicon_index())
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "frequency": FrequencyStrategy,
+    "solver": SolverStrategy,
+}
+
+
+class LatencyRecorder:
+    """
+    Keep a bounded reservoir sample of latencies so percentiles stay cheap for millions of calls.
+    """
+
+    def __init__(self, rng, max_samples=1_000_000):
+        self.rng = rng
+        self.max_samples = max_samples
+        self.samples = []
+        self.count = 0
+        self.total_ns = 0
+
+    def record(self, elapsed_ns):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if len(self.samples) < self.max_samples:
+            self.samples.append(elapsed_ns)
+        else:
+            index = self.rng.randrange(self.count)
+            if index < self.max_samples:
+                self.samples[index] = elapsed_ns
+
+    def summary(self):
+        if not self.samples:
+            return {"count": 0}
+        ordered = sorted(self.samples)
+
+        def percentile(p):
+            return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] / 1000
+
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1000,
+            "p50_us": percentile(50),
+            "p90_us": percentile(90),
+            "p99_us": percentile(99),
+            "max_us": ordered[-1] / 1000,
+        }
+
+
+def run_simulation(games, strategy_name="frequency", mode="word_guess", difficulty=1, seed=0, context=None):
+    """
+    Play a number of headless games and collect statistics.
+    :param games: The number of games to play.
+    :param strategy_name: A key of STRATEGIES.
+    :param mode: 'word_guess' or 'riddle_time'.
+    :param difficulty: The difficulty level.
+    :param seed: Seed for word selection and the strategy.
+    :param context: An existing GameContext; a headless one is built when omitted.
+    :return: A dictionary of results.
+    """
+    context = context or GameContext(headless=True)
+    game_rng = random.Random(seed)
+    strategy = STRATEGIES[strategy_name](context, random.Random(seed + 1))
+    guess_latency = LatencyRecorder(random.Random(seed + 2))
+    reset_latency = LatencyRecorder(random.Random(seed + 3))
+
+    game = HangmanGame(mode, difficulty, context=context, rng=game_rng)
+    wins = 0
+    total_guesses = 0
+
+    started = perf_counter()
+    for i in range(games):
+        if i:
+            t0 = perf_counter_ns()
+            game.reset_game()
+            reset_latency.record(perf_counter_ns() - t0)
+
+        while not game.check_win() and not game.check_lose():
+            letter = strategy.next_guess(game)
+            if letter is None:
+                break  # Every letter guessed; the word cannot be completed
+            t0 = perf_counter_ns()
+            game.guess_letter(letter)
+            guess_latency.record(perf_counter_ns() - t0)
+            total_guesses += 1
+
+        if game.check_win():
+            wins += 1
+    elapsed = perf_counter() - started
+
+    return {
+        "games": games,
+        "strategy": strategy_name,
+        "mode": mode,
+        "difficulty": difficulty,
+        "seed": seed,
+        "elapsed_s": elapsed,
+        "games_per_sec": games / elapsed if elapsed else 0.0,
+        "win_rate": wins / games if games else 0.0,
+        "guesses_per_game": total_guesses / games if games else 0.0,
+        "guess_letter": guess_latency.summary(),
+        "reset_game": reset_latency.summary(),
+    }
+
+
+def print_report(results):
+    print(f"Games: {results['games']} ({results['mode']}, difficulty {results['difficulty']}, "
+          f"strategy '{results['strategy']}', seed {results['seed']})")
+    print(f"Elapsed: {results['elapsed_s']:.2f}s  ({results['games_per_sec']:.0f} games/sec)")
+    print(f"Win rate: {results['win_rate']:.2%}  Guesses per game: {results['guesses_per_game']:.2f}")
+    for operation in ("guess_letter", "reset_game"):
+        stats = results[operation]
+        if stats["count"]:
+            print(f"{operation}: n={stats['count']} mean={stats['mean_us']:.2f}us "
+                  f"p50={stats['p50_us']:.2f}us p90={stats['p90_us']:.2f}us "
+                  f"p99={stats['p99_us']:.2f}us max={stats['max_us']:.2f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless Hangman games and report performance.")
+    parser.add_argument("--games", type=int, default=10000, help="Number of games to play.")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="frequency", help="Guessing strategy.")
+    parser.add_argument("--mode", choices=["word_guess", "riddle_time"], default="word_guess", help="Game mode.")
+    parser.add_argument("--difficulty", type=int, choices=[1, 2, 3], default=1, help="Difficulty level.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--replays", action="store_true", help="Store a binary replay of every game.")
+    args = parser.parse_args()
+
+    context = GameContext(headless=True, replays=ReplayWriter() if args.replays else None)
+    results = run_simulation(args.games, args.strategy, args.mode, args.difficulty, args.seed, context)
+    context.shutdown()
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -82,14 +82,15 @@ class TeachEnglish:
         Run a training drill for a list of words.
         """
         print("Starting training drill...")
-        threads = []
-        for word in words:
-            thread = Thread(target=self.fetch_and_save_word_data, args=(word,))
-            threads.append(thread)
-            thread.start()
-
-        for thread in threads:
-            thread.join()
+        with self.ai_manager.batched_saves():  # Commit the drill's training data once at the end
+            threads = []
+            for word in words:
+                thread = Thread(target=self.fetch_and_save_word_data, args=(word,))
+                threads.append(thread)
+                thread.start()
+
+            for thread in threads:
+                thread.join()
         print("Training drill completed.")
 
     def teach_word(self, word):
@@ -0,0 +1,54 @@
+# test_ai_manager.py
+
+from threading import Event, current_thread
+
+import pytest
+
+import ai_manager
+from ai_manager import AIManager
+
+
+class NoModels:
+    device = "cpu"
+
+    def get(self, name):
+        return None
+
+    def get_model(self, checkpoint, model_class=None):
+        return None
+
+    def get_tokenizer(self, checkpoint):
+        return None
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = AIManager(training_file=str(tmp_path / "training_data.json"),
+                        predefined_words_file=str(tmp_path / "predefined_words.json"),
+                        model_registry=NoModels(), inference_cache=object(),
+                        store_file=str(tmp_path / "training_data.db"))
+    yield manager
+    manager.training_data.close()
+
+
+def test_research_topic_queries_locally_and_syncs_in_the_background(manager, monkeypatch):
+    calls = []
+    synced = Event()
+
+    def sync_vector_index():
+        calls.append(("sync", current_thread().name))
+        synced.set()
+
+    def find_related_words(word, k=10, encode=True):
+        calls.append(("related", encode))
+        return ["nearby"]
+
+    monkeypatch.setattr(manager, "sync_vector_index", sync_vector_index)
+    monkeypatch.setattr(manager, "find_related_words", find_related_words)
+    monkeypatch.setattr(ai_manager, "fetch_word_definition", lambda word: calls.append(("fetch", word)))
+
+    assert manager.research_topic("orbit") == {"word": "orbit", "definitions": [], "related_words": ["nearby"]}
+    assert synced.wait(5)
+    assert calls.index(("related", False)) < calls.index(("fetch", "orbit"))
+    assert ("sync", current_thread().name) not in calls
+    assert ("sync", "vector-sync") in calls
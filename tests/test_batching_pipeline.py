@@ -0,0 +1,97 @@
+# test_batching_pipeline.py
+
+import pytest
+
+from batching_pipeline import BatchingPipeline
+
+
+class FakePipe:
+    """
+    Records each call; a list input returns one output per item, as transformers pipelines do.
+    """
+
+    def __init__(self, fail_batches=False):
+        self.calls = []
+        self.fail_batches = fail_batches
+
+    def __call__(self, inputs, **kwargs):
+        self.calls.append((inputs, kwargs))
+        if isinstance(inputs, list):
+            if self.fail_batches:
+                raise RuntimeError("out of memory")
+            return [{"generated_text": f"{text}!{kwargs.get('max_length')}"} for text in inputs]
+        return [{"generated_text": f"{inputs}!{kwargs.get('max_length')}"}]
+
+
+@pytest.fixture
+def pipe():
+    return FakePipe()
+
+
+def make_batcher(pipe, task="text-generation", max_batch_size=4):
+    return BatchingPipeline(pipe, task, max_batch_size=max_batch_size, max_wait_ms=200)
+
+
+def test_queued_calls_run_as_one_batch(pipe):
+    batcher = make_batcher(pipe)
+    futures = [batcher.submit(word, max_length=5) for word in ("a", "b", "c", "d")]
+    results = [future.result(timeout=5) for future in futures]
+    assert results == [{"generated_text": f"{word}!5"} for word in ("a", "b", "c", "d")]
+    assert pipe.calls == [(["a", "b", "c", "d"], {"batch_size": 4, "max_length": 5})]
+    assert batcher.get_stats() == {"batches": 1, "requests": 4, "mean_batch_size": 4.0}
+    batcher.close()
+
+
+def test_calls_with_different_parameters_are_not_mixed(pipe):
+    batcher = make_batcher(pipe)
+    futures = [batcher.submit("a", max_length=5), batcher.submit("b", max_length=9),
+               batcher.submit("c", max_length=5)]
+    results = [future.result(timeout=5) for future in futures]
+    assert results[1] == [{"generated_text": "b!9"}]  # Run alone, so shaped like a single call
+    batches = sorted(pipe.calls, key=str)
+    assert (["a", "c"], {"batch_size": 2, "max_length": 5}) in batches
+    assert ("b", {"max_length": 9}) in batches
+    batcher.close()
+
+
+def test_failed_batch_is_retried_one_call_at_a_time():
+    pipe = FakePipe(fail_batches=True)
+    batcher = make_batcher(pipe, max_batch_size=2)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    assert [future.result(timeout=5) for future in futures] == [
+        [{"generated_text": "a!None"}], [{"generated_text": "b!None"}]]
+    assert [call[0] for call in pipe.calls] == [["a", "b"], "a", "b"]
+    batcher.close()
+
+
+def test_unwrapped_tasks_match_single_call_shape(pipe):
+    batcher = make_batcher(pipe, task="text2text-generation", max_batch_size=2)
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    assert [future.result(timeout=5) for future in futures] == [
+        [{"generated_text": "a!None"}], [{"generated_text": "b!None"}]]
+    batcher.close()
+
+
+def test_question_answering_batches_question_context_pairs():
+    calls = []
+
+    def answer(inputs=None, batch_size=None, **kwargs):
+        calls.append(inputs)
+        return [{"answer": item["question"]} for item in inputs]
+
+    batcher = BatchingPipeline(answer, "question-answering", max_batch_size=2, max_wait_ms=200)
+    futures = [batcher.submit(question=q, context="ctx") for q in ("who", "what")]
+    assert [future.result(timeout=5) for future in futures] == [{"answer": "who"}, {"answer": "what"}]
+    assert calls == [[{"question": "who", "context": "ctx"}, {"question": "what", "context": "ctx"}]]
+    batcher.close()
+
+
+def test_unbatchable_and_closed_calls_run_directly(pipe):
+    batcher = make_batcher(pipe)
+    batcher(["x", "y"])
+    batcher("z", batch_size=1)
+    batcher.close()
+    batcher("w")
+    assert [call[0] for call in pipe.calls] == [["x", "y"], "z", "w"]
+    assert batcher.thread is None
+    assert batcher.get_stats()["batches"] == 0
@@ -0,0 +1,41 @@
+# test_content_manager.py
+
+import time
+from threading import Thread
+
+import requests
+
+import content_manager
+from content_manager import ProviderLimit, fetch_word_definition_online, has_api_key
+
+
+def test_rate_wait_does_not_hold_a_concurrency_slot():
+    limit = ProviderLimit(1, rate=2)
+    with limit:
+        pass  # Takes the first start slot; the next one is half a second away
+    waiter = Thread(target=lambda: limit.__enter__() and limit.__exit__())
+    waiter.start()
+    time.sleep(0.05)
+    # The waiter is sleeping for its start slot, so the only concurrency slot is still free
+    assert limit.semaphore.acquire(blocking=False)
+    limit.semaphore.release()
+    waiter.join()
+
+
+def test_placeholder_keys_are_not_used():
+    assert not has_api_key("YOUR_WORDNIK_API_KEY")
+    assert not has_api_key("")
+    assert not has_api_key("id", "YOUR_OXFORD_APP_KEY")
+    assert has_api_key("id", "secret")
+
+
+def test_providers_without_keys_are_skipped(monkeypatch):
+    urls = []
+
+    def failing_get(url, **kwargs):
+        urls.append(url)
+        raise requests.exceptions.ConnectionError("offline")
+
+    monkeypatch.setattr(content_manager.requests, "get", failing_get)
+    assert fetch_word_definition_online("apple") is None
+    assert [url.split("/")[2] for url in urls] == ["api.dictionaryapi.dev", "api.datamuse.com"]
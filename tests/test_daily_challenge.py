@@ -0,0 +1,89 @@
+# test_daily_challenge.py
+
+import json
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import daily_challenge
+from daily_challenge import DailyChallengeCalendar
+
+WORDS = {"animals": ["CAT", "DOG", "ELEPHANT", "TIGER"], "fruit": ["APPLE", "PEAR", "PLUM"], "empty": []}
+RIDDLES = {"easy": [("What has keys?", "PIANO"), ("What has hands?", "CLOCK")]}
+TODAY = date(2026, 3, 14)
+
+
+class FixedDate(date):
+
+    @classmethod
+    def today(cls):
+        return TODAY
+
+
+@pytest.fixture(autouse=True)
+def fixed_today(monkeypatch):
+    monkeypatch.setattr(daily_challenge, "date", FixedDate)
+
+
+def shuffled(categories, seed):
+    rng = random.Random(seed)
+    return {category: rng.sample(entries, len(entries)) for category, entries in categories.items()}
+
+
+def days(count, start=TODAY):
+    return [start + timedelta(days=offset) for offset in range(count)]
+
+
+def test_calendar_is_deterministic(tmp_path):
+    first = DailyChallengeCalendar(WORDS, RIDDLES, path=str(tmp_path / "a.json"), days=30)
+    # Another node with the same lexicon, loaded in a different order
+    second = DailyChallengeCalendar(shuffled(WORDS, 1), shuffled(RIDDLES, 2), path=str(tmp_path / "b.json"), days=30)
+    assert [first.get_word(day) for day in days(30)] == [second.get_word(day) for day in days(30)]
+    assert [first.get_riddle(day) for day in days(30)] == [second.get_riddle(day) for day in days(30)]
+    assert first.get_challenge("word_guess", TODAY) == first.pick(TODAY)[0]
+    assert first.get_challenge("ai_guesser", TODAY) is None
+    assert len({first.get_word(day) for day in days(30)}) > 1
+
+
+def test_calendar_is_cached_on_disk(tmp_path):
+    path = str(tmp_path / "calendar.json")
+    built = DailyChallengeCalendar(WORDS, RIDDLES, path=path, days=10)
+    words = [built.get_word(day) for day in days(10)]
+
+    loaded = DailyChallengeCalendar(WORDS, RIDDLES, path=path, days=10)
+    assert loaded.start == TODAY and not loaded.stale
+    assert [loaded.get_word(day) for day in days(10)] == words
+    assert loaded.get_riddle(TODAY) == built.get_riddle(TODAY)
+
+
+def test_out_of_range_day_extends_the_calendar(tmp_path):
+    calendar = DailyChallengeCalendar(WORDS, RIDDLES, path=str(tmp_path / "calendar.json"), days=5)
+    expected = calendar.pick(TODAY + timedelta(days=40))[0]
+    calendar.get_word(TODAY)
+    assert calendar.get_word(TODAY + timedelta(days=40)) == expected
+
+
+def test_changed_lexicon_keeps_published_days(tmp_path):
+    path = str(tmp_path / "calendar.json")
+    old = DailyChallengeCalendar(WORDS, RIDDLES, path=path, days=60)
+    old.get_word(TODAY - timedelta(days=3))  # Built from three days ago
+    published = [old.get_word(day) for day in days(4, TODAY - timedelta(days=3))]
+
+    learned = {**WORDS, "learned": [f"WORD{index}" for index in range(50)]}
+    new = DailyChallengeCalendar(learned, RIDDLES, path=path, days=60)
+    assert new.stale
+    assert published != [new.pick(day)[0] for day in days(4, TODAY - timedelta(days=3))]
+    assert [new.get_word(day) for day in days(4, TODAY - timedelta(days=3))] == published
+    future = days(59, TODAY + timedelta(days=1))
+    assert [new.get_word(day) for day in future] == [new.pick(day)[0] for day in future]
+
+    with open(path) as f:
+        assert json.load(f)["fingerprint"] == new.fingerprint
+    reloaded = DailyChallengeCalendar(learned, RIDDLES, path=path, days=60)
+    assert reloaded.get_word(TODAY) == published[-1]
+
+
+def test_empty_lexicon(tmp_path):
+    calendar = DailyChallengeCalendar({}, {}, path=str(tmp_path / "calendar.json"), days=3)
+    assert calendar.get_word(TODAY) is None and calendar.get_riddle(TODAY) is None
@@ -0,0 +1,123 @@
+# test_game_journal.py
+
+import json
+
+import pytest
+
+import game_logic
+from game_journal import GameJournal
+from game_logic import GameContext, HangmanGame
+
+WORDS = {"animals": ["ELEPHANT"]}
+
+
+@pytest.fixture
+def context(monkeypatch):
+    monkeypatch.setattr(game_logic, "WORD_DIFFICULTY_FILTER", False)
+    context = GameContext(words=WORDS, riddles={}, headless=True)
+    yield context
+    context.shutdown()
+
+
+def test_records_survive_reopen(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = GameJournal(path)
+    journal.record("s1", "start", state={"word": "CAT"})
+    journal.record("s1", "guess", letter="C")
+    journal.record("s2", "start", state={"word": "DOG"})
+    journal.record("s2", "end", win=True)
+    journal.close()
+
+    reopened = GameJournal(path)
+    assert reopened.get_live_sessions() == ["s1"]
+    state, events = reopened.get_session("s1")
+    assert state == {"word": "CAT"}
+    assert [(event["event"], event["letter"]) for event in events] == [("guess", "C")]
+    assert reopened.get_session("s2") is None
+    reopened.close()
+
+
+def test_torn_last_record_is_dropped(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = GameJournal(path)
+    journal.record("s1", "start", state={"word": "CAT"})
+    journal.record("s1", "guess", letter="A")
+    journal.close()
+    with open(path, "ab") as f:
+        f.write(b'{"session": "s1", "ev')
+
+    reopened = GameJournal(path)
+    assert len(reopened.get_session("s1")[1]) == 1
+    reopened.record("s1", "guess", letter="T")
+    reopened.close()
+
+    with open(path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record.get("letter") for record in records] == [None, "A", "T"]
+
+
+def test_compaction_keeps_live_sessions(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = GameJournal(path, max_bytes=1)
+    for index in range(5):
+        journal.record(f"done{index}", "start", state={})
+        journal.record(f"done{index}", "end", win=False)
+    journal.record("live", "start", state={"word": "CAT"})
+    journal.record("live", "guess", letter="C")
+    journal.flush()
+    journal.close()
+
+    with open(path, "r", encoding="utf-8") as f:
+        assert [json.loads(line)["session"] for line in f] == ["live", "live"]
+
+
+def test_game_resumes_after_crash(tmp_path, context):
+    path = str(tmp_path / "journal.jsonl")
+    context.journal = GameJournal(path)
+    game = HangmanGame(context=context, session_id="s1")
+    game.start_time -= 5  # Five seconds into the round
+    for letter in ("E", "Z", "P"):
+        game.guess_letter(letter)
+    context.journal.flush()
+    context.journal.close()  # The process dies here; the round never ends
+    with open(path, "ab") as f:
+        f.write(b'{"session": "s1", "ev')
+
+    context.journal = GameJournal(path)
+    resumed = HangmanGame.resume(context, "s1")
+    assert resumed is not None
+    assert resumed.current_word == game.current_word
+    assert resumed.guessed_letters == game.guessed_letters
+    assert resumed.attempts_left == game.attempts_left
+    assert resumed.hangman_stage == game.hangman_stage
+    assert game_logic.time() - resumed.start_time == pytest.approx(5, abs=1)
+    assert HangmanGame.resume(context, "unknown") is None
+
+
+def test_paused_round_resumes_paused(tmp_path, context):
+    path = str(tmp_path / "journal.jsonl")
+    context.journal = GameJournal(path)
+    game = HangmanGame(context=context, session_id="s1", player_id=None)
+    game.start_time -= 10
+    game.guess_letter("E")
+    game.pause_game()
+    time_left = game.get_time_left()
+    context.journal.close()
+
+    context.journal = GameJournal(path)
+    resumed = HangmanGame.resume(context, "s1")
+    assert resumed.is_paused
+    assert resumed.get_time_left() == time_left
+    resumed.resume_game()
+    assert not resumed.is_paused
+    assert resumed.get_time_left() == pytest.approx(time_left, abs=1)
+
+
+def test_snapshot_of_a_paused_round_keeps_its_clock(context):
+    game = HangmanGame(context=context)
+    game.start_time -= 50
+    game.pause_game()
+    game.pause_start_time -= 30  # Played for 20 seconds, then paused for 30
+    restored = HangmanGame(context=context, state=game.get_game_state())
+    assert restored.is_paused
+    assert restored.get_time_left() == game.get_time_left() == game.time_limit - 20
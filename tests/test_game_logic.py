@@ -0,0 +1,103 @@
+# test_game_logic.py
+
+import random
+
+import pytest
+
+import game_logic
+from game_logic import GameContext, HangmanGame
+from word_solver import AIGuesser
+
+WORDS = {"animals": ["ELEPHANT", "TIGER"], "default": ["PYTHON"]}
+RIDDLES = {"easy": [("What has keys but opens no locks?", "PIANO")]}
+
+
+@pytest.fixture
+def context(monkeypatch):
+    monkeypatch.setattr(game_logic, "WORD_DIFFICULTY_FILTER", False)
+    context = GameContext(words=WORDS, riddles=RIDDLES, headless=True)
+    yield context
+    context.shutdown()
+
+
+def test_games_share_the_context(context):
+    games = [HangmanGame(context=context, rng=random.Random(seed)) for seed in range(5)]
+    assert all(game.words is context.words and game.riddles is context.riddles for game in games)
+    assert all(game.achievements_manager is context.achievements_manager for game in games)
+    assert {game.current_word for game in games} <= {word for words in WORDS.values() for word in words}
+    riddle = HangmanGame("riddle_time", context=context)
+    assert riddle.current_word == "PIANO"
+
+
+def test_content_is_loaded_once(monkeypatch):
+    loads = []
+    monkeypatch.setattr(game_logic, "load_words", lambda offline=False: loads.append("words") or dict(WORDS))
+    monkeypatch.setattr(game_logic, "load_riddles", lambda offline=False: loads.append("riddles") or dict(RIDDLES))
+    monkeypatch.setattr(game_logic, "WORD_DIFFICULTY_FILTER", False)
+    context = GameContext(headless=True)
+    for _ in range(3):
+        HangmanGame(context=context)
+    context.shutdown()
+    assert loads == ["words", "riddles"]
+
+
+def test_seeded_games_are_reproducible(context):
+    first = [HangmanGame(context=context, rng=random.Random(7)).current_word for _ in range(3)]
+    second = [HangmanGame(context=context, rng=random.Random(7)).current_word for _ in range(3)]
+    assert first == second
+
+
+def test_restored_game_keeps_the_guess_order(context):
+    game = HangmanGame(context=context)
+    game.start_two_player("ELEPHANT")
+    for letter in ("Z", "E", "B", "Q", "A"):
+        game.guess_letter(letter)
+    assert game.get_incorrect_guesses() == ["Z", "B", "Q"]
+
+    restored = HangmanGame(context=context, state=game.get_game_state())
+    assert restored.get_incorrect_guesses() == ["Z", "B", "Q"]
+    assert restored.display_word == game.display_word
+    assert restored.guessed_letters == {"Z", "E", "B", "Q", "A"}
+    assert restored.hangman_stage == 3
+
+
+def test_win_is_detected_without_scanning_the_word(context):
+    game = HangmanGame(context=context)
+    game.start_two_player("TIGER")
+    assert not game.guess_letter("X")
+    assert not game.guess_letter("X")  # Repeated guesses cost nothing
+    assert game.attempts_left == 5
+    for letter in "TIGE":
+        game.guess_letter(letter)
+    assert game.unrevealed_count == 1 and not game.check_win()
+    game.guess_letter("R")
+    assert game.check_win()
+
+
+class Recorder:
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, *args, **kwargs):
+        self.records.append(args)
+
+    def record_game(self, game, win):
+        self.records.append((game.current_word, win))
+
+    def close(self):
+        pass
+
+
+def test_self_play_rounds_are_not_recorded(context):
+    context.journal, context.replays = Recorder(), Recorder()
+    self_play = context.get_self_play_context()
+    assert self_play is context.get_self_play_context()
+    assert self_play.words is context.words
+    assert self_play.get_lexicon_index() is context.get_lexicon_index()
+    assert self_play.ai_manager is None and self_play.journal is None and self_play.replays is None
+
+    game = HangmanGame(context=self_play, session_id="local")
+    AIGuesser(self_play.get_lexicon_index()).play(game)
+    assert game.check_win()
+    assert context.journal.records == [] and context.replays.records == []
@@ -0,0 +1,122 @@
+# test_game_server.py
+
+import asyncio
+import json
+
+import pytest
+
+import game_logic
+from game_logic import GameContext
+from game_server import GameServer, SessionError, SessionStore
+
+WORDS = {"animals": ["ELEPHANT"]}
+
+
+@pytest.fixture
+def context(monkeypatch):
+    monkeypatch.setattr(game_logic, "WORD_DIFFICULTY_FILTER", False)
+    context = GameContext(words=WORDS, riddles={"easy": [("What has keys?", "PIANO")]}, headless=True)
+    yield context
+    context.shutdown()
+
+
+@pytest.fixture
+def server(context):
+    return GameServer(context)
+
+
+def call(server, **request):
+    return json.loads(server.handle_line(json.dumps(request).encode()))
+
+
+def test_round_over_the_protocol(server):
+    created = call(server, op="new", difficulty=2, id=7)
+    assert created["ok"] and created["id"] == 7
+    session = created["session"]
+    assert created["state"]["display_word"] == "_ _ _ _ _ _ _ _"
+    assert "word" not in created["state"]
+
+    missed = call(server, op="guess", session=session, letter="z")
+    assert missed["ok"] and not missed["correct"]
+    assert missed["state"]["incorrect_guesses"] == ["Z"]
+    for letter in "ELPHANT":
+        response = call(server, op="guess", session=session, letter=letter)
+    assert response["state"]["won"] and response["state"]["word"] == "ELEPHANT"
+    assert call(server, op="guess", session=session, letter="Q")["correct"] is False
+
+    assert call(server, op="close", session=session) == {"ok": True}
+    assert not call(server, op="state", session=session)["ok"]
+
+
+def test_bad_requests_get_error_responses(server):
+    assert server.handle_line(b"not json\n").startswith(b'{"ok": false')
+    assert json.loads(server.handle_line(b"[]"))["error"] == "Request must be a JSON object"
+    assert not call(server, op="new", mode="chess")["ok"]
+    assert not call(server, op="new", difficulty=9)["ok"]
+    assert not call(server, op="new", player="x" * 1000)["ok"]
+    assert not call(server, op="state", session="missing")["ok"]
+    unknown = call(server, op="dance", session=call(server, op="new")["session"], id="x")
+    assert unknown == {"ok": False, "error": "Unknown op: dance", "id": "x"}
+
+
+def test_snapshots_stay_on_the_server(server):
+    session = call(server, op="new")["session"]
+    call(server, op="guess", session=session, letter="E")
+    snapshot = call(server, op="snapshot", session=session)["snapshot"]
+    assert isinstance(snapshot, str) and "ELEPHANT" not in snapshot
+
+    restored = call(server, op="restore", snapshot=snapshot)
+    assert restored["session"] != session
+    assert restored["state"]["display_word"] == "E _ E _ _ _ _ _"
+    assert not call(server, op="restore", snapshot={"current_word": "A", "mode": "word_guess"})["ok"]
+
+
+def test_idle_sessions_are_evicted_and_restored(context):
+    store = SessionStore(context, idle_timeout=0)
+    session = store.create()
+    session.game.guess_letter("E")
+    assert store.evict_idle() == 1
+    assert store.get_stats()["active_sessions"] == 0
+
+    restored = store.get(session.session_id)
+    assert restored.game is not session.game
+    assert restored.game.display_word == session.game.display_word
+    assert store.get_stats()["restored"] == 1
+    with pytest.raises(SessionError):
+        store.get("missing")
+
+
+def test_full_store_evicts_the_least_recently_used(context):
+    store = SessionStore(context, max_sessions=2, idle_timeout=3600)
+    first, second = store.create(), store.create()
+    store.get(first.session_id)  # Now the most recently used
+    store.create()
+    assert second.session_id in store.snapshots
+    assert first.session_id in store.sessions
+
+
+def test_snapshot_limit(context):
+    store = SessionStore(context, idle_timeout=0, snapshot_limit=2)
+    sessions = [store.create() for _ in range(3)]
+    store.evict_idle()
+    assert list(store.snapshots) == [session.session_id for session in sessions[1:]]
+
+
+def test_server_over_tcp(context):
+    async def scenario():
+        server = GameServer(context, port=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            writer.write(b'{"op": "new", "id": 1}\n' + b"x" * (2 << 20) + b"\n" + b'{"op": "stats", "id": 2}\n')
+            await writer.drain()
+            responses = [json.loads(await reader.readline()) for _ in range(3)]
+            writer.close()
+            return responses
+        finally:
+            await server.stop()
+
+    created, too_long, stats = asyncio.run(scenario())
+    assert created["ok"] and created["id"] == 1
+    assert too_long == {"ok": False, "error": "Request line too long"}
+    assert stats["stats"]["created"] == 1 and stats["id"] == 2
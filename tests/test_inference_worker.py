@@ -0,0 +1,85 @@
+# test_inference_worker.py
+
+import os
+import sys
+from threading import Thread
+from time import sleep
+
+import pytest
+
+import inference_worker
+from inference_worker import InferenceError, InferenceWorker, RemoteModelRegistry, get_worker_address
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="tests use a Unix socket")
+
+
+class FakeRegistry:
+    device = "cpu"
+
+    def get(self, name):
+        return (lambda text: [text.upper()]) if name == "echo" else None
+
+    def get_tokenizer(self, checkpoint):
+        return None
+
+    def get_stats(self):
+        return {"loaded": {}}
+
+
+@pytest.fixture
+def address(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference_worker, "get_worker_authkey", lambda: b"worker key")
+    address = str(tmp_path / "inference.sock")
+    worker = InferenceWorker(address=address, registry=FakeRegistry(), idle_exit=0)
+    Thread(target=worker.serve_forever, daemon=True).start()
+    for _ in range(100):
+        if os.path.exists(address):
+            break
+        sleep(0.02)
+    return address
+
+
+def test_requests_round_trip_with_the_shared_key(address):
+    registry = RemoteModelRegistry(address=address, spawn=False)
+    try:
+        assert registry.device == "cpu"
+        assert registry.get("echo")("hello") == ["HELLO"]
+        assert registry.get_stats()["requests"] >= 2
+    finally:
+        registry.close()
+
+
+def test_wrong_key_is_an_inference_error(address, monkeypatch):
+    monkeypatch.setattr(inference_worker, "get_worker_authkey", lambda: b"someone else")
+    registry = RemoteModelRegistry(address=address, spawn=False)
+    with pytest.raises(InferenceError):
+        registry.call("device")
+
+
+def test_missing_worker_is_an_inference_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(inference_worker, "get_worker_authkey", lambda: b"worker key")
+    registry = RemoteModelRegistry(address=str(tmp_path / "none.sock"), spawn=False)
+    with pytest.raises(InferenceError):
+        registry.call("device")
+
+
+def test_unavailable_pipeline_is_skipped_until_retry(address, monkeypatch):
+    registry = RemoteModelRegistry(address=address, spawn=False)
+    try:
+        with pytest.raises(InferenceError):
+            registry.get("missing")("text")
+        assert registry.get("missing") is None
+        monkeypatch.setattr(inference_worker, "monotonic", lambda: registry.failed["missing"] + 1)
+        assert registry.get("missing") is not None
+    finally:
+        registry.close()
+
+
+def test_windows_pipe_name_depends_on_the_key(monkeypatch):
+    monkeypatch.setattr(inference_worker.sys, "platform", "win32")
+    monkeypatch.setattr(inference_worker, "get_worker_authkey", lambda: b"first key")
+    first = get_worker_address()
+    monkeypatch.setattr(inference_worker, "get_worker_authkey", lambda: b"second key")
+    second = get_worker_address()
+    assert first.startswith(r"\\.\pipe\hangman-inference-")
+    assert first != second
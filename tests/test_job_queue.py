@@ -0,0 +1,91 @@
+# test_job_queue.py
+
+from threading import Event, Timer
+
+import pytest
+
+from job_queue import BackgroundJobQueue, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+
+
+@pytest.fixture
+def queue():
+    queue = BackgroundJobQueue(name="test-jobs")
+    yield queue
+    queue.shutdown(timeout=5)
+
+
+def block(queue):
+    """
+    Occupy the single worker until the returned event is set, so later jobs stay queued.
+    """
+    started, release = Event(), Event()
+    queue.submit(lambda: started.set() or release.wait(5), priority=PRIORITY_HIGH)
+    assert started.wait(5)
+    return release
+
+
+def test_jobs_run_in_priority_order(queue):
+    ran = []
+    release = block(queue)
+    queue.submit(ran.append, "low", priority=PRIORITY_LOW)
+    queue.submit(ran.append, "normal", priority=PRIORITY_NORMAL)
+    queue.submit(ran.append, "high", priority=PRIORITY_HIGH)
+    queue.submit(ran.append, "normal 2", priority=PRIORITY_NORMAL)
+    release.set()
+    assert queue.wait_until_idle(5)
+    assert ran == ["high", "normal", "normal 2", "low"]
+
+
+def test_keyed_jobs_are_coalesced(queue):
+    ran = []
+    release = block(queue)
+    for value in range(5):
+        queue.submit(ran.append, value, priority=PRIORITY_LOW, key="save")
+    queue.submit(ran.append, "other", priority=PRIORITY_LOW)
+    release.set()
+    assert queue.wait_until_idle(5)
+    assert ran == [4, "other"]
+    assert queue.get_stats()["coalesced"] == 4
+
+
+def test_coalesced_job_keeps_the_higher_priority(queue):
+    ran = []
+    release = block(queue)
+    queue.submit(ran.append, "normal", priority=PRIORITY_NORMAL)
+    queue.submit(ran.append, "first", priority=PRIORITY_LOW, key="save")
+    queue.submit(ran.append, "urgent", priority=PRIORITY_HIGH, key="save")
+    queue.submit(ran.append, "late", priority=PRIORITY_LOW, key="save")
+    release.set()
+    assert queue.wait_until_idle(5)
+    assert ran == ["late", "normal"]
+
+
+def test_key_can_be_queued_again_once_it_runs(queue):
+    ran = []
+    queue.submit(ran.append, 1, key="save")
+    assert queue.wait_until_idle(5)
+    queue.submit(ran.append, 2, key="save")
+    assert queue.wait_until_idle(5)
+    assert ran == [1, 2]
+
+
+def test_failed_jobs_do_not_stop_the_worker(queue):
+    ran = []
+    queue.submit(lambda: 1 / 0)
+    queue.submit(ran.append, "after")
+    assert queue.wait_until_idle(5)
+    assert ran == ["after"]
+    assert queue.get_stats()["failed"] == 1
+
+
+def test_shutdown_can_drop_low_priority_jobs():
+    queue = BackgroundJobQueue(name="test-jobs")
+    ran = []
+    release = block(queue)
+    for value in range(3):
+        queue.submit(ran.append, f"low {value}", priority=PRIORITY_LOW)
+    queue.submit(ran.append, "normal", priority=PRIORITY_NORMAL)
+    Timer(0.2, release.set).start()  # Let the blocked worker go only once shutdown has dropped the jobs
+    assert queue.shutdown(timeout=5, drop_priority=PRIORITY_LOW) == 3
+    assert ran == ["normal"]
+    assert not queue.submit(ran.append, "closed")
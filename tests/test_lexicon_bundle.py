@@ -0,0 +1,76 @@
+# test_lexicon_bundle.py
+
+import os
+
+import pytest
+
+import lexicon_bundle
+from lexicon_bundle import LexiconBundle, compute_source_signature, open_lexicon_bundle, write_lexicon_bundle
+
+WORDS = {"animals": ["CAT", "DOG", "ÉLAN"], "default": ["PYTHON", "GAME", "HANGMAN"], "empty": []}
+RIDDLES = {
+    "easy": [("What has keys but opens no locks?", "PIANO"), ("What has hands but cannot clap?", "CLOCK")],
+    "hard": [("What runs but never walks?", "CLOCK")],
+}
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("animals,cat\n")
+    return str(path)
+
+
+@pytest.fixture
+def bundle_path(tmp_path, source):
+    path = str(tmp_path / "lexicon.bin")
+    write_lexicon_bundle(path, WORDS, RIDDLES, compute_source_signature([source]))
+    yield path
+    for bundle in lexicon_bundle._bundle_cache.values():
+        bundle.close()
+    lexicon_bundle._bundle_cache.clear()
+
+
+def test_bundle_round_trips(bundle_path):
+    bundle = LexiconBundle(bundle_path)
+    words = bundle.get_word_categories(shuffle=False)
+    assert {category: list(words[category]) for category in words} == WORDS
+    riddles = bundle.get_riddle_categories()
+    assert {category: riddles[category] for category in riddles} == RIDDLES
+    assert bundle.get_all_words() == [word for category in WORDS.values() for word in category]
+    assert sorted(bundle.find_riddles("CLOCK")) == ["What has hands but cannot clap?", "What runs but never walks?"]
+    assert bundle.find_riddles("DOG") == []
+    bundle.close()
+
+
+def test_shuffled_categories_keep_their_words(bundle_path):
+    bundle = LexiconBundle(bundle_path)
+    words = bundle.get_word_categories()
+    assert sorted(words["animals"]) == sorted(WORDS["animals"])
+    words["learned"] = ["NEW"]
+    assert "learned" in words and len(words) == len(WORDS) + 1
+    bundle.close()
+
+
+def test_changed_source_makes_bundle_stale(bundle_path, source):
+    signature = compute_source_signature([source])
+    bundle = open_lexicon_bundle(signature, bundle_path)
+    assert bundle is not None
+    assert open_lexicon_bundle(signature, bundle_path) is bundle
+    words = bundle.get_word_categories(shuffle=False)
+
+    with open(source, "a") as f:
+        f.write("animals,dog\n")
+    os.utime(source, ns=(0, 0))
+    assert open_lexicon_bundle(compute_source_signature([source]), bundle_path) is None
+    assert bundle_path not in lexicon_bundle._bundle_cache
+    # The stale bundle was closed, but mappings handed out from it still work
+    assert list(words["animals"]) == WORDS["animals"]
+    assert list(words) == list(WORDS)
+
+
+def test_missing_source_is_part_of_signature(tmp_path, source):
+    missing = str(tmp_path / "topics.json")
+    before = compute_source_signature([source, missing])
+    open(missing, "w").close()
+    assert compute_source_signature([source, missing]) != before
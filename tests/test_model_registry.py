@@ -0,0 +1,115 @@
+# test_model_registry.py
+
+import sys
+import types
+
+import pytest
+
+import model_registry
+from model_registry import ModelRegistry
+
+
+class FakeModel:
+    def to(self, device):
+        return self
+
+    def eval(self):
+        pass
+
+    def parameters(self):
+        return []
+
+    def buffers(self):
+        return []
+
+
+class FakeTokenizer:
+    pad_token = "<pad>"
+    eos_token = "</s>"
+
+
+class Loader:
+    """
+    from_pretrained stand-in that fails while `failing` is set and counts its calls.
+    """
+
+    def __init__(self, result):
+        self.result = result
+        self.failing = False
+        self.calls = 0
+
+    def from_pretrained(self, checkpoint):
+        self.calls += 1
+        if self.failing:
+            raise OSError(f"cannot download {checkpoint}")
+        return self.result()
+
+
+@pytest.fixture
+def transformers(monkeypatch):
+    fake = types.ModuleType("transformers")
+    fake.AutoModel = Loader(FakeModel)
+    fake.AutoTokenizer = Loader(FakeTokenizer)
+    fake.pipeline = lambda task, model, tokenizer, device: lambda *args, **kwargs: [task]
+    monkeypatch.setitem(sys.modules, "transformers", fake)
+    return fake
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(model_registry, "monotonic", lambda: clock.now)
+    return clock
+
+
+def make_registry(**kwargs):
+    return ModelRegistry(specs={"encoder": ("feature-extraction", "tiny")}, idle_timeout=0, device="cpu",
+                         retry_backoff=60, max_retry_backoff=200, **kwargs)
+
+
+def test_failed_load_is_retried_after_backoff(transformers, clock):
+    registry = make_registry()
+    transformers.AutoModel.failing = True
+    assert registry.get("encoder") is None
+    assert registry.get("encoder") is None
+    assert transformers.AutoModel.calls == 1  # Backing off, not retried yet
+
+    clock.now += 61
+    transformers.AutoModel.failing = False
+    assert registry.get("encoder") is not None
+    assert transformers.AutoModel.calls == 2
+    assert registry.get_stats()["failed"] == []
+
+
+def test_backoff_doubles_up_to_the_limit(transformers, clock):
+    registry = make_registry()
+    transformers.AutoModel.failing = True
+    delays = []
+    for _ in range(4):
+        registry.get("encoder")
+        retry_at = registry.failed[("AutoModel", "tiny")][1]
+        delays.append(retry_at - clock.now)
+        clock.now = retry_at
+    assert delays == [60, 120, 200, 200]
+    assert transformers.AutoModel.calls == 4
+
+
+def test_missing_tokenizer_is_reported_unavailable(transformers, clock):
+    registry = make_registry()
+    transformers.AutoTokenizer.failing = True
+    assert registry.get_tokenizer("tiny") is None
+    assert registry.get("encoder") is None  # No AttributeError on the missing tokenizer
+    assert "tokenizer" in registry.failed[("AutoModel", "tiny")][0]
+
+    clock.now += 61
+    transformers.AutoTokenizer.failing = False
+    assert registry.get("encoder")("text") == ["feature-extraction"]
+
+
+def test_unconfigured_checkpoint_is_unavailable(transformers, clock):
+    registry = ModelRegistry(specs={"encoder": ("feature-extraction", None)}, idle_timeout=0, device="cpu")
+    assert registry.get("encoder") is None
+    assert registry.get_tokenizer(None) is None
+    assert transformers.AutoModel.calls == 0
+    assert transformers.AutoTokenizer.calls == 0
+    assert registry.get_stats()["failed"] == ["None", "None"]
@@ -0,0 +1,92 @@
+# test_passage_index.py
+
+import pytest
+
+from passage_index import PassageIndex, tokenize
+from training_store import TrainingStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TrainingStore(str(tmp_path / "training_data.db"))
+    yield store
+    store.close()
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("What is the Capital of France?") == ["capital", "france"]
+
+
+def test_bm25_ranks_rare_and_repeated_terms_first():
+    index = PassageIndex(top_k=3)
+    index.add("apple: a round fruit of the apple tree")
+    index.add("banana: a long yellow fruit")
+    index.add("cherry: a small red fruit")
+    index.add("orchard: land planted with fruit trees")
+    assert index.search("apple fruit")[0].startswith("apple")
+    assert index.search("yellow", k=1) == ["banana: a long yellow fruit"]
+    assert index.search("zebra") == []
+
+
+def test_shorter_passages_win_ties():
+    index = PassageIndex()
+    index.add("lemon: sour citrus")
+    index.add("lime: sour green citrus fruit grown in warm countries around the world")
+    assert index.search("sour citrus")[0] == "lemon: sour citrus"
+
+
+def test_identical_passages_are_indexed_once():
+    index = PassageIndex()
+    assert index.add("kiwi: fuzzy fruit")
+    assert not index.add("kiwi: fuzzy fruit")
+    assert index.get_stats()["passages"] == 1
+
+
+def test_sync_indexes_only_new_list_items():
+    index = PassageIndex()
+    data = {"definitions": [{"word": "fig", "definitions": [{"definition": "a soft sweet fruit"}]}],
+            "research": [{"word": "date", "results": ["fruit of the date palm"]}]}
+    assert index.sync(data) == 2
+    assert index.sync(data) == 0
+    data["research"].append({"word": "plum", "results": ["a purple stone fruit"]})
+    assert index.sync(data) == 1
+    assert index.search("purple", k=1) == ["plum: a purple stone fruit"]
+
+
+def test_store_updates_replace_old_passages(store):
+    index = PassageIndex()
+    store["research_results"] = {"quasar": {"definition": "a distant radio source"}}
+    assert index.sync(store) == 1
+    assert index.sync(store) == 0
+
+    store["research_results"]["quasar"] = {"definition": "an extremely luminous galactic nucleus"}
+    assert index.sync(store) == 1
+    assert index.search("luminous", k=1) == ["quasar: an extremely luminous galactic nucleus"]
+    assert index.search("radio") == []
+    assert index.get_stats()["passages"] == 1
+
+
+def test_store_deletes_and_replaced_sections_are_followed(store):
+    index = PassageIndex()
+    store["dynamic_memory"] = {"nebula": {"definition": "a cloud of gas"}, "comet": {"definition": "an icy body"}}
+    index.sync(store)
+    del store["dynamic_memory"]["comet"]
+    index.sync(store)
+    assert index.search("icy") == []
+
+    store["dynamic_memory"] = {"pulsar": {"definition": "a rotating neutron star"}}
+    index.sync(store)
+    assert index.search("gas") == []
+    assert index.search("neutron", k=1) == ["pulsar: a rotating neutron star"]
+
+
+def test_store_sync_visits_only_changed_keys(store, monkeypatch):
+    index = PassageIndex()
+    store["research_results"] = {f"word{i}": {"definition": f"meaning {i}"} for i in range(50)}
+    index.sync(store)
+    store["research_results"]["word7"] = {"definition": "changed meaning"}
+    visited = []
+    reindex = index._reindex
+    monkeypatch.setattr(index, "_reindex", lambda key, word, entry: visited.append(word) or reindex(key, word, entry))
+    index.sync(store)
+    assert visited == ["word7"]
@@ -0,0 +1,115 @@
+# test_replay_store.py
+
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from replay_store import ReplayReader, ReplaySegment, ReplayWriter, decode_actions, encode_actions, summarize
+
+ACTIONS = [
+    ("E", 0),
+    ("hint", 127),
+    ("Z", 128),
+    ("reveal_letter", 5000),
+    ("Ä", 5000),
+    ("extra_attempt", 70000),
+    ("ß", 2 ** 31),
+]
+
+
+def test_actions_round_trip():
+    assert decode_actions(encode_actions(ACTIONS)) == ACTIONS
+    assert decode_actions(encode_actions([])) == []
+
+
+def test_every_letter_takes_two_bytes():
+    actions = [(chr(65 + index), index) for index in range(26)]
+    data = encode_actions(actions)
+    assert len(data) == 52
+    assert decode_actions(data) == actions
+
+
+def test_segments_round_trip(tmp_path):
+    directory = str(tmp_path / "replays")
+    writer = ReplayWriter(directory, segment_records=3)
+    rounds = [
+        ("ELEPHANT", "word_guess", 1, True, 1700000000 + index, ACTIONS[:index + 1])
+        for index in range(len(ACTIONS))
+    ]
+    rounds.append(("WHAT HAS KEYS", "riddle_time", 3, False, 1700000100, []))
+    for replay in rounds:
+        writer.add(*replay)
+    writer.close()
+
+    reader = ReplayReader(directory)
+    assert len(reader.segment_paths()) == 3
+    assert reader.count() == len(rounds)
+    replays = list(reader.iter_replays())
+    assert [
+        (replay.word, replay.mode, replay.difficulty, replay.win, replay.started_at, replay.actions)
+        for replay in replays
+    ] == [replay[:5] + (replay[5],) for replay in rounds]
+    assert replays[-1].duration_ms == 0
+    assert replays[3].duration_ms == 5000
+    assert replays[3].hints_used == 1 and replays[3].power_ups_used == 1
+    assert all(replay.actions is None for replay in reader.iter_replays(with_actions=False))
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
+
+
+def test_segment_random_access(tmp_path):
+    directory = str(tmp_path / "replays")
+    writer = ReplayWriter(directory)
+    for index in range(10):
+        writer.add(f"WORD{index % 3}", "word_guess", 2, index % 2 == 0, index, [("A", index)])
+    writer.close()
+
+    segment = ReplaySegment(ReplayReader(directory).segment_paths()[0])
+    try:
+        assert segment.count == 10
+        assert sorted(segment.words) == ["WORD0", "WORD1", "WORD2"]
+        for index in (9, 0, 4):
+            replay = segment.get(index)
+            assert (replay.word, replay.win, replay.actions) == (f"WORD{index % 3}", index % 2 == 0, [("A", index)])
+    finally:
+        segment.close()
+
+
+def test_summarize(tmp_path):
+    directory = str(tmp_path / "replays")
+    writer = ReplayWriter(directory)
+    writer.add("CAT", "word_guess", 1, True, 0, [("C", 1), ("X", 2), ("A", 3), ("T", 4)])
+    writer.add("DOG", "word_guess", 2, False, 0, [("X", 1), ("hint", 2)])
+    writer.close()
+
+    stats = summarize(ReplayReader(directory))
+    assert stats["games"] == 2
+    assert stats["win_rate"] == 0.5
+    assert stats["guesses_per_game"] == 2.5
+    assert stats["win_rate_by_difficulty"] == {1: 1.0, 2: 0.0}
+    assert stats["most_missed_letters"] == [("X", 2)]
+
+
+def test_buffered_replays_are_written_after_the_flush_interval(tmp_path):
+    directory = str(tmp_path / "replays")
+    writer = ReplayWriter(directory, flush_interval=0.1)
+    writer.add("CAT", "word_guess", 1, True, 0, [("C", 10)])
+    deadline = time.monotonic() + 5
+    while not writer.segments_written and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert ReplayReader(directory).count() == 1  # Written without a flush or close
+    writer.close()
+    assert ReplayReader(directory).count() == 1
+
+
+def test_recorded_game_lasts_until_the_round_ended(tmp_path):
+    directory = str(tmp_path / "replays")
+    writer = ReplayWriter(directory)
+    game = SimpleNamespace(current_word="CAT", mode="word_guess", difficulty=1, start_time=time.time() - 12,
+                           actions=[("C", 1000), ("A", 2000)])
+    writer.record_game(game, win=False)
+    writer.close()
+    (replay,) = ReplayReader(directory)
+    assert replay.duration_ms == pytest.approx(12000, abs=1000)
+    assert replay.actions == game.actions
@@ -0,0 +1,116 @@
+# test_research_crawler.py
+
+import os
+
+import pytest
+
+import research_crawler
+from research_crawler import ResearchCrawler, related_terms
+
+GRAPH = {
+    "sun": ["star", "light"],
+    "star": ["nova"],
+    "light": ["photon"],
+    "nova": ["remnant"],
+    "photon": [],
+}
+
+
+class FakeManager:
+    """
+    Looks terms up in GRAPH instead of the network, and remembers what it researched.
+    """
+
+    def __init__(self, fail_on=None):
+        self.training_data = {}
+        self.memory = {}
+        self.fetches = []
+        self.fail_on = fail_on
+
+    def retrieve_memory(self, term):
+        return self.memory.get(term)
+
+    def update_memory(self, term, data):
+        self.memory[term] = data
+
+    def filter_and_reference_data(self, term):
+        if term == self.fail_on:
+            self.fail_on = None
+            raise KeyboardInterrupt
+        self.fetches.append(term)
+        return {"word": term, "related_topics": GRAPH.get(term, [])}
+
+
+@pytest.fixture(autouse=True)
+def no_word_files(monkeypatch):
+    monkeypatch.setattr(research_crawler, "append_word_to_file", lambda word, category: None)
+    monkeypatch.setattr(research_crawler, "save_topic_to_file", lambda word, data: None)
+    monkeypatch.setattr(research_crawler, "categorize_entry", lambda word, data: "general")
+
+
+def make_crawler(manager, tmp_path, **kwargs):
+    return ResearchCrawler(manager, max_depth=3, workers=1, directory=str(tmp_path / "crawls"), **kwargs)
+
+
+def test_related_terms_tolerate_other_shapes():
+    assert related_terms({"definitions": [{"synonyms": ["Glow"]}, "plain"], "examples": ["a bright sun", 3]}) == \
+        {"glow", "bright", "sun"}
+    assert related_terms(["not", "a", "dict"]) == set()
+
+
+def test_crawl_is_breadth_first_up_to_max_depth(tmp_path):
+    manager = FakeManager()
+    stats = make_crawler(manager, tmp_path).crawl("sun")
+    assert manager.fetches == ["sun", "light", "star", "photon", "nova"]
+    assert "remnant" not in manager.training_data["research_results"]
+    assert stats["nodes"] == stats["fetched"] == 5
+    assert not os.path.exists(tmp_path / "crawls" / "sun.json")
+
+
+def test_node_budget_stops_the_crawl(tmp_path):
+    manager = FakeManager()
+    assert make_crawler(manager, tmp_path, max_nodes=2).crawl("sun")["nodes"] == 2
+    assert manager.fetches == ["sun", "light"]
+
+
+def test_memory_hits_are_expanded_without_refetching(tmp_path):
+    manager = FakeManager()
+    manager.memory["sun"] = {"related_topics": ["star", "light"]}
+    stats = make_crawler(manager, tmp_path).crawl("sun")
+    assert "sun" not in manager.fetches
+    assert manager.fetches == ["light", "star", "photon", "nova"]
+    assert stats["nodes"] == 5
+
+
+def test_repeated_crawl_reaches_terms_beyond_remembered_ones(tmp_path):
+    manager = FakeManager()
+    make_crawler(manager, tmp_path).crawl("sun")
+    manager.fetches.clear()
+    stats = make_crawler(manager, tmp_path, max_nodes=100).crawl("sun")
+    assert manager.fetches == []  # Everything within depth is remembered
+    assert stats["nodes"] == 5
+
+    del manager.memory["photon"]  # Evicted from memory since the last crawl
+    make_crawler(manager, tmp_path).crawl("sun")
+    assert manager.fetches == ["photon"]
+
+
+def test_interrupted_crawl_resumes_from_its_checkpoint(tmp_path):
+    manager = FakeManager(fail_on="nova")
+    with pytest.raises(KeyboardInterrupt):
+        make_crawler(manager, tmp_path).crawl("sun")
+    assert os.path.exists(tmp_path / "crawls" / "sun.json")
+    assert manager.fetches == ["sun", "light", "star", "photon"]
+
+    stats = make_crawler(manager, tmp_path).crawl("sun")
+    assert manager.fetches == ["sun", "light", "star", "photon", "nova"]
+    assert stats["nodes"] == 5 and stats["fetched"] == 1
+    assert not os.path.exists(tmp_path / "crawls" / "sun.json")
+
+
+def test_checkpoint_of_other_settings_is_ignored(tmp_path):
+    manager = FakeManager(fail_on="nova")
+    with pytest.raises(KeyboardInterrupt):
+        make_crawler(manager, tmp_path).crawl("sun")
+    crawler = ResearchCrawler(manager, max_depth=2, workers=1, directory=str(tmp_path / "crawls"))
+    assert not crawler.load_checkpoint("sun")
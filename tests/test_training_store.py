@@ -0,0 +1,108 @@
+# test_training_store.py
+
+import json
+
+import pytest
+
+from training_store import TrainingStore
+
+TRAINING_DATA = {
+    "definitions": [{"word": "apple", "definition": "A fruit."}, "plain entry", 42],
+    "filtered_data": {"apple": {"definitions": ["A fruit."], "score": 0.5}, "bear": None},
+    "dynamic_memory": {},
+    "history": [],
+    "version": 3,
+    "name": "training",
+}
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    path = tmp_path / "training_data.json"
+    path.write_text(json.dumps(TRAINING_DATA))
+    return str(path)
+
+
+def test_migration_round_trips(tmp_path, json_path):
+    db_path = str(tmp_path / "training.db")
+    store = TrainingStore(db_path, migrate_from=json_path)
+    assert store.to_dict() == TRAINING_DATA
+    store.close()
+
+    reopened = TrainingStore(db_path, migrate_from=json_path)
+    assert reopened.to_dict() == TRAINING_DATA
+    reopened.close()
+
+
+def test_migration_runs_only_once(tmp_path, json_path):
+    db_path = str(tmp_path / "training.db")
+    store = TrainingStore(db_path, migrate_from=json_path)
+    store["definitions"].append("added later")
+    store.close()
+
+    with open(json_path, "w") as f:
+        json.dump({"definitions": []}, f)
+    reopened = TrainingStore(db_path, migrate_from=json_path)
+    assert reopened["definitions"][-1] == "added later"
+    assert len(reopened["definitions"]) == len(TRAINING_DATA["definitions"]) + 1
+    reopened.close()
+
+
+def test_views_persist_after_reopen(tmp_path):
+    db_path = str(tmp_path / "training.db")
+    store = TrainingStore(db_path)
+    store.setdefault("definitions", []).append({"word": "cat"})
+    store.setdefault("filtered_data", {})["cat"] = {"score": 1}
+    store["filtered_data"]["dog"] = [1, 2]
+    del store["filtered_data"]["dog"]
+    store["definitions"].insert(0, "first")
+    store.close()
+
+    reopened = TrainingStore(db_path)
+    assert reopened.to_dict() == {
+        "definitions": ["first", {"word": "cat"}],
+        "filtered_data": {"cat": {"score": 1}},
+    }
+    reopened.close()
+
+
+def test_rolled_back_transaction_keeps_earlier_writes(tmp_path):
+    db_path = str(tmp_path / "training.db")
+    store = TrainingStore(db_path)
+    store["definitions"] = ["kept"]
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store["definitions"].append("discarded")
+            store["filtered_data"] = {"discarded": 1}
+            raise RuntimeError("abort")
+    assert store.to_dict() == {"definitions": ["kept"]}
+    store.close()
+
+    reopened = TrainingStore(db_path)
+    assert reopened.to_dict() == {"definitions": ["kept"]}
+    reopened.close()
+
+
+def test_close_is_idempotent(tmp_path):
+    store = TrainingStore(str(tmp_path / "training.db"))
+    store["version"] = 1
+    store.close()
+    store.close()
+
+
+def test_changes_since_lists_only_keys_written_after_a_version(tmp_path):
+    store = TrainingStore(str(tmp_path / "training.db"))
+    store["research_results"] = {"a": 1, "b": 2}
+    generation, keys, version = store.changes_since("research_results", 0)
+    assert keys == []  # Assigned as a whole section; readers see a new generation instead
+
+    store["research_results"]["b"] = 3
+    store["research_results"]["c"] = 4
+    store["research_results"]["b"] = 5
+    assert store.changes_since("research_results", version) == (generation, ["c", "b"], version + 3)
+    del store["research_results"]["a"]
+    assert store.changes_since("research_results", version + 3)[1] == ["a"]
+
+    store["research_results"] = {}
+    assert store.changes_since("research_results", 0)[0] != generation
+    store.close()
@@ -0,0 +1,87 @@
+# test_vector_index.py
+
+import os
+
+import numpy as np
+import pytest
+
+from vector_index import HashingEncoder, VectorIndex
+
+ITEMS = [
+    ("apple", "a round fruit that grows on trees"),
+    ("pear", "a sweet fruit that grows on trees"),
+    ("hammer", "a tool for driving nails"),
+    ("wrench", "a tool for turning bolts"),
+]
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "vectors")
+
+
+def test_rows_persist_and_only_new_items_are_appended(directory):
+    index = VectorIndex(HashingEncoder(), directory)
+    assert index.add(ITEMS[:2]) == 2
+    assert index.add(ITEMS) == 2
+    size = os.path.getsize(index.vectors_path)
+
+    reopened = VectorIndex(HashingEncoder(), directory)
+    assert reopened.words == [word for word, _ in ITEMS]
+    assert reopened.add(ITEMS) == 0
+    assert os.path.getsize(reopened.vectors_path) == size == len(ITEMS) * HashingEncoder.dim * 4
+    assert np.allclose(reopened.matrix, index.matrix)
+
+
+def test_related_words_use_stored_vectors(directory):
+    index = VectorIndex(HashingEncoder(), directory)
+    index.add(ITEMS)
+    assert index.related_words("hammer", k=1) == ["wrench"]
+    assert index.related_words("unknown", encode=False) == []
+
+
+def test_torn_metadata_line_is_truncated(directory):
+    index = VectorIndex(HashingEncoder(), directory)
+    index.add(ITEMS)
+    with open(index.meta_path, "a") as f:
+        f.write('["screwdriver", "a tool for')  # Interrupted before the newline
+
+    reopened = VectorIndex(HashingEncoder(), directory)
+    assert len(reopened.words) == len(ITEMS)
+    with open(reopened.meta_path) as f:
+        assert f.read().endswith("\n")
+    assert reopened.add([("screwdriver", "a tool for turning screws")]) == 1
+    assert VectorIndex(HashingEncoder(), directory).words[-1] == "screwdriver"
+
+
+def test_vectors_without_metadata_are_truncated(directory):
+    index = VectorIndex(HashingEncoder(), directory)
+    index.add(ITEMS)
+    with open(index.vectors_path, "ab") as f:
+        f.write(np.zeros((1, HashingEncoder.dim), dtype=np.float32).tobytes())  # Metadata line never written
+
+    reopened = VectorIndex(HashingEncoder(), directory)
+    assert os.path.getsize(reopened.vectors_path) == len(ITEMS) * HashingEncoder.dim * 4
+    assert reopened.matrix.shape == (len(ITEMS), HashingEncoder.dim)
+
+
+def test_metadata_without_vectors_is_truncated(directory):
+    index = VectorIndex(HashingEncoder(), directory)
+    index.add(ITEMS)
+    os.truncate(index.vectors_path, 3 * HashingEncoder.dim * 4 + 10)  # Last vector only partly written
+
+    reopened = VectorIndex(HashingEncoder(), directory)
+    assert reopened.words == [word for word, _ in ITEMS[:3]]
+    assert os.path.getsize(reopened.vectors_path) == 3 * HashingEncoder.dim * 4
+    assert reopened.add(ITEMS) == 1
+    assert VectorIndex(HashingEncoder(), directory).words == [word for word, _ in ITEMS]
+
+
+def test_other_encoder_files_are_not_loaded(directory):
+    VectorIndex(HashingEncoder(), directory).add(ITEMS)
+
+    class OtherEncoder(HashingEncoder):
+        name = "other"
+
+    other = VectorIndex(OtherEncoder(), directory)
+    assert other.words == [] and other.matrix is None
@@ -0,0 +1,90 @@
+# test_word_difficulty.py
+
+import random
+import string
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from word_difficulty import WordDifficulty, compute_features, letter_frequency, load_word_difficulty
+
+WORDS = ["ELEPHANT", "CAT", "JAZZ", "QUIZ", "ENTERTAINMENT", "RHYTHM", "BANANA", "TREE", "SEESAW", "OX", "ICE CREAM"]
+
+
+def random_words(count, seed=3):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(string.ascii_uppercase) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def solver_misses(word, order):
+    """
+    Wrong guesses a solver guessing letters in a fixed order makes before finishing the word.
+    """
+    remaining, misses = set(word), 0
+    for letter in order:
+        if not remaining:
+            break
+        if letter in remaining:
+            remaining.discard(letter)
+        else:
+            misses += 1
+    return misses
+
+
+def test_features_match_a_word_by_word_computation():
+    words = random_words(300) + ["ice cream", "Élan"]
+    frequency = letter_frequency(words)
+    expected = Counter(letter for word in words for letter in word.upper() if "A" <= letter <= "Z")
+    assert frequency == expected
+
+    features = compute_features(words, frequency)
+    probability = {letter: (frequency[letter] + 1) / (sum(frequency.values()) + 26) for letter in string.ascii_uppercase}
+    order = sorted(string.ascii_uppercase, key=lambda letter: -probability[letter])
+    for index, word in enumerate(words):
+        letters = [letter for letter in word.upper() if "A" <= letter <= "Z"]
+        assert features["length"][index] == len(letters)
+        assert features["distinct_letters"][index] == len(set(letters))
+        assert features["repeated_letters"][index] == len(letters) - len(set(letters))
+        assert features["expected_misses"][index] == solver_misses(set(letters), order)
+        surprisal = sum(-np.log(probability[letter]) for letter in letters) / max(len(letters), 1)
+        assert features["letter_rarity"][index] == pytest.approx(surprisal)
+
+
+def test_scores_rank_words():
+    calibration = WordDifficulty.calibrate(WORDS)
+    assert calibration.scores.dtype == np.float32
+    assert ((calibration.scores >= 0) & (calibration.scores <= 1)).all()
+    assert list(calibration.words) == sorted(set(WORDS))
+    assert calibration.score("JAZZ") > calibration.score("ENTERTAINMENT")
+    assert calibration.score("QUIZ") > calibration.score("TREE")
+    assert calibration.score("UNKNOWN") is None
+
+
+def test_filter_keeps_order_and_range():
+    calibration = WordDifficulty.calibrate(WORDS)
+    low, high = 0.3, 0.7
+    kept = calibration.filter(WORDS + ["UNKNOWN", None], low, high)
+    assert kept == [word for word in WORDS if low <= calibration.score(word) <= high]
+    assert calibration.filter([], 0, 1) == []
+
+
+def test_calibration_is_stored_and_reused(tmp_path):
+    path = str(tmp_path / "difficulty.npz")
+    first = load_word_difficulty(WORDS, path=path)
+    reused = load_word_difficulty(list(reversed(WORDS)), path=path)
+    assert reused.fingerprint == first.fingerprint
+    assert np.array_equal(reused.scores, first.scores)
+
+    changed = load_word_difficulty(WORDS + ["ZEBRA"], path=path)
+    assert changed.fingerprint != first.fingerprint
+    assert changed.score("ZEBRA") is not None
+    frequency = load_word_difficulty(WORDS, Counter("ETAOIN"), path=path)
+    assert frequency.fingerprint != first.fingerprint
+
+
+def test_empty_lexicon():
+    calibration = WordDifficulty.calibrate([])
+    assert len(calibration.words) == 0
+    assert calibration.score("CAT") is None
+    assert calibration.filter(["CAT"], 0, 1) == []
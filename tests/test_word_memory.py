@@ -0,0 +1,95 @@
+# test_word_memory.py
+
+import pytest
+
+from training_store import TrainingStore
+from word_memory import WordMemory
+
+
+def make_memory(**kwargs):
+    options = {"short_entries": 2, "long_entries": 3, "long_bytes": 10 ** 6, "aging_accesses": 0}
+    options.update(kwargs)
+    return WordMemory(**options)
+
+
+def test_least_frequently_used_word_is_evicted():
+    memory = make_memory()
+    for word in ("ant", "bee", "cat"):
+        memory.update(word, {"definition": word})
+    memory.get("ant")
+    memory.get("cat")
+    memory.update("dog", {"definition": "dog"})
+    assert "bee" not in memory
+    assert set(memory.long_term) == {"ant", "cat", "dog"}
+    assert memory.get_stats()["evictions"] == 1
+
+
+def test_oldest_word_is_evicted_among_equal_counts():
+    memory = make_memory()
+    for word in ("ant", "bee", "cat", "dog"):
+        memory.update(word, word)
+    assert set(memory.long_term) == {"bee", "cat", "dog"}
+
+
+def test_merged_view_keeps_words_held_by_either_tier():
+    memory = make_memory(long_entries=1)
+    memory.update("ant", "a")
+    memory.update("bee", "b")  # Evicts ant from long term, but short term still holds it
+    assert memory.merged == {"ant": "a", "bee": "b"}
+    assert memory.get("ant") == "a"
+    memory.update("cat", "c")
+    memory.update("dog", "d")  # Pushes ant out of short term as well
+    assert "ant" not in memory.merged
+    assert memory.get("ant") is None
+    assert memory.get_stats()["misses"] == 1
+
+
+def test_byte_budget_evicts():
+    memory = make_memory(long_entries=100, long_bytes=20)
+    memory.update("ant", "x" * 10)
+    memory.update("bee", "y" * 10)
+    assert list(memory.long_term) == ["bee"]
+    assert memory.long_size <= 20
+
+
+def test_aging_halves_counts_so_old_favourites_fade():
+    memory = make_memory(aging_accesses=4)
+    memory.update("ant", "a")
+    for _ in range(3):
+        memory.get("ant")  # ant: 4
+    memory.update("bee", "b")
+    memory.get("bee")  # The fourth access ages every count: ant 4 -> 2, bee 2 -> 1
+    assert memory.counts == {"ant": 2, "bee": 1}
+    memory.update("cat", "c")
+    memory.get("cat")  # One hit since aging is enough to tie the old favourite
+    assert (memory.long_term["ant"][1], memory.long_term["cat"][1]) == (2, 2)
+    memory.update("dog", "d")
+    assert set(memory.long_term) == {"ant", "cat", "dog"}  # bee, left at 1 by aging, goes first
+
+
+def test_counts_persist_through_the_training_store(tmp_path):
+    path = str(tmp_path / "training.db")
+    store = TrainingStore(path)
+    memory = WordMemory(store.setdefault("dynamic_memory", {}), store.setdefault("memory_counts", {}),
+                        short_entries=2, long_entries=3, long_bytes=10 ** 6, aging_accesses=0)
+    for word in ("ant", "bee", "cat"):
+        memory.update(word, word)
+    memory.get("bee")
+    memory.get("bee")
+    store.close()
+
+    store = TrainingStore(path)
+    reloaded = WordMemory(store["dynamic_memory"], store["memory_counts"], short_entries=2, long_entries=3,
+                          long_bytes=10 ** 6, aging_accesses=0)
+    assert reloaded.long_term["bee"][1] == 3
+    assert not reloaded.short_term
+    reloaded.update("dog", "dog")
+    assert set(reloaded.long_term) == {"bee", "cat", "dog"}
+    store.close()
+
+
+@pytest.mark.parametrize("count", [0, -2, "x"])
+def test_invalid_persisted_counts_start_at_one(count):
+    memory = make_memory(merged={"ant": "a"}, counts={"ant": count, "gone": 5})
+    assert memory.long_term["ant"][1] == 1
+    assert "gone" not in memory.counts  # Counts for words whose data is gone are dropped
@@ -0,0 +1,130 @@
+# test_word_scheduler.py
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from word_scheduler import FeistelPermutation, WordScheduler
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 17, 1000, 4096, 4097])
+def test_permutation_is_a_bijection(size):
+    permutation = FeistelPermutation(size, seed=size * 7919)
+    assert sorted(permutation[index] for index in range(size)) == list(range(size))
+
+
+def test_permutation_depends_only_on_seed():
+    first = [FeistelPermutation(1000, 42)[index] for index in range(1000)]
+    assert first == [FeistelPermutation(1000, 42)[index] for index in range(1000)]
+    assert first != [FeistelPermutation(1000, 43)[index] for index in range(1000)]
+    assert first != list(range(1000))
+
+
+class FakeJobs:
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args)
+
+
+def make_context(words):
+    calibration = SimpleNamespace(words=np.array(sorted(words)), scores=np.zeros(len(words)))
+    return SimpleNamespace(jobs=FakeJobs(), get_word_difficulty=lambda: calibration)
+
+
+WORDS = [f"WORD{index:03d}" for index in range(50)]
+
+
+def test_no_repeats_until_pool_is_used(tmp_path):
+    scheduler = WordScheduler(make_context(WORDS), str(tmp_path / "bags.db"), seed=1)
+    first_pass = [scheduler.next_word("alice", 1) for _ in WORDS]
+    second_pass = [scheduler.next_word("alice", 1) for _ in WORDS]
+    assert sorted(first_pass) == WORDS
+    assert sorted(second_pass) == WORDS
+    assert first_pass != second_pass
+
+
+def test_players_have_independent_bags(tmp_path):
+    scheduler = WordScheduler(make_context(WORDS), str(tmp_path / "bags.db"), seed=1)
+    alice = [scheduler.next_word("alice", 1) for _ in range(10)]
+    bob = [scheduler.next_word("bob", 1) for _ in range(10)]
+    assert alice != bob
+    assert scheduler.get_rng("alice") is not scheduler.get_rng("bob")
+
+
+def test_bag_resumes_after_restart(tmp_path):
+    path = str(tmp_path / "bags.db")
+    scheduler = WordScheduler(make_context(WORDS), path, seed=1)
+    dealt = [scheduler.next_word("alice", 1) for _ in range(20)]
+
+    restarted = WordScheduler(make_context(WORDS), path, seed=1)
+    rest = [restarted.next_word("alice", 1) for _ in range(len(WORDS) - 20)]
+    assert sorted(dealt + rest) == WORDS
+
+
+def test_changed_pool_starts_a_new_bag(tmp_path):
+    path = str(tmp_path / "bags.db")
+    scheduler = WordScheduler(make_context(WORDS), path, seed=1)
+    for _ in range(20):
+        scheduler.next_word("alice", 1)
+
+    grown = WORDS + ["WORD999"]
+    restarted = WordScheduler(make_context(grown), path, seed=1)
+    assert sorted(restarted.next_word("alice", 1) for _ in grown) == grown
+
+
+def test_empty_pool(tmp_path):
+    scheduler = WordScheduler(make_context([]), str(tmp_path / "bags.db"), seed=1)
+    assert scheduler.next_word("alice", 1) is None
+
+
+def test_idle_players_are_evicted_and_reloaded(tmp_path):
+    scheduler = WordScheduler(make_context(WORDS), str(tmp_path / "bags.db"), seed=1, max_players=2)
+    dealt = {player: [scheduler.next_word(player, 1) for _ in range(10)] for player in ("alice", "bob", "carol")}
+    stats = scheduler.get_stats()
+    assert stats["players"] == 2 and stats["evicted"] == 1
+    assert "alice" not in scheduler.players
+
+    rest = [scheduler.next_word("alice", 1) for _ in range(len(WORDS) - 10)]
+    assert sorted(dealt["alice"] + rest) == WORDS
+
+
+def test_only_changed_players_are_written(tmp_path):
+    jobs = []
+    context = make_context(WORDS)
+    context.jobs = SimpleNamespace(submit=lambda fn, *args, **kwargs: jobs.append(fn))
+    scheduler = WordScheduler(context, str(tmp_path / "bags.db"), seed=1)
+    scheduler.next_word("alice", 1)
+    scheduler.next_word("bob", 1)
+    scheduler.save()
+    assert scheduler.get_stats()["unsaved_players"] == 0
+
+    written = []
+    scheduler._write = written.append
+    scheduler.next_word("bob", 1)
+    scheduler.save()
+    scheduler.save()  # Nothing changed since
+    assert [list(rows) for rows in written if rows] == [["bob"]]
+
+
+def test_stored_players_are_capped(tmp_path):
+    path = str(tmp_path / "bags.db")
+    scheduler = WordScheduler(make_context(WORDS), path, seed=1, max_stored=3)
+    for index in range(6):
+        scheduler.next_word(f"player{index}", 1)
+        scheduler.save()
+    assert scheduler.get_stats()["stored_players"] == 3
+    stored = {row[0] for row in scheduler.conn.execute("SELECT player FROM player_bags")}
+    assert stored == {"player3", "player4", "player5"}
+
+
+def test_json_bags_are_imported(tmp_path):
+    scheduler = WordScheduler(make_context(WORDS), str(tmp_path / "old.db"), seed=1)
+    dealt = [scheduler.next_word("alice", 1) for _ in range(20)]
+    bags = {"players": {"alice": {"1": scheduler.players["alice"]["bags"][1].to_dict()}}}
+    (tmp_path / "player_bags.json").write_text(json.dumps(bags))
+
+    migrated = WordScheduler(make_context(WORDS), str(tmp_path / "player_bags.db"), seed=1)
+    rest = [migrated.next_word("alice", 1) for _ in range(len(WORDS) - 20)]
+    assert sorted(dealt + rest) == WORDS
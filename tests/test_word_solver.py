@@ -0,0 +1,61 @@
+# test_word_solver.py
+
+import random
+
+import pytest
+
+from word_solver import AIGuesser, LexiconIndex
+
+WORDS = [
+    "APPLE", "AMPLE", "ANGLE", "EAGLE", "ADDLE", "APPLY", "BANANA", "BANDANA", "CABANA",
+    "LETTER", "BETTER", "SETTER", "LATTER", "BATTER", "MATTER", "CAT", "CUT", "COT", "ACT", "TAT",
+]
+
+
+def brute_force(words, pattern, guessed):
+    matches = []
+    for word in sorted(set(words)):
+        if len(word) != len(pattern):
+            continue
+        if all(
+            (letter == "_" and word[position] not in guessed) or letter == word[position]
+            for position, letter in enumerate(pattern)
+        ):
+            matches.append(word)
+    return matches
+
+
+def reveal(word, guessed):
+    return "".join(letter if letter in guessed else "_" for letter in word)
+
+
+def random_cases(count):
+    rng = random.Random(7)
+    for _ in range(count):
+        word = rng.choice(WORDS)
+        guessed = set(rng.sample("ABCDELMNOPTRSUY", rng.randint(0, 8)))
+        yield word, guessed
+
+
+@pytest.mark.parametrize("word,guessed", list(random_cases(200)))
+def test_filter_matches_brute_force(word, guessed):
+    index = LexiconIndex(WORDS)
+    pattern = reveal(word, guessed)
+    assert index.filter(pattern, guessed) == brute_force(WORDS, pattern, guessed)
+
+
+def test_unknown_length():
+    assert LexiconIndex(WORDS).filter("__________", set()) == []
+
+
+def test_guesser_solves_every_word():
+    guesser = AIGuesser(LexiconIndex(WORDS))
+    for word in WORDS:
+        guessed = set()
+        misses = 0
+        while "_" in reveal(word, guessed):
+            letter = guesser.best_letter(reveal(word, guessed), guessed)
+            assert letter is not None and letter not in guessed
+            guessed.add(letter)
+            misses += letter not in word
+        assert misses < 6
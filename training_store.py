@@ -0,0 +1,550 @@
+# training_store.py
+# SQLite-backed AI training data with the same dict-of-lists-and-dicts shape as training_data.json.
+#
+# Every top-level key is a section with its own table:
+#   list sections (definitions, riddles, categories, research, ...)   list_<name>(id, data)
+#   dict sections (research_results, filtered_data, dynamic_memory, ...)  dict_<name>(key, data)
+#   anything else                                                      scalar_values(name, data)
+# Values are stored as JSON text. Appending to a list or setting a key is a single-row write.
+# Writes collect in one open transaction that a flusher thread commits every TRAINING_FLUSH_INTERVAL
+# seconds or TRAINING_FLUSH_ITEMS rows, so a burst of learning costs a handful of commits.
+
+import argparse
+import atexit
+import json
+import os
+import re
+import sqlite3
+from collections import OrderedDict
+from collections.abc import MutableMapping, MutableSequence
+from contextlib import contextmanager
+from threading import Condition, RLock, Thread
+
+from config import TRAINING_STORE_FILE, TRAINING_FLUSH_INTERVAL, TRAINING_FLUSH_ITEMS
+
+INDEXED_LIST_SECTIONS = ("categories",)  # Lists checked with "in", so their values are indexed
+
+
+def _dumps(value):
+    return json.dumps(value)
+
+
+class ListSection(MutableSequence):
+    """
+    List view over one section table. Appends are O(1); positional access uses the insertion order.
+    """
+
+    def __init__(self, store, name, table):
+        self.store = store
+        self.name = name
+        self.table = table
+
+    def __len__(self):
+        return self.store.counts[self.name]
+
+    def __iter__(self):
+        with self.store.lock:
+            rows = self.store.conn.execute(f"SELECT data FROM {self.table} ORDER BY id").fetchall()
+        return (json.loads(row[0]) for row in rows)
+
+    def _row_id(self, index):
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("list index out of range")
+        return self.store.conn.execute(
+            f"SELECT id FROM {self.table} ORDER BY id LIMIT 1 OFFSET ?", (index,)
+        ).fetchone()[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            with self.store.lock:
+                rows = self.store.conn.execute(
+                    f"SELECT data FROM {self.table} ORDER BY id LIMIT ? OFFSET ?", (max(0, stop - start), start)
+                ).fetchall()
+            return [json.loads(row[0]) for row in rows]
+        with self.store.lock:
+            row_id = self._row_id(index)
+            return json.loads(self.store.conn.execute(
+                f"SELECT data FROM {self.table} WHERE id = ?", (row_id,)
+            ).fetchone()[0])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            items = list(self)
+            items[index] = value
+            self.store[self.name] = items
+            return
+        with self.store.lock:
+            row_id = self._row_id(index)
+            self.store.write(self.name, f"UPDATE {self.table} SET data = ? WHERE id = ?", (_dumps(value), row_id))
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            items = list(self)
+            del items[index]
+            self.store[self.name] = items
+            return
+        with self.store.lock:
+            self.store.write(self.name, f"DELETE FROM {self.table} WHERE id = ?", (self._row_id(index),))
+            self.store.counts[self.name] -= 1
+
+    def __contains__(self, value):
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            with self.store.lock:
+                return self.store.conn.execute(
+                    f"SELECT 1 FROM {self.table} WHERE data = ? LIMIT 1", (_dumps(value),)
+                ).fetchone() is not None
+        return any(item == value for item in self)
+
+    def append(self, value):
+        with self.store.lock:
+            self.store.write(self.name, f"INSERT INTO {self.table} (data) VALUES (?)", (_dumps(value),))
+            self.store.counts[self.name] += 1
+
+    def insert(self, index, value):
+        if index >= len(self):
+            self.append(value)
+        else:
+            items = list(self)
+            items.insert(index, value)
+            self.store[self.name] = items
+
+    def __eq__(self, other):
+        return list(self) == list(other) if isinstance(other, (list, ListSection)) else NotImplemented
+
+    def __repr__(self):
+        return f"<ListSection {self.name}: {len(self)} items>"
+
+
+class DictSection(MutableMapping):
+    """
+    Dict view over one section table. Setting a key is a single-row upsert.
+    """
+
+    def __init__(self, store, name, table):
+        self.store = store
+        self.name = name
+        self.table = table
+
+    def __len__(self):
+        return self.store.counts[self.name]
+
+    def __iter__(self):
+        with self.store.lock:
+            rows = self.store.conn.execute(f"SELECT key FROM {self.table} ORDER BY rowid").fetchall()
+        return (row[0] for row in rows)
+
+    def __getitem__(self, key):
+        with self.store.lock:
+            row = self.store.conn.execute(f"SELECT data FROM {self.table} WHERE key = ?", (str(key),)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __contains__(self, key):
+        with self.store.lock:
+            return self.store.conn.execute(
+                f"SELECT 1 FROM {self.table} WHERE key = ?", (str(key),)
+            ).fetchone() is not None
+
+    def __setitem__(self, key, value):
+        data = _dumps(value)
+        with self.store.lock:
+            cursor = self.store.write(self.name, f"UPDATE {self.table} SET data = ? WHERE key = ?", (data, str(key)))
+            if cursor.rowcount == 0:
+                self.store.write(self.name, f"INSERT INTO {self.table} (key, data) VALUES (?, ?)", (str(key), data))
+                self.store.counts[self.name] += 1
+            self.store.record_change(self.name, str(key))
+
+    def __delitem__(self, key):
+        with self.store.lock:
+            if self.store.write(self.name, f"DELETE FROM {self.table} WHERE key = ?", (str(key),)).rowcount == 0:
+                raise KeyError(key)
+            self.store.counts[self.name] -= 1
+            self.store.record_change(self.name, str(key))
+
+    def items(self):
+        with self.store.lock:
+            rows = self.store.conn.execute(f"SELECT key, data FROM {self.table} ORDER BY rowid").fetchall()
+        return [(key, json.loads(data)) for key, data in rows]
+
+    def values(self):
+        return [value for _, value in self.items()]
+
+    def update(self, other=(), **kwargs):
+        with self.store.transaction():
+            super().update(other, **kwargs)
+
+    def __eq__(self, other):
+        return dict(self.items()) == dict(other) if isinstance(other, (dict, DictSection)) else NotImplemented
+
+    def __repr__(self):
+        return f"<DictSection {self.name}: {len(self)} keys>"
+
+
+class TrainingStore(MutableMapping):
+    """
+    Dict-like training data kept in a SQLite database in WAL mode.
+    Sections are returned as live list/dict views, so existing code that appends to
+    training_data["definitions"] or sets training_data["filtered_data"][word] writes one row.
+    Assigning a whole section replaces it atomically.
+    Writes are visible to readers at once but committed in batches by a flusher thread;
+    flush() commits immediately, and the store flushes when it is closed or the process exits.
+    """
+
+    def __init__(self, db_path=TRAINING_STORE_FILE, migrate_from=None, flush_interval=TRAINING_FLUSH_INTERVAL,
+                 flush_items=TRAINING_FLUSH_ITEMS):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.flush_items = flush_items
+        self.lock = RLock()
+        self.condition = Condition(self.lock)
+        self.depth = 0  # Nesting level of open transaction() blocks
+        self.in_batch = False  # Whether uncommitted writes are open
+        self.dirty = set()  # Sections written since the last commit
+        self.pending = 0  # Row writes since the last commit
+        self.holds = 0  # Open deferred_flush() blocks, which pause timed commits
+        self.commits = 0
+        self.rows_committed = 0
+        self.closed = False
+        self.version = 0  # Bumped by every dict section key write, so readers can ask what changed
+        self.changes = {}  # dict section name -> OrderedDict of key -> version of its last write
+        self.generations = {}  # section name -> times it was created or replaced
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable at each checkpoint; never corrupt
+        self.conn.execute("CREATE TABLE IF NOT EXISTS sections (name TEXT PRIMARY KEY, kind TEXT, tbl TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS scalar_values (name TEXT PRIMARY KEY, data TEXT)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.sections = {}  # name -> (kind, table)
+        self.views = {}  # name -> ListSection or DictSection
+        self.counts = {}  # name -> row count
+        for name, kind, table in self.conn.execute("SELECT name, kind, tbl FROM sections").fetchall():
+            self._open_section(name, kind, table)
+        if self.conn.execute("SELECT 1 FROM store_meta WHERE key = 'initialized'").fetchone() is None:
+            if migrate_from and os.path.exists(migrate_from):
+                migrate_json(self, migrate_from)
+            self.write(None, "INSERT OR REPLACE INTO store_meta VALUES ('initialized', ?)", (migrate_from or "",))
+            self.flush()
+
+        self.flusher = Thread(target=self._flush_loop, name="training-store", daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+
+    def _begin(self):
+        """
+        Open the write batch if none is open. Caller must hold the lock.
+        """
+        if not self.in_batch:
+            self.conn.execute("BEGIN")
+            self.in_batch = True
+
+    def write(self, section, sql, params=()):
+        """
+        Run a write statement as part of the current batch.
+        :param section: The section written, tracked until the batch is committed.
+        """
+        with self.lock:
+            self._begin()
+            cursor = self.conn.execute(sql, params)
+            self._mark_dirty(section)
+            return cursor
+
+    def _mark_dirty(self, section, rows=1):
+        if section is not None:
+            self.dirty.add(section)
+        self.pending += rows
+        if self.pending == rows or self.pending >= self.flush_items:
+            self.condition.notify()  # Start the flush timer, or commit early
+
+    @contextmanager
+    def transaction(self):
+        """
+        Make a group of writes all-or-nothing; nested uses join the outer one.
+        The writes are committed with the rest of the batch.
+        """
+        with self.lock:
+            self._begin()
+            if self.depth == 0:
+                self.conn.execute("SAVEPOINT store_transaction")
+            self.depth += 1
+            try:
+                yield self
+            except BaseException:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.conn.execute("ROLLBACK TO store_transaction")
+                    self.conn.execute("RELEASE store_transaction")
+                    self._reload_sections()
+                raise
+            self.depth -= 1
+            if self.depth == 0:
+                self.conn.execute("RELEASE store_transaction")
+
+    @contextmanager
+    def deferred_flush(self):
+        """
+        Pause timed commits for a bulk job, such as a research rampage, and commit once at the end.
+        Commits still happen every flush_items rows, so a long job does not grow the batch without bound.
+        """
+        with self.lock:
+            self.holds += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.holds -= 1
+                if self.holds == 0:
+                    self.flush()
+
+    def _flush_loop(self):
+        while True:
+            with self.condition:
+                while not self.closed and (not self.pending or self.holds and self.pending < self.flush_items):
+                    self.condition.wait()
+                if not self.closed and self.pending < self.flush_items:
+                    self.condition.wait(self.flush_interval)
+                if self.closed:
+                    return
+                self.flush()
+
+    def flush(self):
+        """
+        Commit every pending write.
+        :return: The names of the sections that were written.
+        """
+        with self.lock:
+            if not self.in_batch or self.depth or self.closed:
+                return set()  # Inside transaction(), the batch is committed after it ends
+            try:
+                self.conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                print(f"Error saving training data: {e}")
+                if not self.conn.in_transaction:  # SQLite rolled the batch back
+                    self.in_batch = False
+                    self.dirty, self.pending = set(), 0
+                    self._reload_sections()
+                return set()
+            dirty = self.dirty
+            self.in_batch = False
+            self.commits += 1
+            self.rows_committed += self.pending
+            self.dirty, self.pending = set(), 0
+            return dirty
+
+    def record_change(self, name, key):
+        """
+        Note that a dict section key was set or deleted. Caller must hold the lock.
+        """
+        self.version += 1
+        changes = self.changes.setdefault(name, OrderedDict())
+        changes[key] = self.version
+        changes.move_to_end(key)
+
+    def changes_since(self, name, version):
+        """
+        Return the keys of a dict section written after a version, newest last.
+        Only the changed keys are visited, so callers can follow a large section cheaply.
+        :return: (generation, keys, current version). A generation other than the caller's last one
+                 means the section was replaced, and every key must be re-read.
+        """
+        with self.lock:
+            keys = []
+            for key, changed in reversed(self.changes.get(name, {}).items()):
+                if changed <= version:
+                    break
+                keys.append(key)
+            return self.generations.get(name, 0), keys[::-1], self.version
+
+    def _reload_sections(self):
+        """
+        Re-read section metadata after a rollback; views of unchanged sections are kept.
+        """
+        rows = self.conn.execute("SELECT name, kind, tbl FROM sections").fetchall()
+        views = self.views
+        self.sections, self.views, self.counts = {}, {}, {}
+        for name, kind, table in rows:
+            self._open_section(name, kind, table)
+            if name in views and views[name].table == table:
+                self.views[name] = views[name]
+        for name in set(self.generations) | set(self.sections):
+            self.generations[name] = self.generations.get(name, 0) + 1  # Rolled-back writes left no record
+
+    def _open_section(self, name, kind, table):
+        self.sections[name] = (kind, table)
+        self.counts[name] = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        self.views[name] = (ListSection if kind == "list" else DictSection)(self, name, table)
+
+    def _create_section(self, name, kind):
+        table = f"{kind}_" + re.sub(r"[^a-z0-9_]", "_", name.lower())
+        taken = {table for _, table in self.sections.values()}
+        base, suffix = table, 1
+        while table in taken:
+            suffix += 1
+            table = f"{base}_{suffix}"
+        if kind == "list":
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, data TEXT)")
+            if name in INDEXED_LIST_SECTIONS:
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_data ON {table} (data)")
+        else:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, data TEXT)")
+        self.conn.execute("INSERT INTO sections (name, kind, tbl) VALUES (?, ?, ?)", (name, kind, table))
+        self._open_section(name, kind, table)
+        self.generations[name] = self.generations.get(name, 0) + 1
+        self.changes.pop(name, None)
+
+    def _drop_section(self, name):
+        kind, table = self.sections.pop(name)
+        self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        self.conn.execute("DELETE FROM sections WHERE name = ?", (name,))
+        del self.counts[name]
+        del self.views[name]
+        self.generations[name] = self.generations.get(name, 0) + 1
+        self.changes.pop(name, None)
+
+    def __getitem__(self, name):
+        view = self.views.get(name)
+        if view is not None:
+            return view
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM scalar_values WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return json.loads(row[0])
+
+    def __setitem__(self, name, value):
+        if value is self.views.get(name):
+            return  # training_data[key] = training_data.get(key, {}) keeps the section as it is
+        if isinstance(value, (list, tuple, ListSection)):
+            kind, value = "list", list(value)
+        elif isinstance(value, (dict, DictSection)):
+            kind, value = "dict", list(value.items())
+        else:
+            kind = "value"
+        with self.transaction():
+            self._mark_dirty(name, max(1, len(value)) if kind != "value" else 1)
+            if name in self.sections:
+                self._drop_section(name)  # The replacement gets a fresh view, so holders of the old one notice
+            self.conn.execute("DELETE FROM scalar_values WHERE name = ?", (name,))
+            if kind == "value":
+                self.conn.execute("INSERT INTO scalar_values (name, data) VALUES (?, ?)", (name, _dumps(value)))
+                return
+            self._create_section(name, kind)
+            table = self.sections[name][1]
+            if kind == "list":
+                self.conn.executemany(f"INSERT INTO {table} (data) VALUES (?)", ((_dumps(v),) for v in value))
+            else:
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} (key, data) VALUES (?, ?)", ((str(k), _dumps(v)) for k, v in value)
+                )
+            self.counts[name] = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def __delitem__(self, name):
+        with self.transaction():
+            self._mark_dirty(name)
+            if name in self.sections:
+                self._drop_section(name)
+            elif self.conn.execute("DELETE FROM scalar_values WHERE name = ?", (name,)).rowcount == 0:
+                raise KeyError(name)
+
+    def __iter__(self):
+        with self.lock:
+            scalars = [row[0] for row in self.conn.execute("SELECT name FROM scalar_values").fetchall()]
+        return iter(list(self.sections) + scalars)
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]  # The live view, so appends to the result are stored
+
+    def to_dict(self):
+        """
+        Return the whole store as plain Python data, in the shape of training_data.json.
+        """
+        return {
+            name: list(value) if isinstance(value, ListSection) else dict(value.items())
+            if isinstance(value, DictSection) else value
+            for name, value in ((name, self[name]) for name in self)
+        }
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "sections": dict(self.counts),
+                "path": self.db_path,
+                "dirty_sections": sorted(self.dirty),
+                "pending_rows": self.pending,
+                "commits": self.commits,
+                "rows_committed": self.rows_committed,
+            }
+
+    def close(self):
+        """
+        Commit pending writes and close the database. Safe to call more than once.
+        """
+        with self.condition:
+            if self.closed:
+                return
+            self.flush()
+            self.closed = True
+            self.condition.notify_all()
+            self.conn.close()
+        atexit.unregister(self.close)
+
+
+def migrate_json(store, json_path):
+    """
+    Copy a training_data.json file into the store in one transaction. The JSON file is left in place.
+    :return: The number of sections migrated.
+    """
+    try:
+        with open(json_path, "r") as f:
+            data = json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"Error reading training data for migration: {e}")
+        return 0
+    with store.transaction():
+        for name, value in data.items():
+            store[name] = value
+    print(f"Migrated {len(data)} training data sections from {json_path} to {store.db_path}")
+    return len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the SQLite training data store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Import a training_data.json file, replacing its sections.")
+    migrate.add_argument("json_path", nargs="?", default="data/training_data.json")
+    export = subparsers.add_parser("export", help="Write the store out as JSON.")
+    export.add_argument("json_path")
+    subparsers.add_parser("stats", help="Show the row count of every section.")
+    parser.add_argument("--db", default=TRAINING_STORE_FILE, help="Path to the store database.")
+    args = parser.parse_args()
+
+    store = TrainingStore(args.db)
+    if args.command == "migrate":
+        migrate_json(store, args.json_path)
+    elif args.command == "export":
+        tmp_path = args.json_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(store.to_dict(), f, indent=4)
+        os.replace(tmp_path, args.json_path)
+        print(f"Exported training data to {args.json_path}")
+    else:
+        for name, count in sorted(store.counts.items()):
+            print(f"{name}: {count}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -122,7 +122,7 @@ class UIManager:
             y_start += self.font.get_height() + 5
 
         # Draw incorrect guesses
-        incorrect_guesses = [letter for letter in game.guessed_letters if letter not in game.current_word]
+        incorrect_guesses = game.get_incorrect_guesses()
         incorrect_text = self.small_font.render(f"Incorrect: {', '.join(incorrect_guesses)}", True, (255, 0, 0))
         self.screen.blit(incorrect_text, (int(WIDTH * 0.1), int(HEIGHT * 0.8)))
 
@@ -272,7 +272,7 @@ class UIManager:
             self.screen.blit(text, (int(WIDTH * 0.05), y))
             y += int(HEIGHT * 0.05)
 
-    def create_menu_buttons(self, start_word_guess, start_riddle_time, set_difficulty, show_achievements, change_theme):
+    def create_menu_buttons(self, start_word_guess, start_riddle_time, set_difficulty, show_achievements, change_theme, start_ai_guesser=None):
         """
         Create buttons for the main menu.
         """
@@ -288,6 +288,11 @@ class UIManager:
             Button(WIDTH // 2 - button_width // 2, int(HEIGHT * 0.3) + 5 * (button_height + spacing), button_width, button_height, "Achievements", self.font, GRAY, WHITE, show_achievements),
             Button(WIDTH // 2 - button_width // 2, int(HEIGHT * 0.3) + 6 * (button_height + spacing), button_width, button_height, "Change Theme", self.font, GRAY, WHITE, change_theme),
         ]
+        if start_ai_guesser:
+            # Placed beside "Word Guess" so it stays on screen
+            self.buttons.append(
+                Button(WIDTH // 2 + button_width // 2 + spacing, int(HEIGHT * 0.3), button_width, button_height, "AI Guesser", self.font, GRAY, WHITE, start_ai_guesser)
+            )
 
     def create_game_buttons(self, use_hint, use_reveal_letter, use_extra_attempt):
         """
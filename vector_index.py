@@ -0,0 +1,291 @@
+# vector_index.py
+# Sentence embeddings of definitions and examples in a memory-mapped float32 matrix, for offline
+# semantic "related words" lookups.
+#
+# Files, one pair per encoder so switching encoders never mixes vector spaces:
+#   <encoder>.f32    rows of float32 unit vectors, appended in place
+#   <encoder>.jsonl  a {"encoder", "dim"} header line, then one [word, text] line per row, appended in place
+# Both files only grow, so adding rows costs the new rows alone. Vectors are written before their
+# metadata lines; on load, rows missing from either file (an interrupted append) are truncated away.
+
+import json
+import os
+import re
+import zlib
+from threading import Lock
+
+import numpy as np
+
+from config import EMBEDDING_MODEL, VECTOR_INDEX_DIR
+from passage_index import tokenize
+
+SEARCH_CHUNK_ROWS = 65536  # Rows scored per matrix product, bounding memory for large indexes
+
+
+def normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class TransformerEncoder:
+    """
+    Mean-pooled token embeddings from a sentence model, run through the model registry on CPU
+    or in the shared inference worker.
+    """
+
+    def __init__(self, registry, model=EMBEDDING_MODEL):
+        self.registry = registry
+        self.name = model
+
+    def encode(self, texts):
+        pipe = self.registry.get("sentence_encoder")
+        if pipe is None:
+            raise RuntimeError(f"Sentence encoder {self.name} is not available.")
+        outputs = pipe(list(texts), truncation=True)  # A list runs unbatched, so no padding tokens are pooled
+        return normalize(np.array([np.asarray(output[0], dtype=np.float32).mean(axis=0) for output in outputs]))
+
+
+class HashingEncoder:
+    """
+    Model-free fallback: feature-hashed words and character trigrams. Catches shared roots and
+    spelling variants rather than meaning, but needs nothing beyond NumPy.
+    """
+
+    name = "hashed-trigrams"
+    dim = 512
+
+    def encode(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in tokenize(text):
+                padded = f"#{word}#"
+                features = [f"w:{word}"] + [padded[i:i + 3] for i in range(len(padded) - 2)]
+                for feature in features:
+                    digest = zlib.crc32(feature.encode())  # Stable across processes, unlike hash()
+                    vectors[row, digest % self.dim] += 1.0 if digest & 0x80000000 else -1.0
+        return normalize(vectors)
+
+
+def choose_encoder(registry):
+    """
+    Use the configured sentence model when it can be loaded, else the hashing encoder.
+    """
+    if EMBEDDING_MODEL:
+        encoder = TransformerEncoder(registry)
+        try:
+            encoder.encode(["hangman"])
+            return encoder
+        except Exception as e:
+            print(f"Sentence encoder unavailable, using hashed word features instead: {e}")
+    return HashingEncoder()
+
+
+def iter_word_texts(training_data, predefined_words):
+    """
+    Yield (word, text) for every definition and example in the training data and predefined words.
+    """
+    entries = []
+    for entry in training_data.get("definitions") or []:
+        if isinstance(entry, dict):
+            entries.append((entry.get("word", ""), entry))
+    for key in ("research_results", "dynamic_memory"):
+        entries.extend((training_data.get(key) or {}).items())
+    entries.extend(predefined_words.items())
+    for word, entry in entries:
+        if not word or not isinstance(entry, dict):
+            continue
+        for definition in entry.get("definitions") or []:
+            if isinstance(definition, dict):
+                for key in ("definition", "example"):
+                    if definition.get(key):
+                        yield word, definition[key]
+        for example in entry.get("examples") or []:
+            if example and isinstance(example, str):
+                yield word, example
+
+
+class VectorIndex:
+    """
+    Append-only matrix of unit vectors with batched top-k cosine search.
+    Appends are serialized; searches never wait on them and see the rows mapped when they start.
+    """
+
+    def __init__(self, encoder, directory=VECTOR_INDEX_DIR):
+        self.encoder = encoder
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", encoder.name).strip("-")
+        self.vectors_path = os.path.join(directory, f"{slug}.f32")
+        self.meta_path = os.path.join(directory, f"{slug}.jsonl")
+        self.legacy_meta_path = os.path.join(directory, f"{slug}.json")  # Whole-file metadata of older versions
+        self.dim = None
+        self.words = []
+        self.texts = []
+        self.keys = set()  # (word, text) pairs already embedded
+        self.word_rows = {}  # word -> row numbers
+        self.matrix = None
+        self.write_lock = Lock()
+        self.load()
+
+    def load(self):
+        self._convert_legacy_meta()
+        try:
+            with open(self.meta_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        except IOError as e:
+            print(f"Error opening vector index: {e}")
+            return
+        header, rows, ends = None, [], []  # ends[i] is the byte offset just past metadata line i
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # Torn last line
+            try:
+                value = json.loads(line)
+            except ValueError:
+                break
+            if header is None:
+                header = value
+            else:
+                rows.append(value)
+            ends.append((ends[-1] if ends else 0) + len(line))
+        if header is None or header.get("encoder") != self.encoder.name:
+            return
+        self.dim = header["dim"]
+        row_bytes = self.dim * 4
+        try:
+            count = min(len(rows), os.path.getsize(self.vectors_path) // row_bytes)
+            if ends[count] < len(data):
+                os.truncate(self.meta_path, ends[count])  # Drop metadata of rows whose vectors are missing
+            if os.path.getsize(self.vectors_path) > count * row_bytes:
+                os.truncate(self.vectors_path, count * row_bytes)  # Drop rows whose metadata was never written
+        except OSError as e:
+            print(f"Error opening vector index: {e}")
+            self.dim = None
+            return
+        for word, text in rows[:count]:
+            self._track(word, text)
+        self._map()
+
+    def _convert_legacy_meta(self):
+        """
+        Rewrite metadata from the older single-JSON format as JSONL, once.
+        """
+        if os.path.exists(self.meta_path) or not os.path.exists(self.legacy_meta_path):
+            return
+        try:
+            with open(self.legacy_meta_path, "r") as f:
+                meta = json.load(f)
+            tmp_path = self.meta_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps({"encoder": meta["encoder"], "dim": meta["dim"]}) + "\n")
+                for row in zip(meta["words"], meta["texts"]):
+                    f.write(json.dumps(row) + "\n")
+            os.replace(tmp_path, self.meta_path)
+            os.remove(self.legacy_meta_path)
+        except (IOError, OSError, ValueError, KeyError) as e:
+            print(f"Error converting vector index metadata: {e}")
+
+    def _track(self, word, text):
+        self.word_rows.setdefault(word, []).append(len(self.words))
+        self.words.append(word)
+        self.texts.append(text)
+        self.keys.add((word, text))
+
+    def _map(self):
+        self.matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self.texts), self.dim)) \
+            if self.texts else None
+
+    def add(self, items, batch_size=64):
+        """
+        Embed and append (word, text) pairs that are not in the index yet.
+        :return: The number of rows added.
+        """
+        with self.write_lock:
+            return self._append(list(dict.fromkeys(item for item in items if item not in self.keys)), batch_size)
+
+    def _append(self, pending, batch_size):
+        if not pending:
+            return 0
+        os.makedirs(os.path.dirname(self.vectors_path) or ".", exist_ok=True)
+        if not self.texts:
+            for path in (self.vectors_path, self.meta_path):  # Left from an index that could not be loaded
+                if os.path.exists(path):
+                    os.remove(path)
+        added = 0
+        try:
+            with open(self.vectors_path, "ab") as vectors_file, open(self.meta_path, "a") as meta_file:
+                for start in range(0, len(pending), batch_size):
+                    batch = pending[start:start + batch_size]
+                    vectors = self.encoder.encode([text for _, text in batch])
+                    if self.dim is None:
+                        self.dim = vectors.shape[1]
+                        meta_file.write(json.dumps({"encoder": self.encoder.name, "dim": self.dim}) + "\n")
+                    vectors_file.write(vectors.tobytes())
+                    vectors_file.flush()  # Vectors first, so every metadata row on disk has its vector
+                    meta_file.write("".join(json.dumps([word, text]) + "\n" for word, text in batch))
+                    meta_file.flush()
+                    for word, text in batch:
+                        self._track(word, text)
+                    added += len(batch)
+        finally:
+            if added:  # Keep the batches that were written even if a later one failed
+                self._map()
+        return added
+
+    def search_vectors(self, queries, k=10):
+        """
+        Batched top-k cosine search.
+        :param queries: An (m, dim) array of unit vectors.
+        :return: For each query, a list of (row, score) pairs, best first.
+        """
+        matrix = self.matrix
+        if matrix is None:
+            return [[] for _ in range(len(queries))]
+        queries = np.asarray(queries, dtype=np.float32)
+        k = min(k, len(matrix))
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(matrix), SEARCH_CHUNK_ROWS):
+            scores = queries @ matrix[start:start + SEARCH_CHUNK_ROWS].T
+            top = np.argpartition(-scores, min(k, scores.shape[1]) - 1, axis=1)[:, :k]
+            best_rows = np.hstack([best_rows, top + start])
+            best_scores = np.hstack([best_scores, np.take_along_axis(scores, top, axis=1)])
+        order = np.argsort(-best_scores, axis=1)[:, :k]
+        rows = np.take_along_axis(best_rows, order, axis=1)
+        scores = np.take_along_axis(best_scores, order, axis=1)
+        return [list(zip(row.tolist(), score.tolist())) for row, score in zip(rows, scores)]
+
+    def search(self, queries, k=10):
+        """
+        Batched top-k search for query texts.
+        :return: For each query, a list of (word, text, score) tuples, best first.
+        """
+        results = self.search_vectors(self.encoder.encode(list(queries)), k)
+        return [[(self.words[row], self.texts[row], score) for row, score in result] for result in results]
+
+    def related_words(self, word, k=10, encode=True):
+        """
+        Words whose definitions and examples are closest to this word's.
+        A word already in the index is looked up from its stored vectors without running the encoder.
+        :param encode: If False, return nothing for words that are not in the index.
+        """
+        matrix = self.matrix
+        rows = [row for row in self.word_rows.get(word, ()) if matrix is not None and row < len(matrix)]
+        if rows:
+            query = normalize(np.asarray(matrix[rows]).mean(axis=0, keepdims=True))
+        elif encode:
+            query = self.encoder.encode([word])
+        else:
+            return []
+        related = []
+        for row, _ in self.search_vectors(query, k * 5 + len(rows))[0]:
+            candidate = self.words[row]
+            if candidate != word and candidate not in related:
+                related.append(candidate)
+                if len(related) == k:
+                    break
+        return related
+
+    def get_stats(self):
+        return {"encoder": self.encoder.name, "rows": len(self.texts), "words": len(self.word_rows), "dim": self.dim}
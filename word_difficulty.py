@@ -0,0 +1,223 @@
+# word_difficulty.py
+
+import argparse
+import hashlib
+import os
+from collections import Counter
+
+import numpy as np
+
+from config import WORD_DIFFICULTY_FILE
+
+# Bump when features or weights change so stored calibrations are recomputed
+CALIBRATION_VERSION = 1
+
+# Weights of each feature's percentile rank in the final score
+FEATURE_WEIGHTS = {
+    "expected_misses": 0.5,  # Wrong guesses a frequency-order solver makes before finishing the word
+    "letter_rarity": 0.2,  # Mean surprisal of the word's letters
+    "shortness": 0.15,  # Short words reveal less per correct guess
+    "repeated_letters": 0.15,  # Repeats mean fewer distinct letters to find
+}
+
+
+def _letter_counts(words):
+    """
+    Count A-Z letters per word without a Python loop over the words.
+    Characters outside A-Z, such as spaces or accents, are ignored.
+    :return: An int array of shape (len(words), 26).
+    """
+    if not len(words):
+        return np.zeros((0, 26), dtype=np.int64)
+    array = np.char.upper(np.asarray(words, dtype=str))
+    width = array.dtype.itemsize // 4
+    indices = array.view(np.uint32).reshape(len(array), width).astype(np.int64) - 65
+    rows, columns = np.nonzero((indices >= 0) & (indices < 26))
+    flat = rows * 26 + indices[rows, columns]
+    return np.bincount(flat, minlength=len(array) * 26).reshape(len(array), 26)
+
+
+def letter_frequency(words):
+    """
+    Count how often each letter occurs across a corpus of words.
+    :return: A Counter of uppercase letters.
+    """
+    totals = _letter_counts(words).sum(axis=0)
+    return Counter({chr(65 + i): int(total) for i, total in enumerate(totals) if total})
+
+
+def _percentile(values):
+    """
+    Percentile rank of each value in [0, 1]; tied values share their average rank.
+    """
+    ordered = np.sort(values)
+    return (np.searchsorted(ordered, values, "left") + np.searchsorted(ordered, values, "right")) / (2 * len(values))
+
+
+def compute_features(words, frequency=None):
+    """
+    Compute the raw difficulty features of every word at once.
+    :param words: A sequence of words.
+    :param frequency: Letter counts (see letter_frequency); derived from words when omitted.
+    :return: A dictionary of feature name -> float array, including 'length' and 'distinct_letters'.
+    """
+    counts = _letter_counts(words)
+    if frequency is None:
+        totals = counts.sum(axis=0)
+    else:
+        totals = np.array([frequency.get(chr(65 + i), 0) for i in range(26)], dtype=np.float64)
+    probability = (totals + 1) / (totals.sum() + 26)  # Laplace smoothing so unseen letters stay finite
+
+    present = counts > 0
+    length = counts.sum(axis=1)
+    distinct = present.sum(axis=1)
+
+    # A frequency-order solver guesses letters by descending corpus frequency; it has finished
+    # once it reaches the word's lowest-ranked letter, having missed every absent letter before it
+    rank = np.empty(26, dtype=np.int64)
+    rank[np.argsort(-probability, kind="stable")] = np.arange(26)
+    last_rank = np.where(present, rank, -1).max(axis=1)
+    expected_misses = np.maximum(last_rank + 1 - distinct, 0)
+
+    return {
+        "length": length.astype(np.float64),
+        "distinct_letters": distinct.astype(np.float64),
+        "expected_misses": expected_misses.astype(np.float64),
+        "letter_rarity": (counts @ -np.log(probability)) / np.maximum(length, 1),
+        "shortness": -length.astype(np.float64),
+        "repeated_letters": (length - distinct).astype(np.float64),
+    }
+
+
+def compute_scores(features):
+    """
+    Combine features into a score in [0, 1] as a weighted sum of percentile ranks.
+    """
+    size = len(features["length"])
+    scores = np.zeros(size, dtype=np.float64)
+    if size:
+        for name, weight in FEATURE_WEIGHTS.items():
+            scores += weight * _percentile(features[name])
+    return scores.astype(np.float32)
+
+
+class WordDifficulty:
+    """
+    Difficulty scores for a lexicon, stored as sorted word and score arrays so lookups
+    and range filters over whole categories are binary searches.
+    """
+
+    def __init__(self, words, scores, fingerprint):
+        self.words = words
+        self.scores = scores
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def fingerprint_for(words, frequency=None):
+        """
+        Fingerprint a sorted word array and letter frequency so stale calibrations are detected.
+        """
+        digest = hashlib.sha256(f"difficulty-v{CALIBRATION_VERSION}\n".encode())
+        digest.update(np.ascontiguousarray(words).tobytes())
+        if frequency is not None:
+            digest.update(repr(sorted(frequency.items())).encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def calibrate(cls, words, frequency=None):
+        """
+        Score every distinct word in a word list.
+        """
+        unique = np.unique(np.asarray([word for word in words if isinstance(word, str)], dtype=str))
+        scores = compute_scores(compute_features(unique, frequency))
+        return cls(unique, scores, cls.fingerprint_for(unique, frequency))
+
+    def save(self, path=WORD_DIFFICULTY_FILE):
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, words=self.words, scores=self.scores, fingerprint=np.array(self.fingerprint))
+            os.replace(tmp_path, path)
+        except (IOError, OSError) as e:
+            print(f"Error saving word difficulty scores: {e}")
+
+    @classmethod
+    def load(cls, path=WORD_DIFFICULTY_FILE):
+        """
+        Load stored scores.
+        :return: A WordDifficulty, or None if the file is missing or unreadable.
+        """
+        try:
+            with np.load(path) as data:
+                return cls(data["words"], data["scores"], str(data["fingerprint"]))
+        except FileNotFoundError:
+            return None
+        except (IOError, OSError, ValueError, KeyError) as e:
+            print(f"Error loading word difficulty scores: {e}")
+            return None
+
+    def _lookup(self, words):
+        """
+        Return the index of each word in the sorted array and whether it was found.
+        """
+        words = np.asarray(words, dtype=str)
+        indices = np.searchsorted(self.words, words)
+        indices = np.minimum(indices, max(len(self.words) - 1, 0))
+        found = self.words[indices] == words if len(self.words) else np.zeros(len(words), dtype=bool)
+        return indices, found
+
+    def score(self, word):
+        """
+        Return a word's difficulty score, or None if it was not calibrated.
+        """
+        indices, found = self._lookup([word])
+        return float(self.scores[indices[0]]) if found[0] else None
+
+    def filter(self, words, low, high):
+        """
+        Return the words whose score lies in [low, high], keeping their order.
+        Words that were not calibrated are left out.
+        """
+        words = [word for word in words if isinstance(word, str)]
+        if not words or not len(self.words):
+            return []
+        indices, found = self._lookup(words)
+        scores = self.scores[indices]
+        keep = found & (scores >= low) & (scores <= high)
+        return [word for word, kept in zip(words, keep.tolist()) if kept]
+
+
+def load_word_difficulty(words, frequency=None, path=WORD_DIFFICULTY_FILE):
+    """
+    Return difficulty scores for a word list, reusing the stored calibration when it was
+    computed from the same words and letter frequency, and recalibrating otherwise.
+    """
+    unique = np.unique(np.asarray([word for word in words if isinstance(word, str)], dtype=str))
+    stored = WordDifficulty.load(path)
+    if stored is not None and stored.fingerprint == WordDifficulty.fingerprint_for(unique, frequency):
+        return stored
+    calibration = WordDifficulty.calibrate(unique, frequency)
+    calibration.save(path)
+    return calibration
+
+
+def main():
+    from content_manager import load_words
+
+    parser = argparse.ArgumentParser(description="Calibrate word difficulty scores for the lexicon.")
+    parser.add_argument("--output", default=WORD_DIFFICULTY_FILE, help="Where to store the scores.")
+    parser.add_argument("--show", type=int, default=10, help="Number of easiest and hardest words to print.")
+    args = parser.parse_args()
+
+    words = load_words(offline=True)
+    all_words = [word for category in words for word in words[category]]
+    calibration = WordDifficulty.calibrate(all_words)
+    calibration.save(args.output)
+    order = np.argsort(calibration.scores, kind="stable")
+    print(f"Calibrated {len(calibration.words)} words into {args.output}")
+    print("Easiest:", ", ".join(str(calibration.words[i]) for i in order[:args.show]))
+    print("Hardest:", ", ".join(str(calibration.words[i]) for i in order[::-1][:args.show]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# word_memory.py
+# The AI's two-tier word memory: a small LRU short-term tier in front of an LFU long-term tier.
+#
+# Both tiers live in memory. The merged view of the two (the training data's dynamic_memory section)
+# and the long-term access counts are kept in mappings that the training store persists, so the
+# long-term tier is reloaded on the next start and the short-term tier starts empty.
+
+import json
+from collections import OrderedDict
+from threading import Lock
+
+from config import (
+    SHORT_TERM_MEMORY_ENTRIES,
+    LONG_TERM_MEMORY_ENTRIES,
+    LONG_TERM_MEMORY_BYTES,
+    MEMORY_AGING_ACCESSES,
+)
+
+
+def _size(data):
+    try:
+        return len(json.dumps(data))
+    except (TypeError, ValueError):
+        return len(repr(data))
+
+
+class WordMemory:
+    """
+    Short-term tier: the most recently stored words, evicted least recently used first.
+    Long-term tier: every stored word with an access count, evicted least frequently used first
+    (oldest first among equal counts) once it exceeds its entry or byte budget. Every
+    aging_accesses hits all counts are halved, so words that were popular long ago can fade.
+    All operations are O(1), apart from aging, which is amortized over the hits between agings.
+    """
+
+    def __init__(self, merged=None, counts=None, short_entries=SHORT_TERM_MEMORY_ENTRIES,
+                 long_entries=LONG_TERM_MEMORY_ENTRIES, long_bytes=LONG_TERM_MEMORY_BYTES,
+                 aging_accesses=MEMORY_AGING_ACCESSES):
+        """
+        :param merged: Mapping kept equal to the union of both tiers, such as training_data["dynamic_memory"].
+        :param counts: Mapping of long-term word -> access count, persisted alongside merged.
+        """
+        self.merged = merged if merged is not None else {}
+        self.counts = counts if counts is not None else {}
+        self.short_entries = short_entries
+        self.long_entries = long_entries
+        self.long_bytes = long_bytes
+        self.aging_accesses = aging_accesses
+        self.lock = Lock()
+        self.short_term = OrderedDict()  # word -> data, least recently used first
+        self.long_term = {}  # word -> [data, access count, size in bytes]
+        self.buckets = {}  # access count -> OrderedDict of words, oldest first
+        self.min_count = 0
+        self.long_size = 0
+        self.accesses = 0  # Hits since the last aging
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load()
+
+    def load(self):
+        """
+        Rebuild the long-term tier from the persisted merged view and access counts.
+        Words stored before counts were kept start with a count of 1.
+        """
+        counts = dict(self.counts.items())
+        for word, data in list(self.merged.items()):
+            count = counts.pop(word, 1)
+            self._insert(word, data, count if isinstance(count, int) and count > 0 else 1)
+        for word in counts:  # Counts whose data is gone
+            del self.counts[word]
+        self.min_count = min(self.buckets) if self.buckets else 0
+        self._evict_long()
+
+    def _insert(self, word, data, count):
+        size = _size(data)
+        self.long_term[word] = [data, count, size]
+        self.buckets.setdefault(count, OrderedDict())[word] = None
+        self.long_size += size
+
+    def _unlink(self, word, count):
+        bucket = self.buckets[count]
+        del bucket[word]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1  # Correct while touching; eviction re-checks
+
+    def _touch(self, word):
+        """
+        Count an access to a long-term word. Caller must hold the lock.
+        """
+        entry = self.long_term[word]
+        self._unlink(word, entry[1])
+        entry[1] += 1
+        self.buckets.setdefault(entry[1], OrderedDict())[word] = None
+        self.counts[word] = entry[1]
+        self.accesses += 1
+        if self.aging_accesses and self.accesses >= self.aging_accesses:
+            self._age()
+
+    def _age(self):
+        """
+        Halve every access count, keeping the order within each count. Caller must hold the lock.
+        """
+        buckets, self.buckets = self.buckets, {}
+        for count in sorted(buckets):
+            for word in buckets[count]:
+                entry = self.long_term[word]
+                entry[1] = max(1, count // 2)
+                self.buckets.setdefault(entry[1], OrderedDict())[word] = None
+        self.min_count = min(self.buckets) if self.buckets else 0
+        self.counts.update({word: entry[1] for word, entry in self.long_term.items()})
+        self.accesses = 0
+
+    def _forget(self, word):
+        """
+        Drop a word from the merged view once it is in neither tier. Caller must hold the lock.
+        """
+        if word not in self.short_term and word not in self.long_term:
+            self.merged.pop(word, None)
+
+    def _evict_long(self):
+        while self.long_term and (len(self.long_term) > self.long_entries or self.long_size > self.long_bytes):
+            if self.min_count not in self.buckets:
+                self.min_count = min(self.buckets)
+            word, _ = self.buckets[self.min_count].popitem(last=False)
+            if not self.buckets[self.min_count]:
+                del self.buckets[self.min_count]
+            self.long_size -= self.long_term.pop(word)[2]
+            self.counts.pop(word, None)
+            self.evictions += 1
+            self._forget(word)
+
+    def update(self, word, data):
+        """
+        Store data for a word in both tiers, counting it as an access if it is already known.
+        """
+        with self.lock:
+            self.short_term[word] = data
+            self.short_term.move_to_end(word)
+            if len(self.short_term) > self.short_entries:
+                evicted, _ = self.short_term.popitem(last=False)
+                self._forget(evicted)
+
+            entry = self.long_term.get(word)
+            if entry is None:
+                self._insert(word, data, 1)
+                self.min_count = 1
+                self.counts[word] = 1
+            else:
+                size = _size(data)
+                self.long_size += size - entry[2]
+                entry[0], entry[2] = data, size
+                self._touch(word)
+            self.merged[word] = data
+            self._evict_long()
+
+    def get(self, word):
+        """
+        Return the data stored for a word, or None. A hit counts as an access.
+        """
+        with self.lock:
+            data = self.short_term.get(word)
+            if data is not None:
+                self.short_term.move_to_end(word)
+            entry = self.long_term.get(word)
+            if entry is not None:
+                self._touch(word)
+                if data is None:
+                    data = entry[0]
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return data
+
+    def __contains__(self, word):
+        return word in self.short_term or word in self.long_term
+
+    def __len__(self):
+        with self.lock:
+            return len(self.long_term) + sum(1 for word in self.short_term if word not in self.long_term)
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "short_term": len(self.short_term),
+                "long_term": len(self.long_term),
+                "long_term_bytes": self.long_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
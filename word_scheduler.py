@@ -0,0 +1,247 @@
+# word_scheduler.py
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+from collections import OrderedDict
+from threading import Lock
+from time import time
+
+import numpy as np
+
+from config import (
+    PLAYER_BAGS_FILE,
+    WORD_SCHEDULER_SEED,
+    SCHEDULER_MAX_PLAYERS,
+    SCHEDULER_MAX_STORED_PLAYERS,
+    WORD_DIFFICULTY_FILTER,
+    DIFFICULTY_SCORE_RANGES,
+)
+from job_queue import PRIORITY_LOW
+
+
+class FeistelPermutation:
+    """
+    Pseudo-random permutation of range(size) computed one position at a time.
+    A balanced Feistel network permutes the smallest even-bit power of two covering size,
+    and cycle walking maps positions outside range(size) back in, so only the seed needs
+    to be stored, never the shuffled order.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size, seed):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        bits += bits % 2
+        self.half = bits // 2
+        self.mask = (1 << self.half) - 1
+        key_rng = random.Random(seed)
+        self.keys = [key_rng.getrandbits(32) for _ in range(self.ROUNDS)]
+
+    def _mix(self, value, key):
+        value = ((value ^ key) * 0x45D9F3B) & 0xFFFFFFFF
+        return (value ^ (value >> 16)) & self.mask
+
+    def __getitem__(self, index):
+        value = index
+        while True:
+            left, right = value >> self.half, value & self.mask
+            for key in self.keys:
+                left, right = right, left ^ self._mix(right, key)
+            value = (left << self.half) | right
+            if value < self.size:
+                return value
+
+
+class PlayerBag:
+    """
+    A player's position in a shuffled pass over one word pool: the permutation seed,
+    how far through it the player is, and which pool it was made for.
+    """
+
+    def __init__(self, seed, cursor=0, pool=None):
+        self.seed = seed
+        self.cursor = cursor
+        self.pool = pool
+        self.permutation = None
+
+    def to_dict(self):
+        return {"seed": self.seed, "cursor": self.cursor, "pool": self.pool}
+
+
+class WordScheduler:
+    """
+    Deals words to each player from a shuffled bag so no word repeats until the player has
+    seen the whole pool for their difficulty level. Each player has an independent random
+    stream, and their bag state (seed and cursor per difficulty) is saved to disk.
+    Bags live in a SQLite table written only for players whose bags changed. At most
+    max_players are kept in memory, least recently dealt to evicted first, and at most
+    max_stored on disk, so any number of player names costs bounded memory and writes.
+    """
+
+    def __init__(self, context, path=PLAYER_BAGS_FILE, seed=WORD_SCHEDULER_SEED, max_players=SCHEDULER_MAX_PLAYERS,
+                 max_stored=SCHEDULER_MAX_STORED_PLAYERS):
+        self.context = context
+        self.path = path
+        self.seed = seed
+        self.max_players = max_players
+        self.max_stored = max_stored
+        self.lock = Lock()
+        self.db_lock = Lock()  # Taken after self.lock when both are needed
+        self.pools = {}  # difficulty -> (fingerprint, sorted word array)
+        self.players = OrderedDict()  # player id -> {"rng", "lock", "bags"}, least recently dealt to first
+        self.dirty = set()  # Players whose bags changed since the last save
+        self.evicted = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS player_bags (player TEXT PRIMARY KEY, bags TEXT, updated REAL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_player_bags_updated ON player_bags (updated)")
+        self.conn.commit()
+        self.stored = self.conn.execute("SELECT COUNT(*) FROM player_bags").fetchone()[0]
+        if self.stored == 0:
+            self.migrate_json(f"{os.path.splitext(path)[0]}.json")
+
+    def migrate_json(self, json_path):
+        """
+        Import the bags of a player_bags.json file written by earlier versions.
+        """
+        try:
+            with open(json_path, "r") as f:
+                players = json.load(f).get("players", {})
+        except FileNotFoundError:
+            return
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading player bags: {e}")
+            return
+        self._write({player_id: json.dumps(bags) for player_id, bags in players.items()})
+
+    def _write(self, rows):
+        """
+        Store serialized bags and forget the least recently updated players past max_stored.
+        """
+        if not rows:
+            return
+        now = time()
+        with self.db_lock:
+            try:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO player_bags (player, bags, updated) VALUES (?, ?, ?)",
+                    [(player_id, bags, now) for player_id, bags in rows.items()],
+                )
+                self.stored = self.conn.execute("SELECT COUNT(*) FROM player_bags").fetchone()[0]
+                if self.stored > self.max_stored:
+                    self.conn.execute(
+                        "DELETE FROM player_bags WHERE player IN "
+                        "(SELECT player FROM player_bags ORDER BY updated LIMIT ?)",
+                        (self.stored - self.max_stored,),
+                    )
+                    self.stored = self.max_stored
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error saving player bags: {e}")
+
+    def _load_bags(self, player_id):
+        with self.db_lock:
+            try:
+                row = self.conn.execute("SELECT bags FROM player_bags WHERE player = ?", (player_id,)).fetchone()
+            except sqlite3.Error as e:
+                print(f"Error loading player bags: {e}")
+                return {}
+        return json.loads(row[0]) if row else {}
+
+    @staticmethod
+    def _serialize(player):
+        with player["lock"]:
+            return json.dumps({str(level): bag.to_dict() for level, bag in player["bags"].items()})
+
+    def save(self):
+        """
+        Write the bags of every player dealt to since the last save. Runs on the background job queue.
+        """
+        with self.lock:
+            changed = [(player_id, self.players[player_id]) for player_id in self.dirty if player_id in self.players]
+            self.dirty.clear()
+        self._write({player_id: self._serialize(player) for player_id, player in changed})
+
+    def get_pool(self, difficulty):
+        """
+        Return the fingerprint and sorted word array dealt at a difficulty level.
+        """
+        with self.lock:
+            if difficulty not in self.pools:
+                calibration = self.context.get_word_difficulty()
+                words = calibration.words
+                if WORD_DIFFICULTY_FILTER:
+                    low, high = DIFFICULTY_SCORE_RANGES[difficulty]
+                    in_range = words[(calibration.scores >= low) & (calibration.scores <= high)]
+                    words = in_range if len(in_range) else words
+                fingerprint = hashlib.sha256(np.ascontiguousarray(words).tobytes()).hexdigest()[:16]
+                self.pools[difficulty] = (fingerprint, words)
+            return self.pools[difficulty]
+
+    def _get_player(self, player_id):
+        with self.lock:
+            player = self.players.get(player_id)
+            if player is not None:
+                self.players.move_to_end(player_id)
+                return player
+            if self.seed is None:
+                rng = random.Random()
+            else:
+                rng = random.Random(f"{self.seed}:{player_id}")  # String seeds hash the same everywhere
+            saved = self._load_bags(player_id)
+            bags = {int(level): PlayerBag(bag["seed"], bag["cursor"], bag["pool"]) for level, bag in saved.items()}
+            player = {"rng": rng, "lock": Lock(), "bags": bags}
+            self.players[player_id] = player
+            while len(self.players) > self.max_players:
+                evicted_id, evicted = self.players.popitem(last=False)
+                if evicted_id in self.dirty:
+                    self.dirty.discard(evicted_id)
+                    self._write({evicted_id: self._serialize(evicted)})
+                self.evicted += 1
+            return player
+
+    def get_rng(self, player_id):
+        """
+        Return the player's own random stream.
+        """
+        return self._get_player(player_id)["rng"]
+
+    def next_word(self, player_id, difficulty):
+        """
+        Deal the player's next word at a difficulty level.
+        :return: A word, or None if the pool is empty.
+        """
+        fingerprint, words = self.get_pool(difficulty)
+        if not len(words):
+            return None
+        player = self._get_player(player_id)
+        with player["lock"]:
+            bag = player["bags"].get(difficulty)
+            if bag is None or bag.pool != fingerprint or bag.cursor >= len(words):
+                # Start a new pass with a fresh permutation; also when the pool has changed
+                bag = PlayerBag(player["rng"].getrandbits(64), 0, fingerprint)
+                player["bags"][difficulty] = bag
+            if bag.permutation is None:
+                bag.permutation = FeistelPermutation(len(words), bag.seed)
+            word = str(words[bag.permutation[bag.cursor]])
+            bag.cursor += 1
+        with self.lock:
+            self.dirty.add(player_id)
+        self.context.jobs.submit(self.save, priority=PRIORITY_LOW, key="save_player_bags")
+        return word
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "players": len(self.players),
+                "unsaved_players": len(self.dirty),
+                "stored_players": self.stored,
+                "evicted": self.evicted,
+            }
@@ -0,0 +1,211 @@
+# word_solver.py
+
+import math
+from collections import Counter
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+FREQUENCY_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+EXACT_GAIN_LIMIT = 32  # Below this many candidates, score letters by their full outcome distribution
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:  # Python < 3.10
+    def popcount(value):
+        return bin(value).count("1")
+
+
+def _bitset(indices, size):
+    """
+    Build an integer bitset from a list of bit indices without quadratic big-int growth.
+    """
+    bitmap = bytearray((size + 7) // 8)
+    for index in indices:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+class LengthPartition:
+    """
+    All lexicon words of one length, with a bitset of word indices for every
+    (position, letter) pair, for every letter anywhere in the word, and for every
+    (letter, number of occurrences) pair.
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.all_bits = (1 << len(words)) - 1
+        length = len(words[0])
+        position_indices = [{} for _ in range(length)]
+        contains_indices = {}
+        count_indices = {}
+        for index, word in enumerate(words):
+            for position, letter in enumerate(word):
+                position_indices[position].setdefault(letter, []).append(index)
+            for letter, count in Counter(word).items():
+                contains_indices.setdefault(letter, []).append(index)
+                count_indices.setdefault((letter, count), []).append(index)
+
+        size = len(words)
+        self.position_bits = [
+            {letter: _bitset(indices, size) for letter, indices in letters.items()}
+            for letters in position_indices
+        ]
+        self.contains_bits = {letter: _bitset(indices, size) for letter, indices in contains_indices.items()}
+        self.count_bits = {key: _bitset(indices, size) for key, indices in count_indices.items()}
+
+    def iter_words(self, bits):
+        """
+        Yield the words whose bits are set.
+        """
+        binary = bin(bits)[:1:-1]  # Least significant bit first, without the '0b' prefix
+        index = binary.find("1")
+        while index != -1:
+            yield self.words[index]
+            index = binary.find("1", index + 1)
+
+
+class LexiconIndex:
+    """
+    Pattern index over the lexicon, partitioned by word length.
+    Filtering candidates for a pattern such as '_A__E' is a handful of bitset intersections.
+    """
+
+    def __init__(self, words):
+        by_length = {}
+        for word in sorted({word.upper() for word in words if word}):
+            by_length.setdefault(len(word), []).append(word)
+        self.partitions = {length: LengthPartition(group) for length, group in by_length.items()}
+        self.size = sum(len(partition.words) for partition in self.partitions.values())
+
+    @classmethod
+    def from_context(cls, context):
+        """
+        Build an index over every word and riddle answer in a GameContext.
+        """
+        words = [word for category in context.words for word in context.words[category] if isinstance(word, str)]
+        words.extend(answer for category in context.riddles for _, answer in context.riddles[category])
+        return cls(words)
+
+    def candidates(self, pattern, guessed):
+        """
+        Return the candidate bitset and partition for a pattern.
+        :param pattern: A sequence with a letter for each revealed position and '_' elsewhere.
+        :param guessed: Every letter guessed so far, correct or not.
+        :return: A tuple (bits, partition); partition is None when no word has this length.
+        """
+        partition = self.partitions.get(len(pattern))
+        if partition is None:
+            return 0, None
+
+        bits = partition.all_bits
+        revealed = Counter()
+        for position, letter in enumerate(pattern):
+            if letter != "_":
+                bits &= partition.position_bits[position].get(letter, 0)
+                revealed[letter] += 1
+
+        # Correct guesses reveal every occurrence, so a revealed letter must occur exactly as
+        # often as it is shown, and a missed letter must not occur at all
+        for guess in guessed:
+            if not bits:
+                break
+            count = revealed.get(guess)
+            if count:
+                bits &= partition.count_bits.get((guess, count), 0)
+            else:
+                mask = partition.contains_bits.get(guess)
+                if mask:
+                    bits &= ~mask
+        return bits, partition
+
+    def filter(self, pattern, guessed):
+        """
+        Return the list of words matching a pattern and guessed letters.
+        """
+        bits, partition = self.candidates(pattern, guessed)
+        return list(partition.iter_words(bits)) if partition else []
+
+
+class AIGuesser:
+    """
+    Computer player that picks the letter with the highest information gain over
+    the candidate words still consistent with the board.
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+    def next_guess(self, game):
+        """
+        Choose the next letter for a HangmanGame.
+        """
+        return self.best_letter(game.display_letters, game.guessed_letters)
+
+    def best_letter(self, pattern, guessed):
+        """
+        Choose the next letter for a pattern and set of guessed letters.
+        :return: A letter, or None if every letter has been guessed.
+        """
+        bits, partition = self.index.candidates(pattern, guessed)
+        total = popcount(bits)
+        if total == 0:
+            # The word is not in the lexicon; fall back to English letter frequency
+            return next((letter for letter in FREQUENCY_ORDER if letter not in guessed), None)
+
+        if total <= EXACT_GAIN_LIMIT:
+            return self._best_exact(list(partition.iter_words(bits)), guessed)
+
+        best_letter, best_score = None, -1.0
+        for letter in ALPHABET:
+            if letter in guessed:
+                continue
+            hits = popcount(bits & partition.contains_bits.get(letter, 0))
+            if hits == 0:
+                continue
+            # Information gain of the hit/miss outcome, ties broken by expected hits
+            p = hits / total
+            gain = 0.0 if hits == total else -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
+            score = gain + p * 1e-6
+            if score > best_score:
+                best_letter, best_score = letter, score
+        return best_letter or next((letter for letter in FREQUENCY_ORDER if letter not in guessed), None)
+
+    def _best_exact(self, candidates, guessed):
+        """
+        Score letters by the entropy of the revealed-position outcome over a small candidate set.
+        """
+        total = len(candidates)
+        outcomes = {}  # letter -> Counter of position tuples among candidates containing it
+        for word in candidates:
+            positions = {}
+            for position, letter in enumerate(word):
+                positions.setdefault(letter, []).append(position)
+            for letter, letter_positions in positions.items():
+                if letter in ALPHABET and letter not in guessed:
+                    outcomes.setdefault(letter, Counter())[tuple(letter_positions)] += 1
+
+        best_letter, best_score = None, -1.0
+        for letter in sorted(outcomes):
+            counts = list(outcomes[letter].values())
+            hits = sum(counts)
+            if hits < total:
+                counts.append(total - hits)  # Candidates without the letter
+            entropy = -sum(count / total * math.log2(count / total) for count in counts)
+            score = entropy + hits / total * 1e-6
+            if score > best_score:
+                best_letter, best_score = letter, score
+        return best_letter or next((letter for letter in FREQUENCY_ORDER if letter not in guessed), None)
+
+    def play(self, game):
+        """
+        Play the current round of a HangmanGame to completion.
+        :return: The list of letters guessed.
+        """
+        guesses = []
+        while not game.check_win() and not game.check_lose():
+            letter = self.next_guess(game)
+            if letter is None:
+                break
+            game.guess_letter(letter)
+            guesses.append(letter)
+        return guesses